@@ -0,0 +1,170 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.cache import DEFAULT_MAX_BYTES, ParseCache, analyse_text
+from syntax.recognizer import recognize
+import argparse
+import glob
+import os
+import sys
+import time
+
+DEFAULT_PATTERN = "*.c"
+# arquivos por tarefa: amortiza o custo de enviar tarefas aos processos
+DEFAULT_CHUNK = 16
+
+
+@dataclass
+class FileResult:
+    path: str
+    errors: List[str]
+    tokens: int
+    size: int
+    failure: Optional[str] = None
+    # a falha veio da análise (exceção inesperada), não da leitura do arquivo
+    crashed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.failure is None and not self.errors
+
+
+# um ParseCache por processo (o diretório é compartilhado entre eles)
+_caches = {}
+
+
+def _cache_for(cache_dir: str, cache_size: int) -> ParseCache:
+    cache = _caches.get((cache_dir, cache_size))
+    if cache is None:
+        cache = _caches[(cache_dir, cache_size)] = ParseCache(cache_dir, cache_size)
+    return cache
+
+
+# Sem cache a AST não é construída (syntax.recognizer); max_errors limita os
+# erros relatados por arquivo. Qualquer exceção (RecursionError em blocos
+# muito aninhados, por exemplo) vira falha daquele arquivo e o lote segue.
+def analyse_file(path: str, cache_dir: Optional[str] = None, cache_size: int = DEFAULT_MAX_BYTES,
+                 max_errors: Optional[int] = None) -> FileResult:
+    try:
+        size = os.path.getsize(path)
+        if cache_dir is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = analyse_text(f.read(), _cache_for(cache_dir, cache_size))
+            return FileResult(path, entry.errors[:max_errors], len(entry.tokens), size)
+        sc = LexicalCodeScanner.from_file(path)
+        tokens = 0
+
+        def counted():
+            nonlocal tokens
+            for tok in sc.iter_tokens():
+                tokens += 1
+                yield tok
+
+        errors = recognize(counted(), max_errors)
+        return FileResult(path, errors, tokens, size)
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, [], 0, 0, failure=str(e))
+    except Exception as e:
+        return FileResult(path, [], 0, 0, failure=f"{type(e).__name__}: {e}", crashed=True)
+
+
+def analyse_files(paths: List[str], cache_dir: Optional[str] = None, cache_size: int = DEFAULT_MAX_BYTES,
+                  max_errors: Optional[int] = None) -> List[FileResult]:
+    return [analyse_file(p, cache_dir, cache_size, max_errors) for p in paths]
+
+
+# Diretórios são percorridos recursivamente (arquivos que casam com
+# pattern); os demais argumentos são tratados como padrões glob, com "**"
+# habilitado. Cada arquivo aparece uma só vez, na ordem em que foi achado.
+def expand_inputs(inputs: Iterable[str], pattern: str = DEFAULT_PATTERN) -> List[str]:
+    seen = set()
+    out = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found = sorted(glob.glob(os.path.join(item, "**", pattern), recursive=True))
+        else:
+            found = sorted(glob.glob(item, recursive=True)) if glob.has_magic(item) else [item]
+        for path in found:
+            if os.path.isdir(path):
+                continue
+            key = os.path.normpath(path)
+            if key not in seen:
+                seen.add(key)
+                out.append(path)
+    return out
+
+
+def _chunks(paths: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(paths), size):
+        yield paths[i:i + size]
+
+
+# Resultados na ordem em que ficam prontos. Com workers == 1 a análise roda
+# no próprio processo, sem pool.
+def run_batch(paths: List[str], workers: Optional[int] = None, chunk: int = DEFAULT_CHUNK,
+              cache_dir: Optional[str] = None, cache_size: int = DEFAULT_MAX_BYTES,
+              max_errors: Optional[int] = None) -> Iterator[FileResult]:
+    if workers == 1:
+        for path in paths:
+            yield analyse_file(path, cache_dir, cache_size, max_errors)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyse_files, c, cache_dir, cache_size, max_errors) for c in _chunks(paths, chunk)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def print_result(result: FileResult, quiet: bool = False):
+    if result.failure is not None:
+        stage = "ANÁLISE" if result.crashed else "LEITURA"
+        print(f"[{result.path}] - FALHA NA {stage}: {result.failure}")
+    elif result.errors:
+        print(f"[{result.path}] - ERROS SINTÁTICOS")
+        for error in result.errors:
+            print(f"  {error}")
+    elif not quiet:
+        print(f"[{result.path}] - OK")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Análise léxica e sintática de vários arquivos em paralelo")
+    ap.add_argument("inputs", nargs="+", help="arquivos, diretórios ou padrões glob")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    ap.add_argument("--pattern", default=DEFAULT_PATTERN, help="padrão dos arquivos dentro de diretórios")
+    ap.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="arquivos por tarefa")
+    ap.add_argument("--cache", metavar="DIR", default=None, help="diretório do cache de tokens e ASTs")
+    ap.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES, help="tamanho máximo do cache em bytes")
+    ap.add_argument("--max-errors", type=int, default=None, metavar="N",
+                    help="interrompe a análise de cada arquivo no N-ésimo erro")
+    ap.add_argument("-q", "--quiet", action="store_true", help="não lista os arquivos sem erros")
+    args = ap.parse_args(argv)
+    if args.max_errors is not None and args.max_errors < 1:
+        ap.error("--max-errors deve ser positivo")
+
+    paths = expand_inputs(args.inputs, args.pattern)
+    if not paths:
+        print("Nenhum arquivo encontrado.")
+        return 1
+
+    files = ok = failed = tokens = size = 0
+    start = time.perf_counter()
+    for result in run_batch(paths, args.workers, max(1, args.chunk), args.cache, args.cache_size, args.max_errors):
+        print_result(result, args.quiet)
+        files += 1
+        ok += result.ok
+        failed += result.failure is not None
+        tokens += result.tokens
+        size += result.size
+    elapsed = time.perf_counter() - start
+
+    rate = (lambda n: n / elapsed) if elapsed > 0 else (lambda n: 0.0)
+    print()
+    print(f"{files} arquivos: {ok} OK, {files - ok - failed} com erros, {failed} com falha")
+    print(f"{tokens} tokens, {size / 1e6:.2f} MB em {elapsed:.2f}s "
+          f"({rate(files):.1f} arquivos/s, {rate(tokens):.0f} tokens/s, {rate(size) / 1e6:.2f} MB/s)")
+    return 0 if ok == files else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# Entradas patológicas para a decisão entre atribuição e comando-expressão:
+# cadeias longas de índices, subscritos enormes e muitos comandos indexados.
+# Para cada tamanho mede o tempo de parse_program e o tempo por token; com
+# análise em uma passada o tempo por token fica estável quando o tamanho
+# dobra. O coletor de lixo fica desligado durante a medição: a lista de
+# tokens e a cadeia de BinOpNode de wide_subscript são objetos rastreados,
+# e as coletas da geração mais velha percorrem todos eles, somando um custo
+# que cresce com a entrada e não vem do parser. A árvore também só é
+# liberada depois de parar o relógio. Sem esses dois cuidados o caso de
+# 64000 termos media 2,77 µs/token contra 1,05 no de 1000; com eles fica
+# em torno de 1,35 µs/token em todos os tamanhos.
+#
+# Uso: python -m benchmarks.assignment_scaling [tamanho_máximo]
+import gc
+import sys
+import time
+from typing import Callable, Dict
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.parser import Parser
+
+
+def index_chain(k: int) -> str:
+    return "a" + "".join(f"[{i}]" for i in range(k)) + " = 1;\n"
+
+
+def wide_subscript(k: int) -> str:
+    return "a[" + " + ".join(f"x{i}" for i in range(k)) + "] = 1;\n"
+
+
+def many_statements(k: int) -> str:
+    return "".join(f"a[i][j + {i}] = b[{i}] * c;\nf(a[{i}]);\n" for i in range(k))
+
+
+CASES: Dict[str, Callable[[int], str]] = {
+    "index_chain": index_chain,
+    "wide_subscript": wide_subscript,
+    "many_statements": many_statements,
+}
+
+
+def time_parse(text: str, repeat: int = 3):
+    tokens = LexicalCodeScanner(text, engine="table").scan_all()
+    best = float("inf")
+    enabled = gc.isenabled()
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            tree = Parser(tokens).parse_program()
+            best = min(best, time.perf_counter() - start)
+            del tree
+        finally:
+            if enabled:
+                gc.enable()
+    return len(tokens), best
+
+
+def main(max_size: int):
+    for name, build in CASES.items():
+        print(name)
+        size = 1000
+        while size <= max_size:
+            ntokens, seconds = time_parse(build(size))
+            print(f"  {size:>8}  {ntokens:>9} tokens  {seconds * 1000:9.2f} ms  "
+                  f"{seconds / ntokens * 1e6:6.3f} µs/token")
+            size *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64000)
@@ -0,0 +1,68 @@
+# Tempo de partida a frio de main.py em cada modo de saída: cada execução é
+# um processo novo (como num gancho de pre-commit, um por arquivo). Mostra a
+# mediana e o melhor tempo de parede e se o matplotlib chegou a ser
+# importado (via python -X importtime).
+#
+# Uso: python -m benchmarks.cold_start [arquivo.c] [--runs N]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+MODES = ("check", "tokens", "json-ast", "svg", "dot", "png")
+DEFAULT_SOURCE = os.path.join(ROOT, "code_examples", "conditional.c")
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+
+
+def measure(mode: str, source: str, runs: int) -> Dict:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run([MAIN, source, f"--{mode}"])
+        times.append(time.perf_counter() - start)
+    imports = _run(["-X", "importtime", MAIN, source, f"--{mode}"]).stderr
+    return {
+        "mode": mode,
+        "median": statistics.median(times),
+        "best": min(times),
+        "matplotlib": "matplotlib" in imports,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Partida a frio de main.py por modo de saída")
+    ap.add_argument("source", nargs="?", default=DEFAULT_SOURCE)
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    runs = max(1, args.runs)
+    source = os.path.abspath(args.source)
+    # imagens geradas pelas medições são apagadas no fim; as que já existiam
+    # ficam
+    outputs = [f"{source}.{ext}" for ext in ("svg", "dot", "png")]
+    existing = {out for out in outputs if os.path.exists(out)}
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        _run(["-c", "pass"])
+    print(f"{'python -c pass':<15} {(time.perf_counter() - start) / runs * 1000:8.1f} ms (média)")
+    for mode in MODES:
+        r = measure(mode, source, runs)
+        print(f"--{r['mode']:<13} {r['median'] * 1000:8.1f} ms (mediana), {r['best'] * 1000:8.1f} ms (melhor)  "
+              f"matplotlib: {'sim' if r['matplotlib'] else 'não'}")
+    for out in outputs:
+        if out not in existing and os.path.exists(out):
+            os.remove(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
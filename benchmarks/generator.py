@@ -0,0 +1,117 @@
+# Gerador de programas sintéticos na gramática do parser (let, if/else,
+# while, blocos, chamadas, indexação e expressões aninhadas).
+#
+# Formatos:
+#   wide     - muitos comandos curtos no nível do programa
+#   deep     - blocos, if e while aninhados até max_depth
+#   comments - comandos intercalados com comentários de linha e de bloco
+#   strings  - inicializações e argumentos com literais de string longos
+import random
+from typing import List, Optional
+
+SHAPES = ("wide", "deep", "comments", "strings")
+
+_NAMES = ["x", "y", "i", "n", "total", "count", "buf", "idx", "acc", "tmp"]
+_FUNCS = ["f", "g", "len", "max", "print"]
+_OPS = ["+", "-", "*", "/", "<", ">", "<=", ">=", "==", "!=", "&&"]
+_WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "token", "parser", "arvore", "texto", "valor"]
+
+
+class _Generator:
+    def __init__(self, shape: str, seed: int, max_depth: int, expr_depth: int):
+        if shape not in SHAPES:
+            raise ValueError(f"Formato desconhecido: {shape}")
+        self.shape = shape
+        self.rnd = random.Random(seed)
+        self.max_depth = max_depth
+        self.expr_depth = expr_depth
+        self.count = 0
+
+    def name(self) -> str:
+        return self.rnd.choice(_NAMES)
+
+    def string(self) -> str:
+        words = self.rnd.choices(_WORDS, k=self.rnd.randint(4, 16))
+        return '"' + " ".join(words) + '"'
+
+    def atom(self) -> str:
+        r = self.rnd.random()
+        if self.shape == "strings" and r < 0.3:
+            return self.string()
+        if r < 0.45:
+            return self.name()
+        if r < 0.7:
+            return str(self.rnd.randint(0, 1000))
+        if r < 0.85:
+            return f"{self.name()}[{self.expr(1)}]"
+        args = ", ".join(self.expr(1) for _ in range(self.rnd.randint(0, 3)))
+        return f"{self.rnd.choice(_FUNCS)}({args})"
+
+    def expr(self, depth: int) -> str:
+        if depth <= 0 or self.rnd.random() < 0.3:
+            return self.atom()
+        left, right = self.expr(depth - 1), self.expr(depth - 1)
+        op = self.rnd.choice(_OPS)
+        if self.rnd.random() < 0.5:
+            return f"({left} {op} {right})"
+        return f"{left} {op} {right}"
+
+    def comment(self) -> str:
+        text = " ".join(self.rnd.choices(_WORDS, k=self.rnd.randint(3, 12)))
+        if self.rnd.random() < 0.5:
+            return f"// {text}"
+        return f"/* {text}\n   {text} */"
+
+    def simple(self) -> str:
+        self.count += 1
+        d = self.expr_depth
+        choice = self.rnd.random()
+        if choice < 0.3:
+            return f"let v{self.count} = {self.expr(d)};"
+        if choice < 0.6:
+            return f"{self.name()} = {self.expr(d)};"
+        if choice < 0.8:
+            args = ", ".join(self.expr(d - 1) for _ in range(self.rnd.randint(1, 3)))
+            return f"{self.rnd.choice(_FUNCS)}({args});"
+        return f"return {self.expr(d)};"
+
+    def compound(self, depth: int, budget: int) -> List[str]:
+        # abre uma estrutura e gasta até budget comandos dentro dela
+        self.count += 1
+        kind = self.rnd.random()
+        inner = self.block(depth + 1, max(1, budget - 1))
+        if kind < 0.4:
+            head = f"if ({self.expr(2)}) {{"
+            if self.rnd.random() < 0.5:
+                return [head, *inner, "} else {", f"  {self.simple()}", "}"]
+            return [head, *inner, "}"]
+        if kind < 0.8:
+            return [f"while ({self.expr(2)}) {{", *inner, "}"]
+        return ["{", *inner, "}"]
+
+    def block(self, depth: int, budget: int) -> List[str]:
+        lines: List[str] = []
+        start = self.count
+        while self.count - start < budget:
+            left = budget - (self.count - start)
+            if self.shape == "deep" and depth < self.max_depth and self.rnd.random() < 0.7:
+                lines.extend(self.compound(depth, min(left, 3 * (self.max_depth - depth))))
+            elif self.shape != "deep" and depth < self.max_depth and self.rnd.random() < 0.15:
+                lines.extend(self.compound(depth, min(left, self.rnd.randint(1, 6))))
+            else:
+                lines.append(self.simple())
+            if self.shape == "comments" and self.rnd.random() < 0.7:
+                lines.append(self.comment())
+        indent = "  " if depth > 0 else ""
+        return [indent + line for line in lines]
+
+
+# statements é o número aproximado de comandos gerados (simples e
+# compostos); max_depth é o aninhamento máximo de blocos (padrão: 24 para
+# "deep", 2 para os demais).
+def generate_program(statements: int, shape: str = "wide", seed: int = 0,
+                     max_depth: Optional[int] = None, expr_depth: int = 3) -> str:
+    if max_depth is None:
+        max_depth = 24 if shape == "deep" else 2
+    gen = _Generator(shape, seed, max_depth, expr_depth)
+    return "\n".join(gen.block(0, statements)) + "\n"
@@ -0,0 +1,43 @@
+# Memória por nó da AST: nós com __slots__ (syntax.node) contra o mesmo
+# nó guardado em um objeto comum com __dict__ (o layout anterior).
+#
+# Uso: python -m benchmarks.node_memory [n_comandos]
+import sys
+from typing import Dict
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.parser import Parser
+from syntax.node import Node
+from syntax.visitor import walk
+
+
+def slotted_nbytes(node: Node) -> int:
+    return sys.getsizeof(node)
+
+
+_DICT_CLASSES: Dict[str, type] = {}
+
+
+def dict_nbytes(node: Node) -> int:
+    cls = _DICT_CLASSES.setdefault(type(node).__name__, type(type(node).__name__, (), {}))
+    twin = cls()
+    for name in node.__slots__:
+        setattr(twin, name, getattr(node, name))
+    return sys.getsizeof(twin) + sys.getsizeof(twin.__dict__)
+
+
+def main(statements: int):
+    sc = LexicalCodeScanner(generate_program(statements), engine="table")
+    parser = Parser(sc.scan_all())
+    nodes = list(walk(parser.parse_program()))
+
+    slotted = sum(slotted_nbytes(n) for n in nodes)
+    with_dict = sum(dict_nbytes(n) for n in nodes)
+    print(f"nós: {len(nodes)}")
+    print(f"com __dict__: {with_dict / len(nodes):.1f} bytes/nó ({with_dict / 1e6:.1f} MB)")
+    print(f"com __slots__: {slotted / len(nodes):.1f} bytes/nó ({slotted / 1e6:.1f} MB)")
+    print(f"economia: {(with_dict - slotted) / len(nodes):.1f} bytes/nó ({1 - slotted / with_dict:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,226 @@
+# Suíte de benchmarks: gera programas sintéticos (benchmarks.generator) e
+# mede cada fase separadamente: scan_all, parse_program, recognize (só a
+# validação, sem AST), _compute_layout, tidy_layout, draw_tree (PNG) e a
+# escrita em SVG e DOT; com --jobs N, também a varredura e a análise
+# sintática paralelas (N processos). Para cada caso grava tempo (melhor de
+# --repeat execuções), tokens/s, nós/s e pico de memória (tracemalloc, numa
+# execução à parte para não distorcer os tempos) num arquivo JSON.
+#
+# Uso:
+#   python -m benchmarks.suite -o bench.json
+#   python -m benchmarks.suite --shapes wide deep --sizes 1000 10000
+#   python -m benchmarks.suite -o novo.json --compare bench.json
+#
+# Com --compare, fases mais lentas que a referência além de --threshold são
+# listadas e o processo termina com código 1.
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import ENGINES, LexicalCodeScanner
+from syntax.parser import Parser
+from syntax.recognizer import recognize
+from syntax.tree import DotRenderer, SvgRenderer, _compute_layout, count_nodes, draw_tree, tidy_layout, write_tree
+
+PHASES = ("scan_all", "scan_parallel", "parse_program", "parse_parallel", "recognize", "compute_layout", "tidy_layout", "draw_tree", "draw_svg", "draw_dot")
+DEFAULT_SIZES = (50, 1000, 10000)
+# draw_tree com matplotlib fica impraticável em árvores grandes (SVG e DOT
+# são medidos sempre)
+DEFAULT_DRAW_MAX_NODES = 3000
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_memory(fn: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(shape: str, size: int, engine: str, repeat: int, draw_max_nodes: int, seed: int,
+             jobs: int = 1) -> Dict:
+    text = generate_program(size, shape, seed)
+    scan = lambda: LexicalCodeScanner(text, engine=engine).scan_all()
+    scan_time, tokens = _best_time(scan, repeat)
+
+    def parse():
+        parser = Parser(tokens)
+        return parser.parse_program(), parser.errors
+
+    parse_time, (ast, errors) = _best_time(parse, repeat)
+    check = lambda: recognize(tokens)
+    check_time, _ = _best_time(check, repeat)
+    if jobs > 1:
+        scan_parallel = lambda: LexicalCodeScanner(text, engine=engine).scan_buffer(jobs)
+        parallel_time, _ = _best_time(scan_parallel, repeat)
+        parse_parallel = lambda: Parser(tokens).parse_program(jobs)
+        parse_parallel_time, _ = _best_time(parse_parallel, repeat)
+    layout = lambda: _compute_layout(ast, 0.0, 0.0)
+    layout_time, _ = _best_time(layout, repeat)
+    tidy = lambda: tidy_layout(ast, 0.0, 0.0)
+    tidy_time, _ = _best_time(tidy, repeat)
+    nodes = count_nodes(ast)
+
+    phases = {
+        "scan_all": {"seconds": scan_time, "peak_bytes": _peak_memory(scan),
+                     "tokens_per_s": len(tokens) / scan_time if scan_time else None},
+        "parse_program": {"seconds": parse_time, "peak_bytes": _peak_memory(parse),
+                          "nodes_per_s": nodes / parse_time if parse_time else None,
+                          "tokens_per_s": len(tokens) / parse_time if parse_time else None},
+        "recognize": {"seconds": check_time, "peak_bytes": _peak_memory(check),
+                      "tokens_per_s": len(tokens) / check_time if check_time else None},
+        "compute_layout": {"seconds": layout_time, "peak_bytes": _peak_memory(layout),
+                           "nodes_per_s": nodes / layout_time if layout_time else None},
+        "tidy_layout": {"seconds": tidy_time, "peak_bytes": _peak_memory(tidy),
+                        "nodes_per_s": nodes / tidy_time if tidy_time else None},
+    }
+    if jobs > 1:
+        # o pico de memória é o do processo principal
+        phases["scan_parallel"] = {"seconds": parallel_time, "peak_bytes": _peak_memory(scan_parallel),
+                                   "tokens_per_s": len(tokens) / parallel_time if parallel_time else None}
+        phases["parse_parallel"] = {"seconds": parse_parallel_time, "peak_bytes": _peak_memory(parse_parallel),
+                                    "nodes_per_s": nodes / parse_parallel_time if parse_parallel_time else None,
+                                    "tokens_per_s": len(tokens) / parse_parallel_time if parse_parallel_time else None}
+    for name, renderer in (("draw_svg", SvgRenderer()), ("draw_dot", DotRenderer())):
+        draw = lambda: write_tree(ast, io.StringIO(), renderer)
+        draw_time, _ = _best_time(draw, repeat)
+        phases[name] = {"seconds": draw_time, "peak_bytes": _peak_memory(draw),
+                        "nodes_per_s": nodes / draw_time if draw_time else None}
+    if nodes <= draw_max_nodes:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "tree.png")
+            draw = lambda: draw_tree(ast, out)
+            draw_time, _ = _best_time(draw, 1)
+            phases["draw_tree"] = {"seconds": draw_time, "peak_bytes": _peak_memory(draw),
+                                   "nodes_per_s": nodes / draw_time if draw_time else None}
+
+    return {
+        "name": f"{shape}-{size}",
+        "shape": shape,
+        "size": size,
+        "engine": engine,
+        "chars": len(text),
+        "tokens": len(tokens),
+        "nodes": nodes,
+        "errors": len(errors),
+        "phases": phases,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(shapes: List[str], sizes: List[int], engine: str = "classic", repeat: int = 3,
+              draw_max_nodes: int = DEFAULT_DRAW_MAX_NODES, seed: int = 0,
+              report: Optional[Callable[[Dict], None]] = None, jobs: int = 1) -> Dict:
+    cases = []
+    for shape in shapes:
+        for size in sizes:
+            case = run_case(shape, size, engine, repeat, draw_max_nodes, seed, jobs)
+            cases.append(case)
+            if report is not None:
+                report(case)
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "engine": engine,
+        "repeat": repeat,
+        "seed": seed,
+        "jobs": jobs,
+        "cases": cases,
+    }
+
+
+def print_case(case: Dict):
+    print(f"{case['name']}: {case['tokens']} tokens, {case['nodes']} nós, {case['errors']} erros")
+    for phase in PHASES:
+        data = case["phases"].get(phase)
+        if data is None:
+            print(f"  {phase:<15} (pulado)")
+            continue
+        rates = []
+        if data.get("tokens_per_s"):
+            rates.append(f"{data['tokens_per_s']:,.0f} tokens/s")
+        if data.get("nodes_per_s"):
+            rates.append(f"{data['nodes_per_s']:,.0f} nós/s")
+        print(f"  {phase:<15} {data['seconds'] * 1000:9.2f} ms  pico {data['peak_bytes'] / 1e6:7.2f} MB  "
+              + ", ".join(rates))
+
+
+# Fases (de casos com o mesmo nome) mais lentas que a referência por mais de
+# threshold (fração): lista de (caso, fase, segundos antes, segundos agora).
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Tuple[str, str, float, float]]:
+    before = {c["name"]: c for c in baseline.get("cases", [])}
+    slower = []
+    for case in current["cases"]:
+        old = before.get(case["name"])
+        if old is None:
+            continue
+        for phase, data in case["phases"].items():
+            old_data = old["phases"].get(phase)
+            if old_data and data["seconds"] > old_data["seconds"] * (1 + threshold):
+                slower.append((case["name"], phase, old_data["seconds"], data["seconds"]))
+    return slower
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks do lexer, parser e desenho da AST")
+    ap.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    ap.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="comandos por programa")
+    ap.add_argument("--engine", choices=ENGINES, default="classic")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--jobs", type=int, default=1, help="processos da varredura e da análise paralelas (1: não mede)")
+    ap.add_argument("--draw-max-nodes", type=int, default=DEFAULT_DRAW_MAX_NODES,
+                    help="não mede draw_tree em árvores maiores que isso")
+    ap.add_argument("-o", "--output", help="arquivo JSON de saída")
+    ap.add_argument("--compare", metavar="JSON", help="resultado anterior para comparação")
+    ap.add_argument("--threshold", type=float, default=0.10, help="piora tolerada (fração)")
+    args = ap.parse_args(argv)
+
+    results = run_suite(args.shapes, args.sizes, args.engine, max(1, args.repeat),
+                        args.draw_max_nodes, args.seed, report=print_case, jobs=args.jobs)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(baseline, results, args.threshold)
+        for name, phase, old, new in slower:
+            print(f"[REGRESSÃO] {name} {phase}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms ({new / old - 1:+.0%})")
+        if slower:
+            return 1
+        print(f"Sem regressões acima de {args.threshold:.0%} em relação a {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import Token
+from syntax.parser import Parser
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+import time
+
+# Daemon de análise: um processo de longa duração atende pedidos JSON, um
+# por linha, num socket Unix (--socket CAMINHO) ou na entrada/saída padrão
+# (--stdio). Cada pedido tem "method", "path" (arquivo) ou "text" (código) e
+# um "id" opcional, devolvido na resposta:
+#
+#   {"id": 1, "method": "check", "path": "code_examples/conditional.c"}
+#   {"id": 1, "ok": true, "result": {"errors": [], "tokens": 42}}
+#
+# Métodos: tokens, check, json-ast (AST em JSON), render (desenha a AST em
+# arquivo), stats e shutdown. Os pedidos de uma conexão são atendidos
+# concorrentemente (as respostas saem na ordem em que ficam prontas); a
+# análise roda num pool de processos, que mantém os módulos (e o matplotlib,
+# depois do primeiro PNG) carregados. Resultados recentes de tokens, check
+# e json-ast ficam num cache LRU em memória, indexado pelo arquivo (caminho,
+# mtime e tamanho) ou pelo hash do texto; pedidos iguais simultâneos
+# compartilham a mesma análise.
+METHODS = ("tokens", "check", "json-ast", "render", "stats", "shutdown")
+CACHED_METHODS = ("tokens", "check", "json-ast")
+DEFAULT_CACHE_ENTRIES = 256
+# tamanho máximo de uma linha de pedido (o código pode vir em "text")
+MAX_REQUEST = 64 << 20
+
+# opções de render, com os mesmos nomes das opções de main.py (path da
+# subárvore vira node_path, já que "path" é o arquivo)
+RENDER_OPTIONS = {
+    "format": str,
+    "output": str,
+    "max_depth": int,
+    "max_nodes": int,
+    "line": int,
+    "node_path": str,
+    "tiles": str,
+    "layout": str,
+}
+RENDER_FORMATS = ("png", "svg", "dot")
+METHOD_OPTIONS = {
+    "check": {"max_errors": int},
+    "render": RENDER_OPTIONS,
+}
+
+
+def _read_source(source: Dict[str, str]) -> str:
+    if "text" in source:
+        return source["text"]
+    try:
+        with open(source["path"], "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ValueError(f"Arquivo não encontrado: {source['path']}")
+
+
+def _parse(text: str) -> Tuple[List[Token], Any, List[str]]:
+    tokens = LexicalCodeScanner(text, engine="table").scan_all()
+    parser = Parser(tokens)
+    ast = parser.parse_program()
+    return tokens, ast, parser.errors
+
+
+def _render(ast, source: Dict[str, str], options: Dict[str, Any]) -> List[str]:
+    from syntax.tree import draw_tiles, draw_tree, select_subtree
+
+    fmt = options.get("format", "png")
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"Formato desconhecido: {fmt}")
+    base = options.get("output") or source.get("path")
+    if base is None:
+        raise ValueError("Pedido com 'text' precisa de 'output'")
+    if options.get("line") is not None or options.get("node_path") is not None:
+        ast = select_subtree(ast, options.get("node_path"), options.get("line"))
+    kwargs = {name: options[name] for name in ("max_depth", "max_nodes", "layout") if name in options}
+    if "tiles" in options:
+        width, _, height = options["tiles"].partition("x")
+        try:
+            tile_size = float(width), float(height)
+        except ValueError:
+            raise ValueError(f"Valor inválido para 'tiles': {options['tiles']!r}")
+        return draw_tiles(ast, base, fmt, tile_size, **kwargs)
+    filename = base if options.get("output") else f"{base}.{fmt}"
+    draw_tree(ast, filename, **kwargs)
+    return [filename]
+
+
+# Executado nos processos do pool; devolve o resultado já em JSON
+def run_request(method: str, source: Dict[str, str], options: Dict[str, Any]) -> str:
+    text = _read_source(source)
+    if method == "tokens":
+        tokens = LexicalCodeScanner(text, engine="table").scan_all()
+        return json.dumps([[tok.line, tok.col, tok.type.name, tok.lex] for tok in tokens], ensure_ascii=False)
+    if method == "check":
+        from syntax.recognizer import recognize
+
+        tokens = LexicalCodeScanner(text, engine="table").scan_all()
+        errors = recognize(tokens, options.get("max_errors"))
+        return json.dumps({"errors": errors, "tokens": len(tokens)}, ensure_ascii=False)
+    tokens, ast, errors = _parse(text)
+    if method == "json-ast":
+        from syntax.serialize import write_json
+
+        out = io.StringIO()
+        out.write(f'{{"errors": {json.dumps(errors, ensure_ascii=False)}, "ast": ')
+        write_json(ast, out)
+        out.write("}")
+        return out.getvalue()
+    # render: como em main.py, só desenha se não houver erros
+    files = [] if errors else _render(ast, source, options)
+    return json.dumps({"errors": errors, "files": files}, ensure_ascii=False)
+
+
+def _source_of(request: Dict[str, Any]) -> Dict[str, str]:
+    if isinstance(request.get("text"), str):
+        return {"text": request["text"]}
+    if isinstance(request.get("path"), str):
+        return {"path": os.path.abspath(request["path"])}
+    raise ValueError("Pedido sem 'path' nem 'text'")
+
+
+def _options_of(method: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    allowed = METHOD_OPTIONS.get(method, {})
+    options = {}
+    for name, kind in allowed.items():
+        value = request.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError(f"Valor inválido para '{name}': {value!r}")
+        options[name] = value
+    if options.get("max_errors", 1) < 1:
+        raise ValueError(f"Valor inválido para 'max_errors': {options['max_errors']!r}")
+    # como "path": relativo ao diretório do cliente, não ao dos processos
+    if "output" in options:
+        options["output"] = os.path.abspath(options["output"])
+    return options
+
+
+def _is_regular_file(fd: int) -> bool:
+    return stat.S_ISREG(os.fstat(fd).st_mode)
+
+
+# Saída padrão redirecionada para um arquivo comum, que connect_write_pipe
+# não aceita: write guarda as respostas e drain as grava numa thread do
+# executor, sem bloquear o laço.
+class _FileWriter:
+    def __init__(self, out: BinaryIO):
+        self._out = out
+        self._buffer = bytearray()
+
+    def write(self, data: bytes):
+        self._buffer += data
+
+    async def drain(self):
+        if not self._buffer:
+            return
+        data, self._buffer = bytes(self._buffer), bytearray()
+        await asyncio.get_running_loop().run_in_executor(None, self._flush, data)
+
+    def _flush(self, data: bytes):
+        self._out.write(data)
+        self._out.flush()
+
+    def close(self):
+        if self._buffer:
+            self._flush(bytes(self._buffer))
+            self._buffer = bytearray()
+
+
+# Entrada padrão vinda de um arquivo comum (connect_read_pipe também não o
+# aceita): lido numa thread do executor e entregue ao StreamReader.
+async def _feed_from_file(reader: asyncio.StreamReader, inp: BinaryIO):
+    loop = asyncio.get_running_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, inp.read1, 1 << 16)
+        if not chunk:
+            reader.feed_eof()
+            return
+        reader.feed_data(chunk)
+
+
+class AnalysisDaemon:
+    def __init__(self, workers: Optional[int] = None, cache_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.cache_entries = cache_entries
+        self.cache: "OrderedDict[tuple, asyncio.Future]" = OrderedDict()
+        self.requests = 0
+        self.cache_hits = 0
+        self.started = time.monotonic()
+        self.stopping: Optional[asyncio.Event] = None
+        self._connections: Dict[asyncio.StreamReader, asyncio.Task] = {}
+
+    async def start(self):
+        self.stopping = asyncio.Event()
+        # sobe os processos antes do primeiro pedido
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, int) for _ in range(self.workers)))
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self.cache),
+            "workers": self.workers,
+            "uptime_seconds": time.monotonic() - self.started,
+        }
+
+    @staticmethod
+    def _key(method: str, source: Dict[str, str]) -> tuple:
+        if "text" in source:
+            return method, "text", hashlib.blake2b(source["text"].encode("utf-8")).digest()
+        try:
+            st = os.stat(source["path"])
+        except FileNotFoundError:
+            raise ValueError(f"Arquivo não encontrado: {source['path']}")
+        return method, source["path"], st.st_mtime_ns, st.st_size
+
+    async def dispatch(self, request: Dict[str, Any]) -> str:
+        method = request.get("method")
+        if method == "stats":
+            return json.dumps(self.stats())
+        if method == "shutdown":
+            self.stopping.set()
+            return "null"
+        if method not in METHODS:
+            raise ValueError(f"Método desconhecido: {method}")
+        source = _source_of(request)
+        options = _options_of(method, request)
+        loop = asyncio.get_running_loop()
+        if method not in CACHED_METHODS:
+            return await loop.run_in_executor(self.pool, run_request, method, source, options)
+
+        key = self._key(method, source) + tuple(sorted(options.items()))
+        future = self.cache.get(key)
+        if future is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+        else:
+            future = asyncio.ensure_future(loop.run_in_executor(self.pool, run_request, method, source, options))
+            self.cache[key] = future
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # falhas não ficam no cache
+            if self.cache.get(key) is future:
+                del self.cache[key]
+            raise
+
+    async def respond(self, line: bytes) -> bytes:
+        self.requests += 1
+        rid = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("O pedido deve ser um objeto JSON")
+            rid = request.get("id")
+            result = await self.dispatch(request)
+            out = f'{{"id": {json.dumps(rid)}, "ok": true, "result": {result}}}\n'
+        except json.JSONDecodeError as e:
+            out = json.dumps({"id": rid, "ok": False, "error": f"JSON inválido: {e}"}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            message = str(e) if isinstance(e, (ValueError, OSError)) else f"{type(e).__name__}: {e}"
+            out = json.dumps({"id": rid, "ok": False, "error": message}, ensure_ascii=False) + "\n"
+        return out.encode("utf-8")
+
+    async def serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = set()
+        self._connections[reader] = asyncio.current_task()
+
+        async def answer(line: bytes):
+            writer.write(await self.respond(line))
+            await writer.drain()
+
+        try:
+            while not self.stopping.is_set():
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"id": null, "ok": false, "error": "Pedido grande demais"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[reader]
+            writer.close()
+
+    # encerra as conexões abertas depois de responder os pedidos em andamento
+    async def drain(self):
+        handlers = list(self._connections.values())
+        for reader in self._connections:
+            reader.feed_eof()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def serve_unix(self, path: str):
+        # um socket esquecido por uma execução anterior é removido
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.serve_stream, path, limit=MAX_REQUEST)
+        try:
+            async with server:
+                await self.stopping.wait()
+                await self.drain()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_REQUEST)
+        feeder = None
+        if _is_regular_file(sys.stdin.fileno()):
+            feeder = asyncio.ensure_future(_feed_from_file(reader, sys.stdin.buffer))
+        else:
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        if _is_regular_file(sys.stdout.fileno()):
+            sys.stdout.flush()
+            writer = _FileWriter(sys.stdout.buffer)
+        else:
+            transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+            writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        # termina no fim da entrada ou num shutdown
+        session = asyncio.ensure_future(self.serve_stream(reader, writer))
+        stop = asyncio.ensure_future(self.stopping.wait())
+        await asyncio.wait([session, stop], return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        if feeder is not None:
+            feeder.cancel()
+        await self.drain()
+
+
+async def serve(daemon: AnalysisDaemon, socket_path: Optional[str]):
+    await daemon.start()
+    try:
+        if socket_path:
+            await daemon.serve_unix(socket_path)
+        else:
+            await daemon.serve_stdio()
+    finally:
+        daemon.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Daemon de análise léxica e sintática (pedidos JSON, um por linha)")
+    where = ap.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", metavar="CAMINHO", help="atende num socket Unix")
+    where.add_argument("--stdio", action="store_true", help="atende na entrada/saída padrão")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="processos de análise (padrão: número de CPUs)")
+    ap.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES,
+                    help="resultados recentes mantidos em memória")
+    args = ap.parse_args(argv)
+
+    daemon = AnalysisDaemon(args.workers, max(0, args.cache_entries))
+    try:
+        asyncio.run(serve(daemon, args.socket))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import Token, TokenType
+
+# Pilha de delimitadores persistente: (caractere, pilha anterior) ou None.
+# Cada token guarda a pilha em vigor antes dele; empilhar cria um nó novo e
+# desempilhar volta ao nó anterior, então estados iguais costumam ser o
+# mesmo objeto.
+StackNode = Optional[Tuple[str, "StackNode"]]
+
+# Tokens em que o lexema não começa na posição do token (strings, ERRO de
+# string e o delimitador de fechamento trocado) não servem como ponto de
+# reinício nem de ressincronização.
+_UNSAFE = {
+    TokenType.STR_VALUE, TokenType.ERRO,
+    TokenType.RPAREN, TokenType.RBRACK, TokenType.RBRACE,
+}
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    start: int
+    old_length: int
+    new_text: str
+
+
+def _same_stack(a: StackNode, b: StackNode) -> bool:
+    while a is not b:
+        if a is None or b is None or a[0] != b[0]:
+            return False
+        a, b = a[1], b[1]
+    return True
+
+
+def _stack_list(node: StackNode) -> List[str]:
+    out = []
+    while node is not None:
+        out.append(node[0])
+        node = node[1]
+    out.reverse()
+    return out
+
+
+# Lista de tokens do IncrementalLexer com as linhas em dia: o Token lido
+# recebe a linha resolvida (IncrementalLexer.line_of) antes de ser
+# entregue. É uma Sequence, então o Parser a usa como uma lista.
+class TokenView(Sequence):
+    __slots__ = ("_lexer",)
+
+    def __init__(self, lexer: "IncrementalLexer"):
+        self._lexer = lexer
+
+    def __len__(self) -> int:
+        return len(self._lexer._tokens)
+
+    def __getitem__(self, idx):
+        lexer = self._lexer
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(lexer._tokens)))]
+        tok = lexer._tokens[idx]
+        if idx < 0:
+            idx += len(lexer._tokens)
+        line = lexer._lines[idx]
+        tok.line = line + lexer._line_shift if idx >= lexer._gap else line
+        return tok
+
+    def __iter__(self):
+        for idx in range(len(self._lexer._tokens)):
+            yield self[idx]
+
+
+# Relexação incremental: depois de uma edição, só a região danificada é
+# varrida de novo. A varredura recomeça no último token seguro antes da
+# edição e para no primeiro token depois dela em que o estado do scanner
+# (coluna e pilha de delimitadores) coincide com o da varredura anterior;
+# dali em diante os tokens antigos são reaproveitados.
+#
+# Deslocamentos no texto e linhas ficam numa representação com "gap": antes
+# de self._gap são absolutos; a partir dele o deslocamento é relativo ao fim
+# do texto e a linha é relativa a self._line_shift. Uma edição só reescreve
+# os tokens que varreu (e os que o gap atravessa ao mudar de lugar), mesmo
+# quando muda o número de linhas. As linhas dos objetos Token são
+# atualizadas quando lidos por self.tokens (TokenView).
+#
+# A tabela de símbolos mantém as contagens exatas; ids já atribuídos não
+# mudam e nomes novos recebem o próximo id livre.
+class IncrementalLexer:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = TokenView(self)
+        self.symbols: Dict[str, Dict[str, int]] = {}
+        self._next_sym_id = 1
+        self._tokens: List[Token] = []
+        self._starts = array("q")
+        self._lines = array("q")
+        self._stacks: List[StackNode] = []
+        self._gap = 0
+        self._line_shift = 0
+
+        tokens, starts, stacks, _ = self._scan(0, 1, 1, None, None)
+        self._tokens = tokens
+        self._stacks = stacks
+        n = len(text)
+        self._starts = array("q", (s - n for s in starts))
+        self._lines = array("q", (t.line for t in tokens))
+
+    @property
+    def delimiter_stack(self) -> List[str]:
+        return _stack_list(self._stacks[-1])
+
+    def start_of(self, idx: int) -> int:
+        value = self._starts[idx]
+        return value if idx < self._gap else value + len(self.text)
+
+    def line_of(self, idx: int) -> int:
+        value = self._lines[idx]
+        return value if idx < self._gap else value + self._line_shift
+
+    def _move_gap(self, gap: int):
+        starts, lines, n, shift = self._starts, self._lines, len(self.text), self._line_shift
+        if gap < self._gap:
+            starts[gap:self._gap] = array("q", [v - n for v in starts[gap:self._gap]])
+            lines[gap:self._gap] = array("q", [v - shift for v in lines[gap:self._gap]])
+        elif gap > self._gap:
+            starts[self._gap:gap] = array("q", [v + n for v in starts[self._gap:gap]])
+            lines[self._gap:gap] = array("q", [v + shift for v in lines[self._gap:gap]])
+        self._gap = gap
+
+    # último índice de token com início < offset (ou -1)
+    def _index_before(self, offset: int) -> int:
+        lo, hi = 0, len(self._tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.start_of(mid) < offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def _restart_index(self, edit_start: int) -> int:
+        idx = self._index_before(edit_start)
+        while idx >= 0:
+            tok = self._tokens[idx]
+            # o token e o lookahead de até 2 caracteres usado para
+            # reconhecê-lo precisam terminar antes da edição
+            if tok.type not in _UNSAFE and self.start_of(idx) + len(tok.lex) + 2 <= edit_start:
+                return idx
+            idx -= 1
+        return -1
+
+    def _scan(self, start: int, line: int, col: int, stack: StackNode,
+              sync: Optional[Callable]) -> Tuple[List[Token], List[int], List[StackNode], Optional[Tuple[int, int]]]:
+        sc = LexicalCodeScanner(self.text, engine="table")
+        sc.i, sc.line, sc.col = start, line, col
+        sc._delimiter_stack = live = _stack_list(stack)
+        sc.symbols = self.symbols
+        sc._next_sym_id = self._next_sym_id
+
+        text = self.text
+        tokens: List[Token] = []
+        starts: List[int] = []
+        stacks: List[StackNode] = []
+        depth = len(live)
+        found = None
+        for ttype, s, e, tline, tcol in sc._scan_spans():
+            if sync is not None and ttype not in _UNSAFE:
+                found = sync(ttype, s, tline, tcol, stack)
+                if found is not None:
+                    if ttype == TokenType.ID:
+                        self.symbols[text[s:e]]["count"] -= 1
+                    break
+            tokens.append(Token(ttype, text[s:e], tline, tcol))
+            starts.append(s)
+            stacks.append(stack)
+            if len(live) > depth:
+                stack = (live[-1], stack)
+            elif len(live) < depth:
+                stack = stack[1]
+            depth = len(live)
+
+        self._next_sym_id = sc._next_sym_id
+        return tokens, starts, stacks, found
+
+    # Aplica a edição e devolve (primeiro índice alterado, tokens removidos,
+    # tokens inseridos). new_text é o texto completo depois da edição.
+    def apply_edit(self, edit: TextEdit, new_text: str) -> Tuple[int, int, int]:
+        old_n = len(self.text)
+        if edit.start < 0 or edit.old_length < 0 or edit.start + edit.old_length > old_n:
+            raise ValueError(f"Edição fora do texto: {edit}")
+        delta = len(edit.new_text) - edit.old_length
+        if len(new_text) != old_n + delta:
+            raise ValueError("O novo texto não corresponde à edição")
+
+        old_tokens, old_stacks = self._tokens, self._stacks
+        first = self._restart_index(edit.start)
+        if first >= 0:
+            tok = old_tokens[first]
+            begin, line, col, stack = self.start_of(first), self.line_of(first), tok.col, old_stacks[first]
+        else:
+            first = 0
+            begin, line, col, stack = 0, 1, 1, None
+        # tokens a partir de first ficam relativos (ao fim do texto e a
+        # self._line_shift)
+        self._move_gap(first)
+
+        edit_end = edit.start + len(edit.new_text)
+        new_n = len(new_text)
+        starts, lines, shift = self._starts, self._lines, self._line_shift
+
+        def sync(ttype, s, tline, tcol, tstack):
+            if s < edit_end:
+                return None
+            # o mesmo ponto no texto antigo, relativo ao fim
+            rel = s - new_n
+            lo, hi = first, len(old_tokens)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if starts[mid] < rel:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == len(old_tokens) or starts[lo] != rel:
+                return None
+            old = old_tokens[lo]
+            if old.type != ttype or old.col != tcol or not _same_stack(old_stacks[lo], tstack):
+                return None
+            return lo, tline - (lines[lo] + shift)
+
+        self.text = new_text
+        new_tokens, new_starts, new_stacks, found = self._scan(begin, line, col, stack, sync)
+        stop, line_delta = found if found is not None else (len(old_tokens), 0)
+
+        # a nova varredura já contou os seus identificadores
+        for tok in old_tokens[first:stop]:
+            if tok.type == TokenType.ID:
+                entry = self.symbols[tok.lex]
+                entry["count"] -= 1
+                if entry["count"] == 0:
+                    del self.symbols[tok.lex]
+
+        # os tokens reaproveitados mudam de linha só pelo novo deslocamento
+        shift += line_delta
+        self._line_shift = shift
+        self._tokens[first:stop] = new_tokens
+        self._stacks[first:stop] = new_stacks
+        self._starts[first:stop] = array("q", (s - new_n for s in new_starts))
+        self._lines[first:stop] = array("q", (t.line - shift for t in new_tokens))
+        return first, stop - first, len(new_tokens)
@@ -0,0 +1,234 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from lexer import scan_tables as tables
+from lexer.token_buffer import TokenBuffer
+
+if TYPE_CHECKING:
+    from lexer.lexical_code_scanner import LexicalCodeScanner
+
+# Análise léxica paralela de um único texto grande. O texto é cortado logo
+# após um "\n" (fora de comentários de bloco, pela heurística de
+# split_points), como na entrada em pedaços, e cada trecho é varrido por um
+# processo a partir de um estado especulativo: coluna 1, fora de
+# comentário, linha estimada pela contagem de "\n" e uma pilha de
+# delimitadores "coringa" que aceita qualquer fechamento. O processo
+# principal junta os trechos em ordem, conferindo o estado real em que a
+# varredura serial chegaria ao início de cada um; se não confere (comentário
+# de bloco aberto, fechamento que não casa com a pilha real), o trecho é
+# varrido de novo ali mesmo, em série. O resultado é idêntico ao de scan_all.
+
+# trechos menores que isso não compensam o custo de um processo
+MIN_PIECE = 1 << 18
+
+
+# Elemento da pilha de delimitadores abaixo do início do trecho: casa com
+# qualquer fechamento e guarda a abertura que a varredura esperava
+class _AnyOpener:
+    __slots__ = ("opener",)
+
+    def __ne__(self, other):
+        self.opener = other
+        return False
+
+
+@dataclass
+class PieceResult:
+    # tokens do trecho em colunas (deslocamentos absolutos)
+    types: array
+    starts: array
+    lengths: array
+    lines: array
+    cols: array
+    # (nome, contagem) na ordem de aparição; o id local é a posição + 1
+    symbols: List[Tuple[str, int]]
+    occ_offsets: array
+    occ_lines: array
+    occ_cols: array
+    occ_ids: array
+    definitions: Dict[int, int]
+    # aberturas esperadas da pilha real (do topo para baixo), aberturas que
+    # sobraram no trecho e maior profundidade relativa ao início
+    needed: str
+    pushed: List[str]
+    depth: int
+    # estado no fim do trecho
+    line: int
+    col: int
+    in_block_comment: bool
+    let_pending: bool = field(default=False)
+
+
+# Limites [0, ..., len(text)] de até `parts` trechos, cada um terminando logo
+# após um "\n". Um corte que cairia dentro de um comentário de bloco é
+# empurrado para depois do "*/" (a conferência na junção cobre os casos que
+# a heurística erra, p.ex. "/*" dentro de strings).
+def split_points(text: str, parts: int, min_piece: int = MIN_PIECE) -> List[int]:
+    n = len(text)
+    parts = max(1, min(parts, n // max(1, min_piece)))
+    bounds = [0]
+    for k in range(1, parts):
+        cut = text.find("\n", max(bounds[-1], n * k // parts)) + 1
+        if cut == 0:
+            break
+        if text.rfind("/*", bounds[-1], cut) > text.rfind("*/", bounds[-1], cut):
+            end = text.find("*/", cut)
+            cut = 0 if end == -1 else text.find("\n", end) + 1
+            if cut == 0:
+                break
+        if cut >= n:
+            break
+        bounds.append(cut)
+    bounds.append(n)
+    return bounds
+
+
+def scan_piece(text: str, start: int, end: int, line: int, final: bool) -> PieceResult:
+    from lexer.lexical_code_scanner import LexicalCodeScanner
+
+    piece = text[start:end]
+    sc = LexicalCodeScanner(piece, engine="table")
+    sc.line = line
+    sc.offset = start
+    closers = piece.count(")") + piece.count("]") + piece.count("}")
+    seed = [_AnyOpener() for _ in range(closers)]
+    stack = sc._delimiter_stack = list(seed)
+    sc.max_delimiter_depth = len(seed)
+
+    types, starts, lengths = array("B"), array("q"), array("I")
+    lines, cols = array("I"), array("I")
+    add_type, add_start, add_length = types.append, starts.append, lengths.append
+    add_line, add_col = lines.append, cols.append
+    for ttype, s, e, tline, tcol in sc._scan_spans(final):
+        add_type(ttype.value)
+        add_start(start + s)
+        add_length(e - s)
+        add_line(tline)
+        add_col(tcol)
+
+    left = 0
+    while left < len(stack) and type(stack[left]) is _AnyOpener:
+        left += 1
+    needed = "".join(seed[k].opener for k in range(len(seed) - 1, left - 1, -1))
+    xref = sc.xref
+    return PieceResult(
+        types, starts, lengths, lines, cols,
+        [(name, entry["count"]) for name, entry in sc.symbols.items()],
+        xref.offsets, xref.lines, xref.cols, xref.ids, xref.definitions,
+        needed, stack[left:], sc.max_delimiter_depth - len(seed),
+        sc.line, sc.col, sc._in_block_comment, sc._let_end >= 0,
+    )
+
+
+# texto compartilhado com os processos (enviado uma vez, no início de cada um)
+_text = ""
+
+
+def _init_worker(text: str):
+    global _text
+    _text = text
+
+
+def _scan_task(task: Tuple[int, int, int, bool]) -> PieceResult:
+    return scan_piece(_text, *task)
+
+
+def _fits(sc: "LexicalCodeScanner", piece: PieceResult) -> bool:
+    if sc._in_block_comment or sc.col != 1:
+        return False
+    stack = sc._delimiter_stack
+    if len(piece.needed) > len(stack):
+        return False
+    return all(stack[-1 - k] == opener for k, opener in enumerate(piece.needed))
+
+
+def _merge(sc: "LexicalCodeScanner", buffer: TokenBuffer, piece: PieceResult, start: int, end: int, guess: int):
+    text = sc.text
+    delta = sc.line - guess
+    shift = (lambda values: array("I", [v + delta for v in values])) if delta else (lambda values: values)
+
+    buffer.types.extend(piece.types)
+    buffer.offsets.extend(piece.starts)
+    buffer.lengths.extend(piece.lengths)
+    buffer.lines.extend(shift(piece.lines))
+    buffer.cols.extend(piece.cols)
+
+    # ids globais seguem a ordem da primeira ocorrência, como na série
+    mapping = array("I", [0])
+    for name, count in piece.symbols:
+        entry = sc.symbols.get(name)
+        if entry is None:
+            entry = sc._add_symbol(name)
+            count -= 1
+        entry["count"] += count
+        mapping.append(entry["id"])
+
+    # um 'let' pendente do trecho anterior declara o primeiro identificador
+    xref = sc.xref
+    base = len(xref.ids)
+    let_pending = piece.let_pending
+    if sc._let_end >= 0:
+        if piece.occ_ids:
+            gid = mapping[piece.occ_ids[0]]
+            if gid not in xref.definitions and tables.only_trivia(text, start, piece.occ_offsets[0]):
+                xref.definitions[gid] = base
+        elif tables.only_trivia(text, start, end):
+            let_pending = True
+    xref.offsets.extend(piece.occ_offsets)
+    xref.lines.extend(shift(piece.occ_lines))
+    xref.cols.extend(piece.occ_cols)
+    xref.ids.extend(array("I", map(mapping.__getitem__, piece.occ_ids)))
+    for local, pos in piece.definitions.items():
+        xref.definitions.setdefault(mapping[local], base + pos)
+
+    stack = sc._delimiter_stack
+    sc.max_delimiter_depth = max(sc.max_delimiter_depth, len(stack) + piece.depth)
+    del stack[len(stack) - len(piece.needed):]
+    stack.extend(piece.pushed)
+
+    sc.line = piece.line + delta
+    sc.col = piece.col
+    sc._in_block_comment = piece.in_block_comment
+    sc._let_end = 0 if let_pending else -1
+
+
+def _rescan(sc: "LexicalCodeScanner", buffer: TokenBuffer, text: str, start: int, end: int, final: bool):
+    sc.text = text[start:end]
+    sc.i = 0
+    sc.offset = start
+    try:
+        buffer.extend_spans((t, start + s, start + e, line, col) for t, s, e, line, col in sc._scan_spans(final))
+    finally:
+        sc.text = text
+        sc.offset = 0
+
+
+# Varre sc.text (a partir de sc.i) com até `jobs` processos e devolve os
+# tokens num TokenBuffer; símbolos, referências cruzadas, pilha de
+# delimitadores e posição de sc ficam como depois de uma varredura serial.
+def scan_parallel(sc: "LexicalCodeScanner", jobs: Optional[int] = None, min_piece: int = MIN_PIECE) -> TokenBuffer:
+    text = sc.text
+    buffer = TokenBuffer(text)
+    jobs = jobs or os.cpu_count() or 1
+    bounds = [sc.i + b for b in split_points(text[sc.i:], jobs * 2, min_piece)]
+    if jobs == 1 or len(bounds) <= 2:
+        buffer.extend_spans(sc._scan_spans())
+        return buffer
+
+    tasks = []
+    line = sc.line
+    for k in range(len(bounds) - 1):
+        start, end = bounds[k], bounds[k + 1]
+        tasks.append((start, end, line, k == len(bounds) - 2))
+        line += text.count("\n", start, end)
+
+    with ProcessPoolExecutor(min(jobs, len(tasks)), initializer=_init_worker, initargs=(text,)) as pool:
+        for (start, end, guess, final), piece in zip(tasks, pool.map(_scan_task, tasks)):
+            if _fits(sc, piece):
+                _merge(sc, buffer, piece, start, end, guess)
+            else:
+                _rescan(sc, buffer, text, start, end, final)
+    sc.i = len(text)
+    return buffer
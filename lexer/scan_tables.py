@@ -0,0 +1,135 @@
+import re
+from lexer.operators import OPERATORS_2, OPERATORS_1, DELIMS
+
+# classes de caractere usadas pelo motor "table" do LexicalCodeScanner
+STRING = 0
+SPACE = 1
+IDENT = 2
+DIGIT = 3
+OPERATOR = 4
+PREPROCESSOR = 5
+DELIMITER = 6
+INVALID = 7
+
+_OPERATOR_STARTS = {op[0] for op in OPERATORS_2} | set(OPERATORS_1) | {"/"}
+
+
+# mesma ordem de prioridade dos guards de LexicalCodeScanner._scan_all_classic
+def classify(ch: str) -> int:
+    if ch == '"' or ch == "'":
+        return STRING
+    if ch.isspace():
+        return SPACE
+    if ch.isalpha() or ch == "_":
+        return IDENT
+    if ch.isdigit():
+        return DIGIT
+    if ch in _OPERATOR_STARTS:
+        return OPERATOR
+    if ch == "#":
+        return PREPROCESSOR
+    if ch in DELIMS:
+        return DELIMITER
+    return INVALID
+
+
+class _CharClassTable(dict):
+    # caracteres fora do ASCII são classificados na primeira ocorrência
+    def __missing__(self, ch: str) -> int:
+        cls = classify(ch)
+        self[ch] = cls
+        return cls
+
+
+CHAR_CLASSES = _CharClassTable((chr(c), classify(chr(c))) for c in range(128))
+
+# \s e \w equivalem exatamente a str.isspace() e str.isalnum() or "_"
+SPACE_RUN = re.compile(r"\s*").match
+WORD_RUN = re.compile(r"\w*").match
+ASCII_DIGIT_RUN = re.compile(r"[0-9]*").match
+LINE_REST = re.compile(r"[^\n\x00]*").match
+STRING_REST = {
+    '"': re.compile(r'[^"\n\x00]*').match,
+    "'": re.compile(r"[^'\n\x00]*").match,
+}
+
+OPENERS = {"(", "[", "{"}
+PAIRS = {")": "(", "]": "[", "}": "{"}
+
+
+def _alternation(chars) -> str:
+    return "|".join(re.escape(c) for c in sorted(chars, key=lambda c: (-len(c), c)))
+
+
+# Regex mestre (caminho rápido, só ASCII): um match por token, já
+# consumindo espaços/tabs à direita. Tudo o que ela não reconhece com
+# segurança (espaço no início da linha, floats, "1,2", "8a", comentários de
+# bloco, strings sem terminador, diretivas, Unicode, delimitador trocado)
+# segue pelo despacho por classe de caractere.
+M_IDENT = 1
+M_NUM = 2
+M_OP2 = 3
+M_OP1 = 4
+M_DELIM = 5
+M_OPEN = 6
+M_CLOSE = 7
+M_NEWLINE = 8
+M_DQ_STRING = 9
+M_SQ_STRING = 10
+M_LINE_COMMENT = 11
+
+_op1 = [op for op in OPERATORS_1 if op != "/"]
+MASTER = re.compile(
+    "(?:"
+    r"([A-Za-z_]\w*)"
+    r"|([0-9]+)(?![.,\w])"
+    f"|({_alternation(OPERATORS_2)})"
+    f"|({_alternation(_op1)}|/(?![/*]))"
+    f"|({_alternation(set(DELIMS) - OPENERS - set(PAIRS))})"
+    f"|({_alternation(OPENERS)})"
+    f"|({_alternation(PAIRS)})"
+    r"|(\n)"
+    r'|"([^"\n\x00]*)"'
+    r"|'([^'\n\x00]*)'"
+    r"|//[^\n\x00]*(\n)"
+    ")[ \t]*"
+).match
+
+
+def digits_end(text: str, j: int, n: int) -> int:
+    # str.isdigit() aceita dígitos Unicode (p.ex. "²") que [0-9] não cobre
+    j = ASCII_DIGIT_RUN(text, j).end()
+    while j < n and text[j].isdigit():
+        j = ASCII_DIGIT_RUN(text, j + 1).end()
+    return j
+
+
+# Fim de um comentário de bloco cuja busca por "*/" começa em search_from.
+# Como no motor clássico, um "\0" encerra o comentário sem ser consumido.
+# Devolve -1 se o comentário não termina antes de n.
+def block_comment_end(text: str, search_from: int, n: int) -> int:
+    end = text.find("*/", search_from, n)
+    stop = text.find("\0", search_from, n if end == -1 else end)
+    if stop != -1:
+        return stop
+    if end != -1:
+        return end + 2
+    return -1
+
+
+# text[i:j] só tem espaços e comentários (p.ex. entre 'let' e o nome
+# declarado)
+def only_trivia(text: str, i: int, j: int) -> bool:
+    while True:
+        i = SPACE_RUN(text, i, j).end()
+        if i >= j:
+            return True
+        two = text[i:i + 2]
+        if two == "//":
+            i = LINE_REST(text, i + 2, j).end()
+        elif two == "/*":
+            i = block_comment_end(text, i + 1, j)
+            if i == -1:
+                return True
+        else:
+            return False
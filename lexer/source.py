@@ -0,0 +1,36 @@
+import codecs
+import io
+import mmap
+import os
+from typing import Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+# Lê o arquivo em pedaços de até chunk_size caracteres, com a mesma tradução
+# de quebras de linha ("\r\n" e "\r" viram "\n") de open(path, "r").
+def iter_file_chunks(path: str, chunk_size: int = CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    with open(path, "r", encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+# Mesmo contrato de iter_file_chunks, mas sobre um mmap do arquivo:
+# chunk_size conta bytes e a decodificação é incremental, então caracteres
+# multibyte e "\r\n" partidos entre dois pedaços são tratados corretamente.
+def iter_mmap_chunks(path: str, chunk_size: int = CHUNK_SIZE, encoding: str = "utf-8") -> Iterator[str]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+            for offset in range(0, len(mm), chunk_size):
+                chunk = decoder.decode(mm[offset:offset + chunk_size])
+                if chunk:
+                    yield chunk
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
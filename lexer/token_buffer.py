@@ -0,0 +1,101 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Tuple
+from lexer.token import Token, TokenType
+
+# códigos compactos: TokenType usa auto(), então value já é um inteiro pequeno
+_TYPES_BY_CODE: Dict[int, TokenType] = {t.value: t for t in TokenType}
+
+_CACHE_LIMIT = 64
+
+
+# Buffer de tokens em colunas (struct-of-arrays): deslocamento e tamanho do
+# lexema no texto, código do tipo, linha e coluna ficam em arrays paralelos.
+# O lexema só é recortado de source quando pedido. Indexar o buffer devolve
+# um Token comum (com um pequeno cache, já que o parser consulta a mesma
+# posição várias vezes), então o Parser o aceita no lugar de uma lista.
+class TokenBuffer(Sequence):
+    def __init__(self, source: str):
+        self.source = source
+        self.offsets = array("q")
+        self.lengths = array("I")
+        self.types = array("B")
+        self.lines = array("I")
+        self.cols = array("I")
+        self._cache: Dict[int, Token] = {}
+
+    def append(self, ttype: TokenType, start: int, end: int, line: int, col: int):
+        self.offsets.append(start)
+        self.lengths.append(end - start)
+        self.types.append(ttype.value)
+        self.lines.append(line)
+        self.cols.append(col)
+
+    def extend_spans(self, spans: Iterable[Tuple[TokenType, int, int, int, int]]):
+        offsets, lengths, types = self.offsets.append, self.lengths.append, self.types.append
+        lines, cols = self.lines.append, self.cols.append
+        for ttype, start, end, line, col in spans:
+            offsets(start)
+            lengths(end - start)
+            types(ttype.value)
+            lines(line)
+            cols(col)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        tok = self._cache.get(idx)
+        if tok is None:
+            tok = Token(self.type_at(idx), self.lex_at(idx), self.lines[idx], self.cols[idx])
+            if len(self._cache) >= _CACHE_LIMIT:
+                self._cache.clear()
+            self._cache[idx] = tok
+        return tok
+
+    # acesso por coluna, sem materializar Token
+    def type_at(self, idx: int) -> TokenType:
+        return _TYPES_BY_CODE[self.types[idx]]
+
+    def lex_at(self, idx: int) -> str:
+        start = self.offsets[idx]
+        return self.source[start:start + self.lengths[idx]]
+
+    def line_at(self, idx: int) -> int:
+        return self.lines[idx]
+
+    def col_at(self, idx: int) -> int:
+        return self.cols[idx]
+
+    def to_list(self) -> List[Token]:
+        source, types = self.source, _TYPES_BY_CODE
+        return [Token(types[t], source[s:s + n], line, col)
+                for t, s, n, line, col in zip(self.types, self.offsets, self.lengths, self.lines, self.cols)]
+
+    # memória das colunas (o texto-fonte é compartilhado e não entra na conta)
+    def nbytes(self) -> int:
+        columns = (self.offsets, self.lengths, self.types, self.lines, self.cols)
+        return sys.getsizeof(self) + sum(sys.getsizeof(c) for c in columns)
+
+    def bytes_per_token(self) -> float:
+        return self.nbytes() / len(self) if len(self) else 0.0
+
+
+# Memória de uma lista de Token (dataclass) para comparação com TokenBuffer:
+# a lista, cada objeto com seu __dict__ e cada lexema distinto.
+def token_list_nbytes(tokens: List[Token]) -> int:
+    total = sys.getsizeof(tokens)
+    seen = set()
+    for tok in tokens:
+        total += sys.getsizeof(tok)
+        if hasattr(tok, "__dict__"):
+            total += sys.getsizeof(tok.__dict__)
+        if id(tok.lex) not in seen:
+            seen.add(id(tok.lex))
+            total += sys.getsizeof(tok.lex)
+    return total
@@ -0,0 +1,96 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class Occurrence(NamedTuple):
+    offset: int
+    line: int
+    col: int
+
+
+# Índice de referências cruzadas dos identificadores, preenchido pelo
+# LexicalCodeScanner na mesma passada que produz os tokens: para cada
+# ocorrência, deslocamento no texto, linha, coluna e id do símbolo (o id de
+# LexicalCodeScanner.symbols) em arrays paralelos, na ordem do texto.
+# definitions guarda, por id, a posição da primeira ocorrência logo depois
+# de 'let'.
+#
+# As posições de cada símbolo são agrupadas uma única vez, na primeira
+# consulta (e de novo se a varredura continuar); daí em diante contagem e
+# definição são O(1) e faixas de linhas e busca por posição são bisseções.
+class SymbolIndex:
+    def __init__(self, symbols: Dict[str, Dict[str, int]]):
+        self.symbols = symbols
+        self.offsets = array("q")
+        self.lines = array("I")
+        self.cols = array("I")
+        self.ids = array("I")
+        self.definitions: Dict[int, int] = {}
+        self._groups: Dict[int, array] = {}
+        self._grouped = 0
+        self._names: Dict[int, str] = {}
+
+    def add(self, sym: int, offset: int, line: int, col: int, definition: bool = False):
+        if definition and sym not in self.definitions:
+            self.definitions[sym] = len(self.ids)
+        self.offsets.append(offset)
+        self.lines.append(line)
+        self.cols.append(col)
+        self.ids.append(sym)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _group(self) -> Dict[int, array]:
+        groups = self._groups
+        ids = self.ids
+        if self._grouped < len(ids):
+            for k in range(self._grouped, len(ids)):
+                positions = groups.get(ids[k])
+                if positions is None:
+                    positions = groups[ids[k]] = array("I")
+                positions.append(k)
+            self._grouped = len(ids)
+        return groups
+
+    def _positions(self, name: str) -> array:
+        entry = self.symbols.get(name)
+        if entry is None:
+            return array("I")
+        return self._group().get(entry["id"], array("I"))
+
+    def _occurrence(self, k: int) -> Occurrence:
+        return Occurrence(self.offsets[k], self.lines[k], self.cols[k])
+
+    def count(self, name: str) -> int:
+        return len(self._positions(name))
+
+    def occurrences(self, name: str) -> List[Occurrence]:
+        return [self._occurrence(k) for k in self._positions(name)]
+
+    # primeira declaração com 'let' (None se o nome nunca é declarado)
+    def definition(self, name: str) -> Optional[Occurrence]:
+        entry = self.symbols.get(name)
+        k = None if entry is None else self.definitions.get(entry["id"])
+        return None if k is None else self._occurrence(k)
+
+    # ocorrências com first <= linha <= last
+    def in_lines(self, name: str, first: int, last: int) -> List[Occurrence]:
+        positions = self._positions(name)
+        line_of = self.lines.__getitem__
+        lo = bisect_left(positions, first, key=line_of)
+        hi = bisect_right(positions, last, lo, key=line_of)
+        return [self._occurrence(k) for k in positions[lo:hi]]
+
+    # identificador que cobre o deslocamento offset: (nome, ocorrência)
+    def symbol_at(self, offset: int) -> Optional[Tuple[str, Occurrence]]:
+        k = bisect_right(self.offsets, offset) - 1
+        if k < 0:
+            return None
+        if len(self._names) != len(self.symbols):
+            self._names = {entry["id"]: name for name, entry in self.symbols.items()}
+        name = self._names.get(self.ids[k])
+        if name is None or offset >= self.offsets[k] + len(name):
+            return None
+        return name, self._occurrence(k)
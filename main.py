@@ -1,32 +1,204 @@
 from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import TokenType
 from syntax.parser import Parser
-from syntax.tree import draw_tree
+from syntax.stats import Stats, phase
+from syntax.tree import count_nodes, draw_tiles, draw_tree, select_subtree
+from typing import Any, Dict, Optional, TYPE_CHECKING
 import sys
 import os
 
-def parse_code_example_file(filename: str):
-     with open(filename, 'r') as f:
-        codigo = f.read()
-        sc = LexicalCodeScanner(codigo)
-        sc.scan_all()
-        tokens = sc.get_tokens()
+# syntax.cache (hashlib, pickle, ...) só é importado quando há cache; o
+# matplotlib só quando um PNG é desenhado (MatplotlibRenderer)
+if TYPE_CHECKING:
+    from syntax.cache import ParseCache
 
-        parser = Parser(tokens)
-        ast = parser.parse_program()
+# modos de saída: --check só valida; --tokens lista os tokens; --json-ast
+# escreve a AST em JSON na saída padrão; --jsonl (saída padrão) e --ast
+# (<arquivo>.ast, binário) gravam a AST em fluxo, um comando por vez;
+# --png/--svg/--dot desenham a AST em <arquivo>.<formato> (--png é o padrão)
+MODES = ("check", "tokens", "json-ast", "jsonl", "ast", "png", "svg", "dot")
+STREAM_MODES = ("jsonl", "ast")
+DEFAULT_MODE = "png"
 
-        if len(parser.errors) == 0:
-            draw_tree(ast, filename + ".png")
-            print(f"[{filename}] - OK — AST construída")
+def _tile_size(value: str):
+    width, _, height = value.partition("x")
+    return float(width), float(height)
+
+# opções de desenho (--nome=valor): nível de detalhe (--max-depth,
+# --max-nodes), subárvore (--line ou --path), ladrilhos (--tiles=40x24) e
+# --layout=tidy
+DRAW_OPTIONS = {
+    "max-depth": int,
+    "max-nodes": int,
+    "line": int,
+    "path": str,
+    "tiles": _tile_size,
+    "layout": str,
+}
+
+def draw_ast(ast, filename: str, fmt: str, stats: Optional[Stats] = None,
+             options: Optional[Dict[str, Any]] = None):
+    options = dict(options or {})
+    line, path, tiles = options.pop("line", None), options.pop("path", None), options.pop("tiles", None)
+    kwargs = {name.replace("-", "_"): value for name, value in options.items()}
+    if line is not None or path is not None:
+        ast = select_subtree(ast, path, line)
+    if tiles is not None:
+        files = draw_tiles(ast, filename, fmt, tiles, stats=stats, **kwargs)
+        print(f"{len(files)} ladrilhos gravados em {filename}_*.{fmt}")
+    else:
+        draw_tree(ast, f"{filename}.{fmt}", stats=stats, **kwargs)
+
+# Devolve o número de erros sintáticos
+def parse_code_example_file(filename: str, cache: Optional["ParseCache"] = None, stats: Optional[Stats] = None,
+                            mode: str = DEFAULT_MODE, options: Optional[Dict[str, Any]] = None) -> int:
+    if mode not in MODES or mode == "tokens" or mode in STREAM_MODES:
+        raise ValueError(f"Modo desconhecido: {mode}")
+    if cache is not None:
+        from syntax.cache import analyse_text
+
+        # com cache o texto inteiro é necessário para calcular a chave
+        with phase(stats, "analyse"):
+            with open(filename, "r", encoding="utf-8") as f:
+                entry = analyse_text(f.read(), cache)
+        ast, errors = entry.ast, entry.errors
+        if stats is not None:
+            stats.add("tokens", len(entry.tokens))
+    elif mode == "check":
+        # só a validação: nenhum nó da AST é construído; com métricas os
+        # tokens são varridos antes, para medir as fases separadamente
+        from syntax.recognizer import recognize
+
+        sc = LexicalCodeScanner.from_file(filename)
+        ast = None
+        if stats is None:
+            errors = recognize(sc.iter_tokens())
         else:
-            print(f"[{filename}] - ERROS SINTÁTICOS")
-        for error in parser.errors:
-            print(f"  {error}")
+            with stats.phase("lex"):
+                tokens = sc.scan_all()
+            with stats.phase("recognize"):
+                errors = recognize(tokens, stats=stats)
+            stats.add("tokens", len(tokens))
+            stats.set_max("max_delimiter_depth", sc.max_delimiter_depth)
+    elif stats is not None:
+        # com métricas, léxico e sintático rodam em sequência para que cada
+        # fase seja medida separadamente
+        sc = LexicalCodeScanner.from_file(filename)
+        with stats.phase("lex"):
+            tokens = sc.scan_all()
+        parser = Parser(tokens, stats)
+        with stats.phase("parse"):
+            ast = parser.parse_program()
+        errors = parser.errors
+        stats.add("tokens", len(tokens))
+        stats.set_max("max_delimiter_depth", sc.max_delimiter_depth)
+    else:
+        # o arquivo é lido em pedaços e os tokens vão direto para o parser
+        sc = LexicalCodeScanner.from_file(filename)
+        parser = Parser(sc.iter_tokens())
+        ast, errors = parser.parse_program(), parser.errors
+
+    if stats is not None:
+        if ast is not None:
+            stats.add("nodes", count_nodes(ast))
+        stats.add("errors", len(errors))
+
+    # em --json-ast a saída padrão é só o JSON; as mensagens vão para stderr
+    report = sys.stderr if mode == "json-ast" else sys.stdout
+    if len(errors) == 0:
+        if mode == "json-ast":
+            from syntax.serialize import write_json
+
+            write_json(ast, sys.stdout)
+            sys.stdout.write("\n")
+        elif mode != "check":
+            draw_ast(ast, filename, mode, stats, options)
+        print(f"[{filename}] - OK" if mode == "check" else f"[{filename}] - OK — AST construída", file=report)
+    else:
+        print(f"[{filename}] - ERROS SINTÁTICOS", file=report)
+    for error in errors:
+        print(f"  {error}", file=report)
+    return len(errors)
+
+# Grava cada comando do topo assim que o parser o entrega (syntax.serialize),
+# sem montar o ProgramNode. Com erros, a saída tem os comandos reconhecidos.
+# Devolve o número de erros sintáticos.
+def stream_ast(filename: str, mode: str, stats: Optional[Stats] = None) -> int:
+    from syntax.serialize import BinaryASTWriter, JsonLinesASTWriter
+
+    parser = Parser(LexicalCodeScanner.from_file(filename).iter_tokens(), stats)
+    if mode == "jsonl":
+        out, report = sys.stdout, sys.stderr
+        writer = JsonLinesASTWriter(out)
+    else:
+        out, report = open(filename + ".ast", "wb"), sys.stdout
+        writer = BinaryASTWriter(out)
+    try:
+        with phase(stats, "parse"):
+            for stmt in parser.iter_statements():
+                writer.write(stmt)
+        writer.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    errors = parser.errors
+    if stats is not None:
+        stats.add("errors", len(errors))
+    if errors:
+        print(f"[{filename}] - ERROS SINTÁTICOS", file=report)
+    else:
+        print(f"[{filename}] - OK — AST construída", file=report)
+    for error in errors:
+        print(f"  {error}", file=report)
+    return len(errors)
+
+# Lista os tokens (linha:coluna, tipo, lexema) sem rodar o parser. Devolve o
+# número de tokens ERRO. Com métricas, a fase "lex" inclui a escrita da
+# lista, que é feita à medida que o texto é varrido.
+def print_tokens(filename: str, stats: Optional[Stats] = None) -> int:
+    out = sys.stdout
+    bad = count = 0
+    sc = LexicalCodeScanner.from_file(filename)
+    with phase(stats, "lex"):
+        for tok in sc.iter_tokens():
+            count += 1
+            if tok.type == TokenType.ERRO:
+                bad += 1
+            out.write(f"{tok.line}:{tok.col}\t{tok.type.name}\t{tok.lex!r}\n")
+    if stats is not None:
+        stats.add("tokens", count)
+        stats.add("error_tokens", bad)
+        stats.set_max("max_delimiter_depth", sc.max_delimiter_depth)
+    return bad
 
 SOURCE_DIR = "code_examples"
 
 if __name__ == "__main__":
-    if (len(sys.argv) != 2):
-        print("Uso: python main.py <arquivo_fonte>")
+    # --stats imprime as métricas em JSON no fim; --stats=arquivo.json grava
+    # o JSON no arquivo
+    args = [a for a in sys.argv[1:] if a != "--stats" and not a.startswith("--stats=")]
+    stats_flags = [a for a in sys.argv[1:] if a not in args]
+    stats = Stats() if stats_flags else None
+
+    mode_flags = [a for a in args if a.startswith("--") and a[2:] in MODES]
+    args = [a for a in args if a not in mode_flags]
+    mode = mode_flags[-1][2:] if mode_flags else DEFAULT_MODE
+
+    options: Dict[str, Any] = {}
+    option_flags = [a for a in args if a.startswith("--") and a[2:].partition("=")[0] in DRAW_OPTIONS]
+    args = [a for a in args if a not in option_flags]
+    for flag in option_flags:
+        name, _, value = flag[2:].partition("=")
+        try:
+            options[name] = DRAW_OPTIONS[name](value)
+        except ValueError:
+            print(f"Erro: valor inválido para --{name}: '{value}'")
+            sys.exit(1)
+
+    if (len(args) != 1 or len(mode_flags) > 1):
+        print("Uso: python main.py <arquivo_fonte> [--check|--tokens|--json-ast|--jsonl|--ast|--png|--svg|--dot] [--stats[=saida.json]]")
+        print("       [--max-depth=N] [--max-nodes=N] [--line=N|--path=0.1.2] [--tiles=LARGxALT] [--layout=tidy]")
 
         try:
             available_files = [f for f in os.listdir(SOURCE_DIR) if os.path.isfile(os.path.join(SOURCE_DIR, f))]
@@ -43,12 +215,33 @@ if __name__ == "__main__":
 
         sys.exit(1)
     else:
-        filename = sys.argv[1]
-        filepath = os.path.join(SOURCE_DIR, filename)
+        filename = args[0]
+        # caminhos existentes são usados como estão (ganchos de pre-commit
+        # passam caminhos do repositório); senão o arquivo é procurado em
+        # code_examples
+        filepath = filename if os.path.isfile(filename) else os.path.join(SOURCE_DIR, filename)
 
         try:
-            parse_code_example_file(filepath)
+            if mode == "tokens":
+                failures = print_tokens(filepath, stats)
+            elif mode in STREAM_MODES:
+                failures = stream_ast(filepath, mode, stats)
+            else:
+                failures = parse_code_example_file(filepath, stats=stats, mode=mode, options=options)
         except FileNotFoundError:
             print(f"Erro: O arquivo '{filename}' não foi encontrado'.")
             sys.exit(1)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            sys.exit(1)
+
+        if stats is not None:
+            target = stats_flags[-1].partition("=")[2]
+            if target:
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(stats.to_json())
+            else:
+                # --tokens, --json-ast e --jsonl usam a saída padrão para os dados
+                print(stats.to_json(), file=sys.stderr if mode in ("tokens", "json-ast", "jsonl") else sys.stdout)
 
+        sys.exit(1 if failures else 0)
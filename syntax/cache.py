@@ -0,0 +1,245 @@
+import dataclasses
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
+from lexer.keywords import KEYWORDS
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.operators import DELIMS, OPERATORS_1, OPERATORS_2
+from lexer.token import Token, TokenType
+import lexer.lexical_code_scanner
+import lexer.scan_tables
+import lexer.scanner
+import lexer.source
+import lexer.token_buffer
+import syntax.grammar
+import syntax.node
+import syntax.parser
+import syntax.precedence
+import syntax.serialize
+import syntax.token_window
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "c-lex-syntax")
+DEFAULT_MAX_BYTES = 256 << 20
+EVICT_TO = 0.9
+
+# incrementar quando o formato das entradas mudar
+CACHE_FORMAT = 2
+# arquivo gravado em cada diretório de versão: só diretórios com esse
+# marcador (e nome de carimbo) são apagados como versões antigas
+MARKER = ".c-lex-syntax-cache"
+_STAMP_CHARS = frozenset("0123456789abcdef")
+
+
+@dataclass
+class CachedAnalysis:
+    tokens: List[Token]
+    ast: syntax.node.ProgramNode
+    errors: List[str]
+
+
+_TYPES_BY_CODE = {t.value: t for t in TokenType}
+
+
+# tokens em colunas: bem menor e mais rápido de (des)serializar do que uma
+# lista de objetos Token
+def _pack_tokens(tokens: List[Token]) -> tuple:
+    return (
+        bytes(t.type.value for t in tokens),
+        [t.lex for t in tokens],
+        array("I", [t.line for t in tokens]),
+        array("I", [t.col for t in tokens]),
+    )
+
+
+def _unpack_tokens(packed: tuple) -> List[Token]:
+    types, lexes, lines, cols = packed
+    by_code = _TYPES_BY_CODE
+    return [Token(by_code[c], lex, line, col) for c, lex, line, col in zip(types, lexes, lines, cols)]
+
+
+# AST no formato binário de syntax.serialize, que é iterativo: o pickle de
+# uma cadeia longa de BinOpNode estoura o limite de recursão
+def _pack_ast(ast: syntax.node.ProgramNode) -> bytes:
+    out = io.BytesIO()
+    syntax.serialize.dump_binary(ast, out)
+    return out.getvalue()
+
+
+def _unpack_ast(data: bytes) -> syntax.node.ProgramNode:
+    return syntax.serialize.load_binary(io.BytesIO(data))
+
+
+def _node_classes() -> List[type]:
+    return [c for c in vars(syntax.node).values()
+            if isinstance(c, type) and issubclass(c, syntax.node.Node)]
+
+
+# Módulos cujo código decide os tokens e a AST gravados no cache: o scanner
+# e o que ele usa para ler o texto, as tabelas de precedência e LL(1) e o
+# parser com sua janela de tokens.
+STAMPED_MODULES = (
+    lexer.scanner, lexer.lexical_code_scanner, lexer.scan_tables, lexer.source,
+    lexer.token_buffer, syntax.precedence, syntax.grammar, syntax.token_window,
+    syntax.parser, syntax.serialize,
+)
+
+
+# Carimbo de versão: muda quando as tabelas do lexer, os tipos de token, os
+# campos dos nós ou o código de STAMPED_MODULES mudam. Entradas de outra
+# versão ficam em outro diretório e são apagadas ao abrir o cache.
+def version_stamp() -> str:
+    h = hashlib.sha256()
+    h.update(str(CACHE_FORMAT).encode())
+    for table in (KEYWORDS, OPERATORS_1, OPERATORS_2, DELIMS):
+        h.update(repr(sorted((k, str(v)) for k, v in table.items())).encode())
+    h.update(repr([(t.name, t.value) for t in TokenType]).encode())
+    for cls in sorted(_node_classes(), key=lambda c: c.__name__):
+        h.update(repr((cls.__name__, [f.name for f in dataclasses.fields(cls)])).encode())
+    for module in STAMPED_MODULES:
+        with open(module.__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+# Cache em disco endereçado pelo conteúdo: a chave é o sha256 do texto-fonte
+# e cada entrada guarda tokens em colunas, a AST em binário e os erros num
+# pickle. O tamanho total é
+# limitado a max_bytes com despejo LRU (o mtime do arquivo marca o último
+# acesso). Gravações são atômicas (arquivo temporário + os.replace), então
+# vários processos podem usar o mesmo diretório.
+class ParseCache:
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stamp = version_stamp()
+        self.root = os.path.join(directory, self.stamp)
+        self.hits = 0
+        self.misses = 0
+        self._make_root()
+        self._drop_stale_versions()
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _make_root(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, MARKER), "a"):
+            pass
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".pickle")
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".pickle"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st.st_mtime_ns, st.st_size
+
+    # O diretório do cache pode ter outros arquivos do usuário: só são
+    # apagados diretórios de outras versões criados pelo próprio cache
+    @staticmethod
+    def _owned_version(path: str, name: str) -> bool:
+        return (len(name) == 16 and set(name) <= _STAMP_CHARS and not os.path.islink(path)
+                and os.path.isdir(path) and os.path.isfile(os.path.join(path, MARKER)))
+
+    def _drop_stale_versions(self):
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name != self.stamp and self._owned_version(path, name):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def size(self) -> int:
+        return self._size
+
+    def get(self, text: str) -> Optional[CachedAnalysis]:
+        path = self._path(self.key(text))
+        try:
+            with open(path, "rb") as f:
+                packed, ast, errors = pickle.load(f)
+            entry = CachedAnalysis(_unpack_tokens(packed), _unpack_ast(ast), errors)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError, KeyError):
+            # entrada corrompida ou incompatível: descarta e segue como falta
+            self._discard(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, text: str, entry: CachedAnalysis):
+        path = self._path(self.key(text))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((_pack_tokens(entry.tokens), _pack_ast(entry.ast), entry.errors), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._size += os.path.getsize(path) - old
+        if self._size > self.max_bytes:
+            self.evict()
+
+    # Remove as entradas menos usadas até o total cair para uma fração de
+    # max_bytes; a folga evita varrer o diretório a cada gravação.
+    def evict(self, target: Optional[int] = None):
+        if target is None:
+            target = int(self.max_bytes * EVICT_TO)
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            self._discard(path)
+            total -= size
+        self._size = total
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._make_root()
+        self._size = 0
+
+    def _discard(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._size -= size
+        except FileNotFoundError:
+            pass
+
+
+# Análise completa com o cache: na falta, varre e analisa o texto e grava o
+# resultado.
+def analyse_text(text: str, cache: Optional[ParseCache] = None) -> CachedAnalysis:
+    if cache is not None:
+        entry = cache.get(text)
+        if entry is not None:
+            return entry
+    sc = LexicalCodeScanner(text, engine="table")
+    tokens = sc.scan_all()
+    parser = syntax.parser.Parser(tokens)
+    entry = CachedAnalysis(tokens, parser.parse_program(), parser.errors)
+    if cache is not None:
+        cache.put(text, entry)
+    return entry
@@ -0,0 +1,83 @@
+from typing import Dict, List
+from lexer.token import TokenType
+from syntax.precedence import BINARY_PRECEDENCE
+
+# Tabelas LL(1) do parser, indexadas pelo código inteiro do tipo de token:
+# o valor do TokenType (o mesmo de TokenBuffer e do cache), lido de
+# tok.type._value_, bem mais barato que .value ou que o hash do Enum. O token
+# "EOL" sintético que o parser devolve depois do fim da entrada tem o código
+# END. Conjuntos são bitsets: `BITS >> code & 1`.
+
+
+class _EndOfInput(str):
+    _value_ = 0
+
+
+# tipo do token sintético de fim da entrada; continua igual a "EOL" (e é
+# assim que aparece nas mensagens de erro)
+END_OF_INPUT = _EndOfInput("EOL")
+END = END_OF_INPUT._value_
+MAX_CODE = max(t.value for t in TokenType)
+
+T_ID = TokenType.ID.value
+T_NUM = TokenType.NUM.value
+T_EOL = TokenType.EOL.value
+T_STR_VALUE = TokenType.STR_VALUE.value
+T_ASSIGN = TokenType.ASSIGN.value
+T_ELSE = TokenType.ELSE.value
+T_SEMI = TokenType.SEMI.value
+T_COMMA = TokenType.COMMA.value
+T_LPAREN = TokenType.LPAREN.value
+T_RPAREN = TokenType.RPAREN.value
+T_RBRACE = TokenType.RBRACE.value
+T_LBRACK = TokenType.LBRACK.value
+T_RBRACK = TokenType.RBRACK.value
+
+
+def bits(*types: TokenType) -> int:
+    mask = 0
+    for t in types:
+        mask |= 1 << t.value
+    return mask
+
+
+# início de uma expressão (inicializador do let)
+FIRST_EXPRESSION = bits(TokenType.NUM, TokenType.ID, TokenType.LPAREN, TokenType.STR_VALUE)
+# operando vazio: a expressão termina sem consumir nada
+EMPTY_OPERAND = bits(TokenType.SEMI, TokenType.EOL, TokenType.RBRACE)
+
+# Recuperação de erros (Parser.synchronize): descarta tokens até consumir um
+# terminador de comando ou até parar antes do início de um comando
+SYNC_AFTER = bits(TokenType.SEMI, TokenType.RBRACE, TokenType.EOL)
+SYNC_BEFORE = bits(TokenType.LET, TokenType.IF, TokenType.WHILE, TokenType.RETURN, TokenType.LBRACE,
+                   TokenType.ID, TokenType.NUM)
+
+# Comandos: código do primeiro token -> método do Parser que o analisa
+# (UNEXPECTED_STATEMENT para os demais). Os métodos são resolvidos por
+# instância, então subclasses que os redefinem (Recognizer,
+# IncrementalParser) usam a mesma tabela.
+STATEMENT_RULES: Dict[TokenType, str] = {
+    TokenType.LET: "parse_let_statement",
+    TokenType.IF: "parse_if_statement",
+    TokenType.WHILE: "parse_while_statement",
+    TokenType.RETURN: "parse_return_statement",
+    TokenType.LBRACE: "parse_block",
+    TokenType.ELSE: "_else_without_if",
+    TokenType.ID: "parse_assignment_or_expression_statement",
+    TokenType.NUM: "parse_expression_statement",
+    TokenType.LPAREN: "parse_expression_statement",
+    TokenType.PP_DIRECTIVE: "_skip_statement_token",
+    TokenType.EOF: "_skip_statement_token",
+}
+UNEXPECTED_STATEMENT = "_unexpected_statement"
+
+
+# precedência do operador binário por código (None se não é operador)
+def _precedence_by_code() -> List:
+    table = [None] * (MAX_CODE + 1)
+    for ttype, level in BINARY_PRECEDENCE.items():
+        table[ttype.value] = level
+    return table
+
+
+PRECEDENCE_BY_CODE = _precedence_by_code()
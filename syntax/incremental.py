@@ -0,0 +1,341 @@
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from lexer.token import Token, TokenType
+from syntax.node import Node, ProgramNode
+from syntax.parser import Parser
+from syntax.visitor import walk
+
+
+# Trecho de tokens consumido por uma chamada de parse_statement.
+# start é relativo ao início do comando pai (no topo, o início absoluto
+# fica em IncrementalParser._starts); reach é o último índice examinado,
+# relativo a start, incluindo o lookahead além do último token consumido;
+# line é a linha do primeiro token quando as linhas dos nós foram acertadas
+# pela última vez; errors guarda os erros emitidos dentro do comando
+# (inclusive nos comandos aninhados).
+@dataclass(slots=True)
+class StatementSpan:
+    start: int
+    length: int
+    reach: int
+    line: int
+    node: Optional[Node]
+    errors: List[str]
+    children: List["StatementSpan"] = field(default_factory=list)
+
+
+# toda mensagem de erro do Parser termina com a linha do token ("na linha N";
+# -1 quando o token é o fim da entrada, que não se desloca)
+_ERROR_LINE = re.compile(r"na linha (\d+)$")
+
+
+def _shift_errors(errors: List[str], delta: int) -> List[str]:
+    return [_ERROR_LINE.sub(lambda m: f"na linha {int(m.group(1)) + delta}", e) for e in errors]
+
+
+def _shift_node_lines(root: Node, delta: int):
+    for node in walk(root):
+        if node.line >= 0:
+            node.line += delta
+
+
+def _shift_span_lines(span: StatementSpan, delta: int):
+    stack = [span]
+    while stack:
+        current = stack.pop()
+        if current.line >= 0:
+            current.line += delta
+        if current.errors:
+            current.errors = _shift_errors(current.errors, delta)
+        stack.extend(current.children)
+    if span.node is not None:
+        _shift_node_lines(span.node, delta)
+
+
+# Reanálise incremental: guarda o trecho de tokens de cada comando (em
+# qualquer profundidade) e, depois de uma edição nos tokens, reanalisa só os
+# comandos cujo trecho examinado cruza a edição. Comandos sem erros fora da
+# região afetada são reaproveitados onde quer que o parser volte a começar
+# um comando na mesma posição; no nível do programa, a análise para no
+# primeiro comando antigo depois da edição e o restante é reaproveitado.
+#
+# tokens deve ser a mesma lista que o lexer atualiza (p.ex.
+# IncrementalLexer.tokens) e reparse recebe o que IncrementalLexer.apply_edit
+# devolve: (primeiro índice alterado, tokens removidos, tokens inseridos).
+#
+# Para que uma edição custe o tamanho da região reanalisada e não o do
+# arquivo, o início de cada comando do topo (em tokens) e a sua posição em
+# program.body ficam em arrays com "gap", como em lexer.incremental: antes
+# de self._gap são absolutos, a partir dele são relativos ao total (de
+# tokens e de comandos). As linhas também não são corrigidas na edição: o
+# comando guarda a linha do seu primeiro token quando os nós foram
+# acertados, e a diferença para a linha atual desse token é aplicada aos
+# nós (e às mensagens de erro) só em parse_program. Os comandos a partir de
+# self._stale_from são os que podem estar com as linhas atrasadas.
+class IncrementalParser(Parser):
+    def __init__(self, tokens: List[Token]):
+        super().__init__(tokens)
+        self.program = ProgramNode(body=[], line=1, col=1)
+        self._collector: List[StatementSpan] = []
+        self._parent_start = 0
+        self._reach = -1
+        self._max_overshoot = 0
+        self._candidates: Dict[int, StatementSpan] = {}
+        self._edit = None
+        self._old_tokens = 0
+        self._stale_from: Optional[int] = None
+
+        spans = self._parse_top_level(0, None)
+        self.spans = spans
+        self.program.body = [s.node for s in spans if s.node is not None]
+        self._starts = array("q", (s.start for s in spans))
+        self._body_pos = array("q", self._positions(spans, 0))
+        self._gap = len(spans)
+        self._errors = None
+
+    # errors é montado a partir dos comandos quando lido (e guardado até a
+    # próxima edição); durante a análise é a lista em que emit_error escreve
+    @property
+    def errors(self) -> List[str]:
+        if self._errors is None:
+            self._errors = self._collect_errors()
+        return self._errors
+
+    @errors.setter
+    def errors(self, value: List[str]):
+        self._errors = value
+
+    @staticmethod
+    def _positions(spans: List[StatementSpan], first: int) -> List[int]:
+        out = []
+        for span in spans:
+            out.append(first)
+            if span.node is not None:
+                first += 1
+        return out
+
+    def _has(self, idx: int) -> bool:
+        if idx > self._reach:
+            self._reach = idx
+        return idx < len(self.tokens)
+
+    # início do comando idx do topo; ntokens é o total de tokens ao qual os
+    # valores relativos se referem
+    def _start_of(self, idx: int, ntokens: int) -> int:
+        value = self._starts[idx]
+        return value if idx < self._gap else value + ntokens
+
+    def _body_of(self, idx: int) -> int:
+        if idx == len(self.spans):
+            return len(self.program.body)
+        value = self._body_pos[idx]
+        return value if idx < self._gap else value + len(self.program.body)
+
+    def _move_gap(self, gap: int, ntokens: int):
+        starts, body_pos, nbody = self._starts, self._body_pos, len(self.program.body)
+        if gap < self._gap:
+            starts[gap:self._gap] = array("q", [v - ntokens for v in starts[gap:self._gap]])
+            body_pos[gap:self._gap] = array("q", [v - nbody for v in body_pos[gap:self._gap]])
+        elif gap > self._gap:
+            starts[self._gap:gap] = array("q", [v + ntokens for v in starts[self._gap:gap]])
+            body_pos[self._gap:gap] = array("q", [v + nbody for v in body_pos[self._gap:gap]])
+        self._gap = gap
+
+    # diferença entre a linha atual do primeiro token do comando idx e a
+    # linha com que os nós dele foram gravados
+    def _line_delta(self, idx: int) -> int:
+        span = self.spans[idx]
+        if span.line < 0:
+            return 0
+        return self.tokens[self._start_of(idx, len(self.tokens))].line - span.line
+
+    def _collect_errors(self) -> List[str]:
+        stale = len(self.spans) if self._stale_from is None else self._stale_from
+        out: List[str] = []
+        for idx, span in enumerate(self.spans):
+            if span.errors:
+                delta = self._line_delta(idx) if idx >= stale else 0
+                out.extend(_shift_errors(span.errors, delta) if delta else span.errors)
+        return out
+
+    def parse_program(self) -> ProgramNode:
+        if self._stale_from is not None:
+            for idx in range(self._stale_from, len(self.spans)):
+                delta = self._line_delta(idx)
+                if delta:
+                    _shift_span_lines(self.spans[idx], delta)
+            self._stale_from = None
+        return self.program
+
+    # último comando do topo que começa em pos ou antes (posições antigas)
+    def _index_at(self, pos: int, ntokens: int) -> int:
+        lo, hi = 0, len(self.spans)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._start_of(mid, ntokens) <= pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    # Reanalisa depois da edição e devolve (primeiro índice alterado em
+    # program.body, comandos removidos, comandos inseridos). As linhas dos
+    # comandos seguintes são acertadas em parse_program.
+    def reparse(self, first: int, removed: int, inserted: int) -> Tuple[int, int, int]:
+        spans = self.spans
+        n = len(spans)
+        shift = inserted - removed
+        old_tokens = len(self.tokens) - shift
+        old_end = first + removed
+
+        # primeiro comando do topo cujo trecho examinado alcança a edição
+        a = max(0, min(self._index_at(first, old_tokens), n - 1))
+        i = a - 1
+        while i >= 0 and self._start_of(i + 1, old_tokens) - 1 + self._max_overshoot >= first:
+            if self._start_of(i, old_tokens) + spans[i].reach >= first:
+                a = i
+            i -= 1
+        # os comandos a partir de a passam a ser relativos ao total antigo
+        self._move_gap(a, old_tokens)
+
+        self._old_tokens = old_tokens
+        self._edit = (a, first, old_end, inserted, shift)
+        self._candidates = {}
+        for idx in range(a, n):
+            start = self._start_of(idx, old_tokens)
+            if start >= old_end:
+                break
+            self._explode(spans[idx], start)
+
+        sync = {}
+        self.errors = []
+        new_spans = self._parse_top_level(self._start_of(a, old_tokens) if n else 0, sync)
+        stop = sync.get("index", n)
+        self._candidates = {}
+        self._edit = None
+
+        b0, b1 = self._body_of(a), self._body_of(stop)
+        new_nodes = [s.node for s in new_spans if s.node is not None]
+        spans[a:stop] = new_spans
+        self.program.body[b0:b1] = new_nodes
+        self._starts[a:stop] = array("q", (s.start for s in new_spans))
+        self._body_pos[a:stop] = array("q", self._positions(new_spans, b0))
+        self._gap = a + len(new_spans)
+
+        # os comandos reaproveitados depois de stop continuam com as linhas
+        # antigas se a edição mudou o número de linhas
+        stale = self._stale_from
+        if stale is not None and stale >= a:
+            stale = stale + len(new_spans) - (stop - a) if stale >= stop else self._gap
+        if sync.get("delta"):
+            stale = self._gap if stale is None else min(stale, self._gap)
+        self._stale_from = stale if stale is not None and stale < len(spans) else None
+        self._errors = None
+        return b0, b1 - b0, len(new_nodes)
+
+    def _is_affected(self, start: int, reach: int) -> bool:
+        _, first, old_end, _, _ = self._edit
+        return start + reach >= first and start < old_end
+
+    def _explode(self, span: StatementSpan, abs_start: int):
+        _, first, old_end, _, shift = self._edit
+        for child in span.children:
+            child_start = abs_start + child.start
+            if self._is_affected(child_start, child.reach) or child.errors:
+                self._explode(child, child_start)
+            elif child_start >= old_end:
+                self._candidates[child_start + shift] = child
+            else:
+                self._candidates[child_start] = child
+
+    # comando antigo do topo que começava na posição antiga old (a partir do
+    # primeiro afetado, que está no gap) ou -1
+    def _old_index(self, old: int) -> int:
+        a = self._edit[0]
+        target = old - self._old_tokens
+        idx = bisect_left(self._starts, target, a, len(self.spans))
+        if idx == len(self.spans) or self._starts[idx] != target:
+            return -1
+        return idx
+
+    def _lookup(self, pos: int) -> Optional[StatementSpan]:
+        span = self._candidates.get(pos)
+        if span is not None or self._edit is None:
+            return span
+        a, first, old_end, inserted, shift = self._edit
+        if pos < first:
+            old = pos
+        elif pos >= first + inserted:
+            old = pos - shift
+        else:
+            return None
+        idx = self._old_index(old)
+        if idx < 0:
+            return None
+        span = self.spans[idx]
+        if span.errors or self._is_affected(old, span.reach):
+            return None
+        return span
+
+    def _parse_top_level(self, pos: int, sync: Optional[dict]) -> List[StatementSpan]:
+        spans: List[StatementSpan] = []
+        self.pos = pos
+        self._collector = spans
+        self._parent_start = 0
+        while self._has(self.pos):
+            if sync is not None and self._try_sync(sync):
+                break
+            if self.match(TokenType.EOL):
+                eol = self.consume(TokenType.EOL)
+                spans.append(StatementSpan(self.pos - 1, 1, 0, eol.line, None, []))
+                continue
+            self.parse_statement()
+        for span in spans:
+            self._max_overshoot = max(self._max_overshoot, span.reach - span.length + 1)
+        return spans
+
+    # para no primeiro comando antigo, depois da edição, que começa onde o
+    # parser está; com erros ou não, ele e os seguintes são reaproveitados
+    # (as mensagens ganham a linha nova em _shift_span_lines)
+    def _try_sync(self, sync: dict) -> bool:
+        a, first, old_end, inserted, shift = self._edit
+        pos = self.pos
+        if pos < first + inserted:
+            return False
+        idx = self._old_index(pos - shift)
+        if idx < 0:
+            return False
+        sync["index"] = idx
+        sync["delta"] = self.tokens[pos].line - self.spans[idx].line
+        return True
+
+    def parse_statement(self):
+        start = self.pos
+        reused = self._lookup(start) if self._edit is not None else None
+        if reused is not None and start < len(self.tokens):
+            delta = self.tokens[start].line - reused.line
+            if delta:
+                _shift_span_lines(reused, delta)
+            reused.start = start - self._parent_start
+            self.pos = start + reused.length
+            self._reach = max(self._reach, start + reused.reach)
+            self._collector.append(reused)
+            return reused.node
+
+        collector, parent_start, outer_reach = self._collector, self._parent_start, self._reach
+        children: List[StatementSpan] = []
+        self._collector, self._parent_start, self._reach = children, start, start
+        n_errors = len(self.errors)
+
+        node = super().parse_statement()
+
+        reach = self._reach
+        line = self.tokens[start].line if start < len(self.tokens) else -1
+        span = StatementSpan(start - parent_start, self.pos - start, reach - start, line,
+                             node, self.errors[n_errors:], children)
+        self._collector, self._parent_start, self._reach = collector, parent_start, max(outer_reach, reach)
+        collector.append(span)
+        return node
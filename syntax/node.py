@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Any, Union
+from typing import Callable, List, Any, Optional, Union
 
 NodeLike = Union[
     "ProgramNode", "LetNode", "AssignNode", "IfNode", "WhileNode",
@@ -8,108 +8,120 @@ NodeLike = Union[
 ]
 
 
-@dataclass
+# slots=True: sem __dict__ por instância; os nomes dos campos não mudam
+@dataclass(slots=True)
 class Node: pass
 
-@dataclass
+@dataclass(slots=True)
 class ProgramNode(Node):
     body: List[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class LetNode(Node):
-    lhs: Any
-    init: Any
+    lhs: "IdentifierNode"
+    init: Optional[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class AssignNode(Node):
-    target: Any
-    value: Any
+    target: Node
+    value: Node
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class IfNode(Node):
-    test: Any
-    then: Any
-    otherwise: Any
+    test: Node
+    then: Optional[Node]
+    otherwise: Optional[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class WhileNode(Node):
-    test: Any
-    body: Any
+    test: Node
+    body: Optional[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class ReturnNode(Node):
-    value: Any
+    value: Optional[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class BlockNode(Node):
-    body: List[Any]
+    body: List[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class CallNode(Node):
-    callee: Any
-    args: List[Any]
+    callee: Node
+    args: List[Node]
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class IndexNode(Node):
-    target: Any
-    index: Any
+    target: Node
+    index: Node
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class BinOpNode(Node):
-    left: Any
-    right: Any
+    left: Node
+    right: Node
     op: str
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class IdentifierNode(Node):
     name: str
     line: int
     col: int
 
-@dataclass
+@dataclass(slots=True)
 class LiteralNode(Node):
-    value: Any
+    value: Union[str, int]
     line: int
     col: int
 
 NodeLike = Any
 
+def _bool_label(n: NodeLike) -> str:
+    v = getattr(n, "value", None)
+    return f"Bool({str(v).lower()})" if isinstance(v, bool) else "Bool(?)"
+
+# rótulo por nome de classe: texto fixo ou função do nó
+_LABELS = {
+    "ProgramNode": "Program",
+    "LetNode":     "Let",
+    "AssignNode":  "Assign",
+    "IfNode":      "If",
+    "WhileNode":   "While",
+    "ReturnNode":  "Return",
+    "BlockNode":   "Block",
+    "CallNode":    "Call",
+    "IndexNode":   "Index",
+    "BinOpNode":   lambda n: f"BinOp('{getattr(n, 'op', '?')}')",
+    "VarNode":     lambda n: f"Id({getattr(n, 'name', '?')})",
+    "NumNode":     lambda n: f"Num({getattr(n, 'value', '?')})",
+    "BoolNode":    _bool_label,
+}
+
+# Classes definidas fora deste módulo (p.ex. ViewNode em syntax.tree)
+# registram o próprio rótulo aqui
+def register_label(cls: type, label: Union[str, Callable[[NodeLike], str]]):
+    _LABELS[cls.__name__] = label
+
 def node_label(n: NodeLike) -> str:
     tname = type(n).__name__
-    if tname == "ProgramNode": return "Program"
-    if tname == "LetNode":     return "Let"
-    if tname == "AssignNode":  return "Assign"
-    if tname == "IfNode":      return "If"
-    if tname == "WhileNode":   return "While"
-    if tname == "ReturnNode":  return "Return"
-    if tname == "BlockNode":   return "Block"
-    if tname == "CallNode":    return "Call"
-    if tname == "IndexNode":   return "Index"
-    if tname == "BinOpNode":   return f"BinOp('{getattr(n, 'op', '?')}')"
-    if tname == "VarNode":     return f"Id({getattr(n, 'name', '?')})"
-    if tname == "NumNode":     return f"Num({getattr(n, 'value', '?')})"
-    if tname == "BoolNode":
-        v = getattr(n, "value", None)
-        return f"Bool({str(v).lower()})" if isinstance(v, bool) else "Bool(?)"
-
-    return tname
\ No newline at end of file
+    label = _LABELS.get(tname, tname)
+    return label if type(label) is str else label(n)
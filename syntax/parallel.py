@@ -0,0 +1,238 @@
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import accumulate, islice, repeat
+from typing import Any, List, Optional, Sequence, Tuple
+from lexer.token import Token, TokenType
+from syntax.node import NodeLike
+from syntax.parser import Parser
+from syntax.serialize import NODE_CLASSES, _gc_paused
+from syntax.stats import Stats
+from syntax.visitor import node_fields
+
+# Análise sintática paralela dos comandos do topo. A lista de tokens é
+# cortada logo após um ';' ou '}' de profundidade 0 (que não seja seguido de
+# 'else') e cada fatia é analisada por um processo, com alguns tokens
+# seguintes como lookahead. Um comando só é aproveitado se terminou dentro
+# da fatia: o parser só olha o token atual, então até ali ele viu
+# exatamente os mesmos tokens que a análise serial. O processo principal
+# junta as fatias em ordem; onde a posição serial não coincide com o fim de
+# um comando aproveitável (corte no meio de um comando, recuperação de erro
+# que passou do corte), ele mesmo analisa até reencontrar uma. Nós, erros
+# (mesmas mensagens e linhas) e contadores de recuperação saem iguais aos
+# da análise serial.
+
+# fatias menores que isso não compensam o custo de um processo
+MIN_SLICE = 20000
+# tokens depois do fim da fatia entregues ao processo
+LOOKAHEAD = 2
+
+# variação de profundidade pelo lexema (hash de str é bem mais barato que o
+# de TokenType); um "(" dentro de uma string só piora a escolha do corte,
+# que é conferida na junção de qualquer forma
+_DEPTH = {"(": 1, "[": 1, "{": 1, ")": -1, "]": -1, "}": -1}
+
+
+# Limites [start, ..., len(tokens)] de até `parts` fatias
+def statement_bounds(tokens: Sequence[Token], start: int, parts: int, min_tokens: int = MIN_SLICE) -> List[int]:
+    n = len(tokens)
+    parts = max(1, min(parts, (n - start) // max(1, min_tokens)))
+    if parts == 1:
+        return [start, n]
+    # depths[k]: profundidade depois do token start + k
+    depths = list(accumulate(map(_DEPTH.get, [tok.lex for tok in islice(tokens, start, None)], repeat(0))))
+    SEMI, RBRACE, ELSE = TokenType.SEMI, TokenType.RBRACE, TokenType.ELSE
+    bounds = [start]
+    for part in range(1, parts):
+        k = max(bounds[-1], start + (n - start) * part // parts) - start
+        while True:
+            try:
+                k = depths.index(0, k, n - start - 1)
+            except ValueError:
+                bounds.append(n)
+                return bounds
+            ttype = tokens[start + k].type
+            if (ttype == SEMI or ttype == RBRACE) and tokens[start + k + 1].type != ELSE:
+                break
+            k += 1
+        bounds.append(start + k + 1)
+    bounds.append(n)
+    return bounds
+
+
+# Nós em pós-ordem: ops (um byte por item) e values (escalares, linha/coluna
+# de cada nó e tamanho de cada lista), leves de enviar entre processos e
+# rápidos de remontar.
+_PUSH, _LIST = 0, 1
+_NODE_BASE = 16
+_TAGS = {cls: _NODE_BASE + k for k, cls in enumerate(NODE_CLASSES)}
+_NFIELDS = tuple(len(node_fields(cls)) for cls in NODE_CLASSES)
+
+
+def _encode_nodes(nodes: List[NodeLike]) -> Tuple[bytes, List[Any]]:
+    ops = bytearray()
+    values: List[Any] = []
+    stack: List[Any] = list(reversed(nodes))
+    while stack:
+        item = stack.pop()
+        t = type(item)
+        if t is tuple:
+            # fechamento de nó ou lista (a AST não tem tuplas)
+            ops.append(item[0])
+            values.extend(item[1:])
+        elif t in _TAGS:
+            stack.append((_TAGS[t], item.line, item.col))
+            stack.extend([getattr(item, name) for name in reversed(node_fields(t))])
+        elif t is list:
+            stack.append((_LIST, len(item)))
+            stack.extend(reversed(item))
+        else:
+            ops.append(_PUSH)
+            values.append(item)
+    return bytes(ops), values
+
+
+def _decode_nodes(ops: bytes, values: List[Any]) -> List[NodeLike]:
+    classes, nfields = NODE_CLASSES, _NFIELDS
+    stack: List[Any] = []
+    push, pop = stack.append, stack.pop
+    take = iter(values).__next__
+    with _gc_paused():
+        for op in ops:
+            if op == _PUSH:
+                push(take())
+            elif op == _LIST:
+                n = take()
+                if n:
+                    items = stack[-n:]
+                    del stack[-n:]
+                    push(items)
+                else:
+                    push([])
+            else:
+                k = op - _NODE_BASE
+                nf = nfields[k]
+                if nf == 1:
+                    stack[-1] = classes[k](stack[-1], take(), take())
+                elif nf == 2:
+                    last = pop()
+                    stack[-1] = classes[k](stack[-1], last, take(), take())
+                else:
+                    args = stack[-nf:]
+                    del stack[-nf:]
+                    push(classes[k](*args, take(), take()))
+    return stack
+
+
+@dataclass
+class SliceResult:
+    # por comando analisado (inclusive os que não geram nó): posição final,
+    # se gerou nó e totais acumulados de erros e de recuperação
+    ends: array
+    has_node: bytes
+    error_counts: array
+    sync_calls: array
+    sync_skipped: array
+    errors: List[str]
+    ops: bytes
+    values: List[Any]
+
+
+def parse_slice(tokens: Sequence[Token], start: int, end: int, expression_engine: str = "precedence",
+                with_stats: bool = False) -> SliceResult:
+    stop = min(len(tokens), end + LOOKAHEAD)
+    stats = Stats() if with_stats else None
+    parser = Parser(tokens[start:stop], stats, expression_engine)
+    limit = end - start
+    ends, error_counts, sync_calls, sync_skipped = array("q"), array("q"), array("q"), array("q")
+    has_node = bytearray()
+    nodes = []
+    counters = stats.counters if stats is not None else {}
+    while parser._has(parser.pos) and parser.pos < limit:
+        stmt = parser._top_statement()
+        if parser.pos > limit:
+            break
+        ends.append(start + parser.pos)
+        has_node.append(1 if stmt else 0)
+        if stmt:
+            nodes.append(stmt)
+        error_counts.append(len(parser.errors))
+        sync_calls.append(counters.get("synchronize_calls", 0))
+        sync_skipped.append(counters.get("synchronize_skipped_tokens", 0))
+    ops, values = _encode_nodes(nodes)
+    errors = parser.errors[:error_counts[-1]] if error_counts else []
+    return SliceResult(ends, bytes(has_node), error_counts, sync_calls, sync_skipped, errors, ops, values)
+
+
+# tokens compartilhados com os processos (herdados no fork, sem cópia)
+_tokens: Sequence[Token] = []
+
+
+def _init_worker(tokens: Sequence[Token]):
+    global _tokens
+    _tokens = tokens
+
+
+def _parse_task(task: Tuple[int, int, str, bool]) -> SliceResult:
+    return parse_slice(_tokens, *task)
+
+
+# Junta os comandos de result a partir da posição atual do parser, se ela é
+# o início da fatia ou o fim de um dos comandos dela
+def _merge(parser: Parser, body: List[NodeLike], result: SliceResult, start: int):
+    if parser.pos == start:
+        first = 0
+    else:
+        first = bisect_left(result.ends, parser.pos)
+        if first == len(result.ends) or result.ends[first] != parser.pos:
+            return
+        first += 1
+    if first == len(result.ends):
+        return
+    nodes = _decode_nodes(result.ops, result.values)
+    skip = result.has_node[:first].count(1)
+    body.extend(nodes[skip:])
+
+    def before(counts: array) -> int:
+        return counts[first - 1] if first else 0
+
+    parser.errors.extend(result.errors[before(result.error_counts):])
+    calls = result.sync_calls[-1] - before(result.sync_calls)
+    if parser.stats is not None and calls:
+        parser.stats.add("synchronize_calls", calls)
+        parser.stats.add("synchronize_skipped_tokens", result.sync_skipped[-1] - before(result.sync_skipped))
+    parser._advance_to(result.ends[-1])
+
+
+def _pool_context():
+    # com fork os tokens passam aos processos sem serialização
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+# Comandos do topo de parser.tokens (a partir de parser.pos) analisados com
+# até `jobs` processos; parser.errors e parser.stats ficam como depois de
+# iter_statements.
+def parse_parallel(parser: Parser, jobs: Optional[int] = None, min_tokens: int = MIN_SLICE) -> List[NodeLike]:
+    tokens = parser.tokens
+    jobs = jobs or os.cpu_count() or 1
+    bounds = statement_bounds(tokens, parser.pos, jobs * 2, min_tokens)
+    if jobs == 1 or len(bounds) <= 2:
+        return list(parser.iter_statements())
+
+    with_stats = parser.stats is not None
+    tasks = [(bounds[k], bounds[k + 1], parser.expression_engine, with_stats) for k in range(len(bounds) - 1)]
+    body: List[NodeLike] = []
+    with ProcessPoolExecutor(min(jobs, len(tasks)), mp_context=_pool_context(),
+                             initializer=_init_worker, initargs=(tokens,)) as pool:
+        for (start, end, _, _), result in zip(tasks, pool.map(_parse_task, tasks)):
+            if parser.pos < start:
+                body.extend(parser.iter_statements(stop=start))
+            if parser.pos <= end:
+                _merge(parser, body, result, start)
+    body.extend(parser.iter_statements())
+    return body
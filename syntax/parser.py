@@ -1,8 +1,20 @@
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Iterable, Iterator, Sequence
 from syntax.node import NodeLike, IdentifierNode, LiteralNode, IndexNode, BinOpNode
 from syntax.node import ProgramNode, LetNode, AssignNode, IfNode, WhileNode, ReturnNode, BlockNode, CallNode
 from lexer.token import Token, TokenType
+from syntax.grammar import (END_OF_INPUT, EMPTY_OPERAND, FIRST_EXPRESSION, MAX_CODE, PRECEDENCE_BY_CODE,
+                            STATEMENT_RULES, SYNC_AFTER, SYNC_BEFORE, UNEXPECTED_STATEMENT, T_COMMA, T_ELSE,
+                            T_EOL, T_ID, T_LBRACK, T_LPAREN, T_NUM, T_RBRACE, T_RBRACK, T_RPAREN, T_SEMI,
+                            T_STR_VALUE)
+from syntax.stats import Stats
+from syntax.token_window import TokenWindow
+
+
+EXPRESSION_ENGINES = ("precedence", "recursive")
+
+# contextos que esperam o fim de uma subexpressão em parse_expression_precedence
+_ROOT, _PAREN, _CALL, _INDEX = range(4)
 
 
 @dataclass
@@ -13,118 +25,140 @@ class Token:
     col: int
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    # tokens pode ser uma lista já pronta ou um iterável preguiçoso
+    # (LexicalCodeScanner.iter_tokens); no segundo caso o parser lê por uma
+    # TokenWindow e só guarda os tokens ainda não consumidos.
+    # stats (opcional) recebe os contadores de recuperação de erros.
+    # expression_engine escolhe o analisador de expressões: "precedence"
+    # (iterativo, guiado por tabela) ou "recursive" (uma função por nível).
+    def __init__(self, tokens: Iterable[Token], stats: Optional[Stats] = None,
+                 expression_engine: str = "precedence"):
+        if expression_engine not in EXPRESSION_ENGINES:
+            raise ValueError(f"Analisador de expressões desconhecido: {expression_engine}")
+        self.stats = stats
+        self.expression_engine = expression_engine
+        if isinstance(tokens, Sequence):
+            self._window = None
+            self.tokens = tokens
+        else:
+            self._window = TokenWindow(tokens)
+            self.tokens = self._window
         self.pos = 0
         self.errors: List[str] = []
+        # parse_statement: método por código do primeiro token
+        unexpected = getattr(self, UNEXPECTED_STATEMENT)
+        self._statement_rules = [unexpected] * (MAX_CODE + 1)
+        for ttype, name in STATEMENT_RULES.items():
+            self._statement_rules[ttype.value] = getattr(self, name)
+
+    def _has(self, idx: int) -> bool:
+        if self._window is not None:
+            return self._window.has(idx)
+        return idx < len(self.tokens)
+
+    def _advance_to(self, pos: int):
+        self.pos = pos
+        if self._window is not None:
+            self._window.release(pos)
 
     def peek(self) -> Token:
-        if self.pos >= len(self.tokens):
-            return Token("EOL", "", -1, -1)
+        if not self._has(self.pos):
+            return Token(END_OF_INPUT, "", -1, -1)
         return self.tokens[self.pos]
 
     def lookahead(self, k: int) -> Token:
         idx = self.pos + k
-        if idx >= len(self.tokens):
-            return Token("EOL", "", -1, -1)
+        if not self._has(idx):
+            return Token(END_OF_INPUT, "", -1, -1)
         return self.tokens[idx]
 
     def emit_error(self, msg: str):
         self.errors.append(msg)
 
     def consume(self, expected: Optional[TokenType] = None) -> Token:
-        if self.pos >= len(self.tokens):
-            return Token("EOL", "", -1, -1)
+        if not self._has(self.pos):
+            return Token(END_OF_INPUT, "", -1, -1)
         tok = self.tokens[self.pos]
         if expected:
             if tok.type == expected:
-                self.pos += 1
+                self._advance_to(self.pos + 1)
                 return tok
             self.emit_error(f"[ERRO] Esperado {expected}, obtido {tok.type} na linha {tok.line}")
-            self.pos += 1
+            self._advance_to(self.pos + 1)
             return Token(expected, "", tok.line, tok.col)
-        self.pos += 1
+        self._advance_to(self.pos + 1)
         return tok
 
     def match(self, *types: str) -> bool:
         return self.peek().type in types
 
-    def synchronize(self):
-        sync_tokens = {"SEMI", "RBRACE", "EOL"}
-        first_stmt = {"LET", "IF", "WHILE", "RETURN", "LBRACE", "ID", "NUM"}
-        while self.pos < len(self.tokens):
-            if self.tokens[self.pos].type in sync_tokens:
-                self.pos += 1
-                return
-            if self.tokens[self.pos].type in first_stmt:
-                return
-            self.pos += 1
-
-    def starts_assignment(self) -> bool:
-        if not self.match(TokenType.ID):
-            return False
-        if self.lookahead(1).type == TokenType.ASSIGN:
+    # consome o token atual se o código dele (syntax.grammar) é code
+    def _accept(self, code: int) -> bool:
+        if self._has(self.pos) and self.tokens[self.pos].type._value_ == code:
+            self._advance_to(self.pos + 1)
             return True
-        if self.lookahead(1).type == TokenType.LBRACK:
-            depth = 0
-            i = self.pos + 1
-
-            ## While garante que os colchetes se fechem e o conteúdo dentro deles possa ter um tamanho ilimitado
-            while i < len(self.tokens):
-                t = self.tokens[i]
-                if t.type == "LBRACK":
-                    depth += 1
-                elif t.type == "RBRACK":
-                    depth -= 1
-                    if depth == 0:
-                        if i + 1 < len(self.tokens) and self.tokens[i + 1].type == "EQUAL":
-                            return True
-                        break
-                i += 1
         return False
 
-    def parse_program(self) -> ProgramNode:
-        body = []
-        while self.pos < len(self.tokens):
-            if self.match(TokenType.EOL):
-                self.consume(TokenType.EOL)
-                continue
-            stmt = self.parse_statement()
+    # descarta tokens até consumir um terminador de comando ou até parar
+    # antes do início de um comando (grammar.SYNC_AFTER e SYNC_BEFORE)
+    def synchronize(self):
+        start = self.pos
+        while self._has(self.pos):
+            code = self.tokens[self.pos].type._value_
+            if SYNC_AFTER >> code & 1:
+                self._advance_to(self.pos + 1)
+                break
+            if SYNC_BEFORE >> code & 1:
+                break
+            self._advance_to(self.pos + 1)
+        if self.stats is not None:
+            self.stats.add("synchronize_calls")
+            self.stats.add("synchronize_skipped_tokens", self.pos - start)
+
+    # jobs > 1 (ou None: um por CPU) analisa os comandos do topo em paralelo
+    # (syntax.parallel), com o mesmo resultado; só vale para uma sequência
+    # de tokens (com um iterável preguiçoso a análise é serial)
+    def parse_program(self, jobs: Optional[int] = 1) -> ProgramNode:
+        if jobs != 1 and self._window is None:
+            from syntax.parallel import parse_parallel
+
+            return ProgramNode(body=parse_parallel(self, jobs), line=1, col=1)
+        return ProgramNode(body=list(self.iter_statements()), line=1, col=1)
+
+    # Comandos do topo entregues à medida que são analisados (para quem
+    # grava ou processa a AST em fluxo); o ProgramNode é sempre (1, 1).
+    # Com stop, para no primeiro comando que começa em stop ou depois.
+    def iter_statements(self, stop: Optional[int] = None) -> Iterator[NodeLike]:
+        while self._has(self.pos) and (stop is None or self.pos < stop):
+            stmt = self._top_statement()
             if stmt:
-                body.append(stmt)
-        return ProgramNode(body=body, line=1, col=1)
+                yield stmt
 
-    def parse_statement(self):
-        if self.match(TokenType.LET):
-            return self.parse_let_statement()
-        elif self.match(TokenType.IF):
-            return self.parse_if_statement()
-        elif self.match(TokenType.WHILE):
-            return self.parse_while_statement()
-        elif self.match(TokenType.RETURN):
-            return self.parse_return_statement()
-        elif self.match(TokenType.LBRACE):
-            return self.parse_block()
-        elif self.match(TokenType.ELSE):
-            tok = self.consume(TokenType.ELSE)
-            self.emit_error(f"[ERRO] 'else' sem 'if' correspondente na linha {tok.line}")
-            self.synchronize()
-            return None
-        elif self.starts_assignment():
-            return self.parse_assignment_statement()
-        elif self.match(TokenType.ID, TokenType.NUM, TokenType.LPAREN):
-            return self.parse_expression_statement()
-        elif self.match(TokenType.PP_DIRECTIVE):
-            self.consume(TokenType.PP_DIRECTIVE)
-            return None
-        elif self.match(TokenType.EOF):
-            self.consume(TokenType.EOF)
-            return None
-        else:
-            tok = self.peek()
-            self.emit_error(f"[ERRO] Token inesperado {tok.type} na linha {tok.line}")
-            self.synchronize()
+    def _top_statement(self):
+        if self._accept(T_EOL):
             return None
+        return self.parse_statement()
+
+    # uma consulta à tabela grammar.STATEMENT_RULES pelo código do token atual
+    def parse_statement(self):
+        return self._statement_rules[self.peek().type._value_]()
+
+    def _else_without_if(self):
+        tok = self.consume(TokenType.ELSE)
+        self.emit_error(f"[ERRO] 'else' sem 'if' correspondente na linha {tok.line}")
+        self.synchronize()
+        return None
+
+    # diretivas de pré-processador e EOF
+    def _skip_statement_token(self):
+        self.consume()
+        return None
+
+    def _unexpected_statement(self):
+        tok = self.peek()
+        self.emit_error(f"[ERRO] Token inesperado {tok.type} na linha {tok.line}")
+        self.synchronize()
+        return None
 
     def parse_let_statement(self) -> LetNode:
         let_token = self.consume(TokenType.LET)
@@ -133,50 +167,47 @@ class Parser:
         equal_token = self.consume(TokenType.ASSIGN)
         init = None
 
-        if self.match(TokenType.NUM, TokenType.ID, TokenType.LPAREN, TokenType.STR_VALUE):
+        if FIRST_EXPRESSION >> self.peek().type._value_ & 1:
             init = self.parse_expression()
         else:
             self.emit_error(f"[ERRO] Esperado expressão após '=', obtido {self.peek().type} na linha {self.peek().line}")
 
-        if self.match(TokenType.SEMI):
-            self.consume(TokenType.SEMI)
+        self._accept(T_SEMI)
         return LetNode(lhs=left_hand_side, init=init, line=let_token.line, col=let_token.col)
 
-    def parse_assignment_statement(self) -> AssignNode:
-        id_token = self.consume(TokenType.ID)
-        target: NodeLike = IdentifierNode(id_token.lex, line=id_token.line, col=id_token.col)
-
-        # assignment em um index específico
-        while self.match(TokenType.LBRACK):
-            lbr = self.consume(TokenType.LBRACK)
-            idx = self.parse_expression()
-            if self.match(TokenType.RBRACK):
-                self.consume(TokenType.RBRACK)
-            else:
-                self.emit_error(f"[ERRO] Esperado RBRACK, obtido {self.peek().type} na linha {self.peek().line}")
-                self.synchronize()
-                break
-            target = IndexNode(target=target, index=idx, line=lbr.line, col=lbr.col)
+    # Atribuição e comando-expressão são decididos numa passada só: o começo
+    # do comando é analisado uma vez como expressão e, se o resultado for um
+    # alvo válido (identificador, possivelmente indexado) seguido de '=', ele
+    # vira o alvo da atribuição. Não há varredura prévia dos colchetes.
+    def parse_assignment_or_expression_statement(self):
+        expr = self.parse_expression()
+        if self.match(TokenType.ASSIGN) and self.is_assignment_target(expr):
+            self.consume(TokenType.ASSIGN)
+            value = self.parse_expression()
+            self._accept(T_SEMI)
+            root = expr
+            while isinstance(root, IndexNode):
+                root = root.target
+            return AssignNode(target=expr, value=value, line=root.line, col=root.col)
+        self._accept(T_SEMI)
+        return expr
 
-        self.consume(TokenType.ASSIGN)
-        value = self.parse_expression()
-        if self.match(TokenType.SEMI):
-            self.consume(TokenType.SEMI)
-        return AssignNode(target=target, value=value, line=id_token.line, col=id_token.col)
+    @staticmethod
+    def is_assignment_target(node: NodeLike) -> bool:
+        while isinstance(node, IndexNode):
+            node = node.target
+        return isinstance(node, IdentifierNode)
 
     def parse_if_statement(self) -> IfNode:
         if_token = self.consume(TokenType.IF)
         self.consume(TokenType.LPAREN)
         test = self.parse_expression()
-        if not self.match(TokenType.RPAREN):
+        if not self._accept(T_RPAREN):
             self.emit_error(f"[ERRO] Esperado RPAREN, obtido {self.peek().type} na linha {self.peek().line}")
             self.synchronize()
-        else:
-            self.consume(TokenType.RPAREN)
         then = self.parse_statement()
         otherwise = None
-        if self.match(TokenType.ELSE):
-            self.consume(TokenType.ELSE)
+        if self._accept(T_ELSE):
             otherwise = self.parse_statement()
         return IfNode(test=test, then=then, otherwise=otherwise, line=if_token.line, col=if_token.col)
 
@@ -184,39 +215,146 @@ class Parser:
         while_token = self.consume(TokenType.WHILE)
         self.consume(TokenType.LPAREN)
         test = self.parse_expression()
-        if not self.match(TokenType.RPAREN):
+        if not self._accept(T_RPAREN):
             self.emit_error(f"[ERRO] Esperado RPAREN, obtido {self.peek().type} na linha {self.peek().line}")
             self.synchronize()
-        else:
-            self.consume(TokenType.RPAREN)
         body = self.parse_statement()
         return WhileNode(test=test, body=body, line=while_token.line, col=while_token.col)
 
     def parse_return_statement(self) -> ReturnNode:
         return_token = self.consume(TokenType.RETURN)
         value = None
-        if not self.match(TokenType.SEMI):
+        if self.peek().type._value_ != T_SEMI:
             value = self.parse_expression()
-        if self.match(TokenType.SEMI):
-            self.consume(TokenType.SEMI)
+        self._accept(T_SEMI)
         return ReturnNode(value=value, line=return_token.line, col=return_token.col)
 
     def parse_block(self) -> BlockNode:
         lbrace = self.consume(TokenType.LBRACE)
         body = []
-        while not self.match(TokenType.RBRACE) and self.pos < len(self.tokens):
+        while self.peek().type._value_ != T_RBRACE and self._has(self.pos):
             stmt = self.parse_statement()
             if stmt:
                 body.append(stmt)
-        if self.match(TokenType.RBRACE):
-            self.consume(TokenType.RBRACE)
-        else:
+        if not self._accept(T_RBRACE):
             self.emit_error(f"[ERRO] Esperado RBRACE, obtido EOF na linha {lbrace.line}")
         return BlockNode(body=body, line=lbrace.line, col=lbrace.col)
 
     def parse_expression(self) -> Any:
+        if self.expression_engine == "precedence":
+            return self.parse_expression_precedence()
         return self.parse_and_operator()
 
+    # Mesma gramática e mesmas árvores (e mensagens de erro, na mesma ordem)
+    # de parse_and_operator ... parse_literal_or_parenthesis, mas sem
+    # recursão: os operadores binários são resolvidos por precedência com
+    # pilhas de operandos e operadores, e parênteses, argumentos de chamada
+    # e índices empilham um contexto explícito. O aninhamento fica limitado
+    # pela memória e não pelo limite de recursão do Python.
+    def parse_expression_precedence(self) -> Any:
+        peek, consume, accept = self.peek, self.consume, self._accept
+        precedence_of = PRECEDENCE_BY_CODE
+
+        # contexto atual: (tipo, dados) e as pilhas da expressão em andamento
+        contexts = []
+        kind, data = _ROOT, None
+        operands: List[Any] = []
+        operators: List[Any] = []
+        node = None
+
+        while True:
+            if node is None:
+                # operando primário
+                if not self._has(self.pos):
+                    node = LiteralNode(value=0, line=-1, col=-1)
+                else:
+                    tok = peek()
+                    code = tok.type._value_
+                    if code == T_NUM or code == T_STR_VALUE:
+                        consume()
+                        node = LiteralNode(tok.lex, line=tok.line, col=tok.col)
+                    elif code == T_ID:
+                        consume()
+                        node = IdentifierNode(name=tok.lex, line=tok.line, col=tok.col)
+                    elif code == T_LPAREN:
+                        consume()
+                        contexts.append((kind, data, operands, operators))
+                        kind, data, operands, operators = _PAREN, None, [], []
+                        continue
+                    elif EMPTY_OPERAND >> code & 1:
+                        node = LiteralNode(value=0, line=tok.line, col=tok.col)
+                    else:
+                        self.emit_error(f"[ERRO] Token inesperado {tok.type} na linha {tok.line}")
+                        consume()
+                        node = LiteralNode(value=0, line=tok.line, col=tok.col)
+
+            # chamadas e índices depois do operando
+            tok = peek()
+            code = tok.type._value_
+            if code == T_LPAREN:
+                consume()
+                if accept(T_RPAREN):
+                    node = CallNode(callee=node, args=[], line=tok.line, col=tok.col)
+                    continue
+                contexts.append((kind, data, operands, operators))
+                kind, data, operands, operators = _CALL, (node, tok, []), [], []
+                node = None
+                continue
+            if code == T_LBRACK:
+                consume()
+                contexts.append((kind, data, operands, operators))
+                kind, data, operands, operators = _INDEX, (node, tok), [], []
+                node = None
+                continue
+
+            prec = precedence_of[code]
+            if prec is not None:
+                operands.append(node)
+                while operators and operators[-1][0] >= prec:
+                    _, op = operators.pop()
+                    right = operands.pop()
+                    left = operands.pop()
+                    operands.append(BinOpNode(left=left, right=right, op=op.lex, line=op.line, col=op.col))
+                operators.append((prec, tok))
+                consume()
+                node = None
+                continue
+
+            # fim da subexpressão: reduz o que sobrou
+            operands.append(node)
+            while operators:
+                _, op = operators.pop()
+                right = operands.pop()
+                left = operands.pop()
+                operands.append(BinOpNode(left=left, right=right, op=op.lex, line=op.line, col=op.col))
+            result = operands[0]
+
+            if kind == _ROOT:
+                return result
+            if kind == _CALL:
+                callee, lparen, args = data
+                args.append(result)
+                if accept(T_COMMA):
+                    operands, operators = [], []
+                    node = None
+                    continue
+                if not accept(T_RPAREN):
+                    self.emit_error(f"[ERRO] Esperado RPAREN na chamada de função, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                node = CallNode(callee=callee, args=args, line=lparen.line, col=lparen.col)
+            elif kind == _INDEX:
+                target, lbrack = data
+                if not accept(T_RBRACK):
+                    self.emit_error(f"[ERRO] Esperado RBRACK, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                node = IndexNode(target=target, index=result, line=lbrack.line, col=lbrack.col)
+            else:
+                if not accept(T_RPAREN):
+                    self.emit_error(f"[ERRO] Esperado RPAREN, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                node = result
+            kind, data, operands, operators = contexts.pop()
+
     def parse_and_operator(self):
         node = self.parse_equality_operator()
         while self.match(TokenType.AND):
@@ -287,12 +425,11 @@ class Parser:
 
     def parse_expression_statement(self):
         expr = self.parse_expression()
-        if self.match(TokenType.SEMI):
-            self.consume(TokenType.SEMI)
+        self._accept(T_SEMI)
         return expr
 
     def parse_literal_or_parenthesis(self) -> Any:
-        if self.pos >= len(self.tokens):
+        if not self._has(self.pos):
             return LiteralNode(value=0, line=-1, col=-1)
         tok = self.peek()
         if self.match(TokenType.NUM):
@@ -0,0 +1,26 @@
+from typing import Dict
+from lexer.operators import OPERATORS_1, OPERATORS_2
+from lexer.token import TokenType
+
+# Operadores binários da gramática, do nível mais fraco para o mais forte
+# (a mesma ordem de parse_and_operator ... parse_term_operator). Todos
+# associam à esquerda.
+BINARY_LEVELS = (
+    ("&&",),
+    ("==", "!="),
+    ("<", ">", "<=", ">="),
+    ("+", "-"),
+    ("*", "/"),
+)
+
+
+def _token_type(op: str) -> TokenType:
+    return OPERATORS_2[op] if op in OPERATORS_2 else OPERATORS_1[op]
+
+
+# TokenType do operador -> precedência (1 = mais fraca)
+BINARY_PRECEDENCE: Dict[TokenType, int] = {
+    _token_type(op): level
+    for level, ops in enumerate(BINARY_LEVELS, start=1)
+    for op in ops
+}
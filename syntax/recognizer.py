@@ -0,0 +1,181 @@
+from typing import Iterable, List, Optional
+from lexer.token import Token, TokenType
+from syntax.grammar import (EMPTY_OPERAND, FIRST_EXPRESSION, PRECEDENCE_BY_CODE, T_ASSIGN, T_COMMA, T_ELSE,
+                            T_ID, T_LBRACK, T_LPAREN, T_NUM, T_RBRACE, T_RBRACK, T_RPAREN, T_SEMI, T_STR_VALUE)
+from syntax.parser import Parser, _ROOT, _PAREN, _CALL, _INDEX
+from syntax.stats import Stats
+
+# Reconhecedor: percorre a gramática do Parser consumindo exatamente os
+# mesmos tokens e emitindo os mesmos erros (mesmas mensagens, na mesma
+# ordem), mas sem construir nós. Das expressões só interessa se o resultado
+# seria um alvo de atribuição (identificador, possivelmente indexado ou entre
+# parênteses), que é o que decide entre atribuição e comando-expressão; a
+# precedência dos operadores não muda os tokens consumidos e é ignorada.
+# Serve para validações em que a AST seria descartada (--check, batch.py).
+
+
+class _ErrorLimit(Exception):
+    pass
+
+
+class Recognizer(Parser):
+    # max_errors (opcional) interrompe a análise no N-ésimo erro
+    def __init__(self, tokens: Iterable[Token], stats: Optional[Stats] = None, max_errors: Optional[int] = None):
+        super().__init__(tokens, stats)
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(f"max_errors deve ser positivo: {max_errors}")
+        self.max_errors = max_errors
+
+    def emit_error(self, msg: str):
+        self.errors.append(msg)
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            raise _ErrorLimit
+
+    # Devolve os erros (vazio se o programa é válido)
+    def recognize(self) -> List[str]:
+        try:
+            while self._has(self.pos):
+                self._top_statement()
+        except _ErrorLimit:
+            pass
+        return self.errors
+
+    def parse_let_statement(self):
+        self.consume(TokenType.LET)
+        self.consume(TokenType.ID)
+        self.consume(TokenType.ASSIGN)
+        if FIRST_EXPRESSION >> self.peek().type._value_ & 1:
+            self.parse_expression()
+        else:
+            self.emit_error(f"[ERRO] Esperado expressão após '=', obtido {self.peek().type} na linha {self.peek().line}")
+        self._accept(T_SEMI)
+
+    def parse_assignment_or_expression_statement(self):
+        if self.parse_expression() and self._accept(T_ASSIGN):
+            self.parse_expression()
+        self._accept(T_SEMI)
+
+    def _condition(self):
+        self.consume(TokenType.LPAREN)
+        self.parse_expression()
+        if not self._accept(T_RPAREN):
+            self.emit_error(f"[ERRO] Esperado RPAREN, obtido {self.peek().type} na linha {self.peek().line}")
+            self.synchronize()
+
+    def parse_if_statement(self):
+        self.consume(TokenType.IF)
+        self._condition()
+        self.parse_statement()
+        if self._accept(T_ELSE):
+            self.parse_statement()
+
+    def parse_while_statement(self):
+        self.consume(TokenType.WHILE)
+        self._condition()
+        self.parse_statement()
+
+    def parse_return_statement(self):
+        self.consume(TokenType.RETURN)
+        if self.peek().type._value_ != T_SEMI:
+            self.parse_expression()
+        self._accept(T_SEMI)
+
+    def parse_block(self):
+        lbrace = self.consume(TokenType.LBRACE)
+        while self.peek().type._value_ != T_RBRACE and self._has(self.pos):
+            self.parse_statement()
+        if not self._accept(T_RBRACE):
+            self.emit_error(f"[ERRO] Esperado RBRACE, obtido EOF na linha {lbrace.line}")
+
+    def parse_expression_statement(self):
+        self.parse_expression()
+        self._accept(T_SEMI)
+
+    # Mesmo percurso de Parser.parse_expression_precedence (que tem as mesmas
+    # mensagens de erro do motor recursivo); devolve se a expressão é um alvo
+    # de atribuição válido.
+    def parse_expression(self) -> bool:
+        peek, consume, accept = self.peek, self.consume, self._accept
+        precedence_of = PRECEDENCE_BY_CODE
+
+        # por nível: tipo, se o alvo indexado é atribuível (_INDEX) e se já
+        # apareceu um operador binário
+        contexts = []
+        kind, target, binary = _ROOT, False, False
+        operand = None
+
+        while True:
+            if operand is None:
+                if not self._has(self.pos):
+                    operand = False
+                else:
+                    tok = peek()
+                    code = tok.type._value_
+                    if code == T_NUM or code == T_STR_VALUE:
+                        consume()
+                        operand = False
+                    elif code == T_ID:
+                        consume()
+                        operand = True
+                    elif code == T_LPAREN:
+                        consume()
+                        contexts.append((kind, target, binary))
+                        kind, target, binary = _PAREN, False, False
+                        continue
+                    elif EMPTY_OPERAND >> code & 1:
+                        operand = False
+                    else:
+                        self.emit_error(f"[ERRO] Token inesperado {tok.type} na linha {tok.line}")
+                        consume()
+                        operand = False
+
+            code = peek().type._value_
+            if code == T_LPAREN:
+                consume()
+                if accept(T_RPAREN):
+                    operand = False
+                    continue
+                contexts.append((kind, target, binary))
+                kind, target, binary = _CALL, False, False
+                operand = None
+                continue
+            if code == T_LBRACK:
+                consume()
+                contexts.append((kind, target, binary))
+                kind, target, binary = _INDEX, operand, False
+                operand = None
+                continue
+            if precedence_of[code] is not None:
+                consume()
+                binary = True
+                operand = None
+                continue
+
+            result = operand and not binary
+            if kind == _ROOT:
+                return result
+            if kind == _CALL:
+                if accept(T_COMMA):
+                    binary = False
+                    operand = None
+                    continue
+                if not accept(T_RPAREN):
+                    self.emit_error(f"[ERRO] Esperado RPAREN na chamada de função, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                operand = False
+            elif kind == _INDEX:
+                if not accept(T_RBRACK):
+                    self.emit_error(f"[ERRO] Esperado RBRACK, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                operand = target
+            else:
+                if not accept(T_RPAREN):
+                    self.emit_error(f"[ERRO] Esperado RPAREN, obtido {peek().type} na linha {peek().line}")
+                    self.synchronize()
+                operand = result
+            kind, target, binary = contexts.pop()
+
+
+# Erros de tokens (lista ou iterável preguiçoso), sem construir a AST
+def recognize(tokens: Iterable[Token], max_errors: Optional[int] = None, stats: Optional[Stats] = None) -> List[str]:
+    return Recognizer(tokens, stats, max_errors).recognize()
@@ -0,0 +1,378 @@
+import gc
+import json
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, IO, Iterator, List, Tuple, Union
+from syntax.node import (
+    AssignNode, BinOpNode, BlockNode, CallNode, IdentifierNode, IfNode, IndexNode, LetNode, LiteralNode, Node,
+    NodeLike, ProgramNode, ReturnNode, WhileNode,
+)
+from syntax.visitor import node_fields
+
+
+def _expand(node: NodeLike) -> List[Union[str, NodeLike]]:
+    items: List[Union[str, NodeLike]] = [
+        f'{{"type": "{type(node).__name__}", "line": {node.line}, "col": {node.col}'
+    ]
+    for name in node_fields(type(node)):
+        value = getattr(node, name)
+        items.append(f', "{name}": ')
+        if isinstance(value, list):
+            items.append("[")
+            for i, v in enumerate(value):
+                if i:
+                    items.append(", ")
+                items.append(v if isinstance(v, Node) else json.dumps(v, ensure_ascii=False))
+            items.append("]")
+        elif isinstance(value, Node):
+            items.append(value)
+        else:
+            items.append(json.dumps(value, ensure_ascii=False))
+    items.append("}")
+    return items
+
+
+# AST em JSON ({"type": "ProgramNode", "line": ..., "col": ..., "body": [...]})
+# escrita direto no arquivo. Iterativo: árvores profundas não esbarram no
+# limite de recursão do json.dumps.
+def write_json(root: NodeLike, out: IO[str]):
+    stack: List[Union[str, NodeLike]] = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            out.write(item)
+        else:
+            stack.extend(reversed(_expand(item)))
+
+
+# Classes na ordem das marcas do formato binário: não reordenar (só
+# acrescentar no fim, junto com FORMAT_VERSION).
+NODE_CLASSES = (
+    ProgramNode, LetNode, AssignNode, IfNode, WhileNode, ReturnNode, BlockNode,
+    CallNode, IndexNode, BinOpNode, IdentifierNode, LiteralNode,
+)
+_CLASS_BY_NAME = {cls.__name__: cls for cls in NODE_CLASSES}
+FORMAT_VERSION = 1
+
+
+# Reconstruir a AST cria muitos objetos de uma vez e dispara coletas do gc
+# que percorrem a árvore inteira sem achar lixo (quase metade do tempo de
+# leitura); load_jsonl e load_binary suspendem a coleta durante a leitura.
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _node_from_json(obj: Dict) -> NodeLike:
+    # pré-ordem guardando onde cada nó vai ser colocado; depois os nós são
+    # construídos de trás para frente (filhos antes dos pais)
+    out: List = [None]
+    order = []
+    stack = [(obj, out, 0)]
+    while stack:
+        d, target, idx = stack.pop()
+        cls = _CLASS_BY_NAME.get(d.get("type"))
+        if cls is None:
+            raise ValueError(f"Tipo de nó desconhecido: {d.get('type')!r}")
+        names = node_fields(cls)
+        args = [None] * len(names) + [d["line"], d["col"]]
+        order.append((cls, args, target, idx))
+        for i, name in enumerate(names):
+            v = d.get(name)
+            if isinstance(v, dict):
+                stack.append((v, args, i))
+            elif isinstance(v, list):
+                args[i] = v
+                for j, item in enumerate(v):
+                    if isinstance(item, dict):
+                        stack.append((item, v, j))
+            else:
+                args[i] = v
+    for cls, args, target, idx in reversed(order):
+        target[idx] = cls(*args)
+    return out[0]
+
+
+# ---------------------------------------------------------------------------
+# JSON Lines: a primeira linha é um cabeçalho com a posição do ProgramNode;
+# cada linha seguinte é um comando do topo no mesmo formato de write_json.
+# ---------------------------------------------------------------------------
+
+JSONL_FORMAT = "c-lex-syntax/ast-jsonl"
+
+
+class JsonLinesASTWriter:
+    def __init__(self, out: IO[str], line: int = 1, col: int = 1):
+        self.out = out
+        out.write(json.dumps({"format": JSONL_FORMAT, "version": FORMAT_VERSION, "line": line, "col": col}) + "\n")
+
+    def write(self, stmt: NodeLike):
+        write_json(stmt, self.out)
+        self.out.write("\n")
+
+    def close(self):
+        self.out.flush()
+
+
+class JsonLinesASTReader:
+    def __init__(self, inp: IO[str]):
+        self.inp = inp
+        header = json.loads(inp.readline() or "null")
+        if not isinstance(header, dict) or header.get("format") != JSONL_FORMAT:
+            raise ValueError("Arquivo não é uma AST em JSON Lines")
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Versão de AST não suportada: {header.get('version')}")
+        self.line = header["line"]
+        self.col = header["col"]
+
+    def __iter__(self) -> Iterator[NodeLike]:
+        for text in self.inp:
+            if not text.strip():
+                continue
+            try:
+                obj = json.loads(text)
+            except RecursionError:
+                raise ValueError("AST profunda demais para JSON; use o formato binário") from None
+            yield _node_from_json(obj)
+
+
+def dump_jsonl(program: ProgramNode, out: IO[str]):
+    writer = JsonLinesASTWriter(out, program.line, program.col)
+    for stmt in program.body:
+        writer.write(stmt)
+    writer.close()
+
+
+def load_jsonl(inp: IO[str]) -> ProgramNode:
+    reader = JsonLinesASTReader(inp)
+    with _gc_paused():
+        body = list(reader)
+    return ProgramNode(body=body, line=reader.line, col=reader.col)
+
+
+# ---------------------------------------------------------------------------
+# Binário: MAGIC, versão e posição do ProgramNode (varints); depois um
+# registro por comando do topo (varint com o tamanho + conteúdo) e um
+# registro vazio no fim. Valores:
+#   0 None | 1 lista (varint n, n valores) | 2 string nova (varint bytes,
+#   UTF-8) | 3 string já vista (varint índice) | 4 inteiro (varint zigzag) |
+#   16+k nó de NODE_CLASSES[k] (linha e coluna em zigzag, campos em ordem)
+# A tabela de strings é do arquivo inteiro: cada string é escrita uma vez.
+# ---------------------------------------------------------------------------
+
+MAGIC = b"CLXAST\0"
+_NONE, _LIST, _STR_NEW, _STR_REF, _INT = range(5)
+_NODE_BASE = 16
+_TAGS = {cls: _NODE_BASE + k for k, cls in enumerate(NODE_CLASSES)}
+_NFIELDS = tuple(len(node_fields(cls)) for cls in NODE_CLASSES)
+
+
+def _put_uvarint(buf: bytearray, n: int):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _put_svarint(buf: bytearray, n: int):
+    _put_uvarint(buf, n << 1 if n >= 0 else (-n << 1) - 1)
+
+
+def _get_uvarint(buf: bytes, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _read_uvarint(inp: BinaryIO) -> int:
+    n = shift = 0
+    while True:
+        b = inp.read(1)
+        if not b:
+            raise ValueError("AST binária truncada")
+        n |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80:
+            return n
+        shift += 7
+
+
+def _encode(root: NodeLike, buf: bytearray, strings: Dict[str, int]):
+    stack = [root]
+    while stack:
+        v = stack.pop()
+        t = type(v)
+        tag = _TAGS.get(t)
+        if tag is not None:
+            buf.append(tag)
+            _put_svarint(buf, v.line)
+            _put_svarint(buf, v.col)
+            for name in reversed(node_fields(t)):
+                stack.append(getattr(v, name))
+        elif v is None:
+            buf.append(_NONE)
+        elif t is list:
+            buf.append(_LIST)
+            _put_uvarint(buf, len(v))
+            stack.extend(reversed(v))
+        elif t is str:
+            idx = strings.get(v)
+            if idx is None:
+                strings[v] = len(strings)
+                data = v.encode("utf-8")
+                buf.append(_STR_NEW)
+                _put_uvarint(buf, len(data))
+                buf += data
+            else:
+                buf.append(_STR_REF)
+                _put_uvarint(buf, idx)
+        elif t is int:
+            buf.append(_INT)
+            _put_svarint(buf, v)
+        else:
+            raise TypeError(f"Valor não serializável na AST: {v!r}")
+
+
+def _decode(buf: bytes, strings: List[str]) -> NodeLike:
+    classes = NODE_CLASSES
+    nfields = _NFIELDS
+    # quadros: [classe (None para lista), valores, quantos faltam, linha, coluna]
+    stack: List[list] = []
+    pos = 0
+    while True:
+        tag = buf[pos]
+        pos += 1
+        if tag >= _NODE_BASE:
+            # linha e coluna quase sempre cabem em um byte
+            b = buf[pos]
+            if b < 0x80:
+                line = b
+                pos += 1
+            else:
+                line, pos = _get_uvarint(buf, pos)
+            b = buf[pos]
+            if b < 0x80:
+                col = b
+                pos += 1
+            else:
+                col, pos = _get_uvarint(buf, pos)
+            k = tag - _NODE_BASE
+            stack.append([classes[k], [], nfields[k],
+                          line >> 1 if not line & 1 else -((line + 1) >> 1),
+                          col >> 1 if not col & 1 else -((col + 1) >> 1)])
+            continue
+        if tag == _STR_REF:
+            b = buf[pos]
+            if b < 0x80:
+                value = strings[b]
+                pos += 1
+            else:
+                n, pos = _get_uvarint(buf, pos)
+                value = strings[n]
+        elif tag == _LIST:
+            n, pos = _get_uvarint(buf, pos)
+            if n:
+                stack.append([None, [], n, 0, 0])
+                continue
+            value = []
+        elif tag == _NONE:
+            value = None
+        elif tag == _STR_NEW:
+            n, pos = _get_uvarint(buf, pos)
+            value = buf[pos:pos + n].decode("utf-8")
+            pos += n
+            strings.append(value)
+        elif tag == _INT:
+            n, pos = _get_uvarint(buf, pos)
+            value = _unzigzag(n)
+        else:
+            raise ValueError(f"Marca inválida na AST binária: {tag}")
+
+        # entrega o valor aos quadros abertos, fechando os que completarem
+        while True:
+            if not stack:
+                return value
+            frame = stack[-1]
+            values = frame[1]
+            values.append(value)
+            if len(values) < frame[2]:
+                break
+            stack.pop()
+            value = values if frame[0] is None else frame[0](*values, frame[3], frame[4])
+
+
+class BinaryASTWriter:
+    def __init__(self, out: BinaryIO, line: int = 1, col: int = 1):
+        self.out = out
+        self.strings: Dict[str, int] = {}
+        header = bytearray(MAGIC)
+        _put_uvarint(header, FORMAT_VERSION)
+        _put_svarint(header, line)
+        _put_svarint(header, col)
+        out.write(header)
+
+    def write(self, stmt: NodeLike):
+        payload = bytearray()
+        _encode(stmt, payload, self.strings)
+        head = bytearray()
+        _put_uvarint(head, len(payload))
+        self.out.write(head)
+        self.out.write(payload)
+
+    def close(self):
+        self.out.write(b"\0")
+        self.out.flush()
+
+
+class BinaryASTReader:
+    def __init__(self, inp: BinaryIO):
+        self.inp = inp
+        self.strings: List[str] = []
+        if inp.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Arquivo não é uma AST binária")
+        version = _read_uvarint(inp)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versão de AST não suportada: {version}")
+        self.line = _unzigzag(_read_uvarint(inp))
+        self.col = _unzigzag(_read_uvarint(inp))
+
+    def __iter__(self) -> Iterator[NodeLike]:
+        while True:
+            n = _read_uvarint(self.inp)
+            if n == 0:
+                return
+            payload = self.inp.read(n)
+            if len(payload) != n:
+                raise ValueError("AST binária truncada")
+            try:
+                node = _decode(payload, self.strings)
+            except IndexError:
+                raise ValueError("AST binária corrompida") from None
+            yield node
+
+
+def dump_binary(program: ProgramNode, out: BinaryIO):
+    writer = BinaryASTWriter(out, program.line, program.col)
+    for stmt in program.body:
+        writer.write(stmt)
+    writer.close()
+
+
+def load_binary(inp: BinaryIO) -> ProgramNode:
+    reader = BinaryASTReader(inp)
+    with _gc_paused():
+        body = list(reader)
+    return ProgramNode(body=body, line=reader.line, col=reader.col)
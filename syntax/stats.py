@@ -0,0 +1,62 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, Optional
+
+# Métricas de uma análise (opt-in): tempo por fase e contadores. Quem não
+# passa um Stats não paga nada além de um "is not None" por chamada nos
+# pontos instrumentados.
+#
+# Fases usadas por main.py: lex, parse (ou recognize, com --check), layout,
+# render.
+# Contadores: tokens, nodes, errors, synchronize_calls,
+# synchronize_skipped_tokens, max_delimiter_depth.
+
+
+class Stats:
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_max(self, name: str, value: int):
+        if value > self.counters.get(name, 0):
+            self.counters[name] = value
+
+    def rates(self) -> Dict[str, float]:
+        out = {}
+        tokens, nodes = self.counters.get("tokens"), self.counters.get("nodes")
+        if tokens and self.phases.get("lex"):
+            out["lex_tokens_per_s"] = tokens / self.phases["lex"]
+        if tokens and self.phases.get("parse"):
+            out["parse_tokens_per_s"] = tokens / self.phases["parse"]
+        if tokens and self.phases.get("recognize"):
+            out["recognize_tokens_per_s"] = tokens / self.phases["recognize"]
+        if nodes and self.phases.get("parse"):
+            out["parse_nodes_per_s"] = nodes / self.phases["parse"]
+        return out
+
+    def to_dict(self) -> Dict:
+        return {
+            "phases": dict(self.phases),
+            "total_seconds": sum(self.phases.values()),
+            "counters": dict(self.counters),
+            "rates": self.rates(),
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def phase(stats: Optional[Stats], name: str):
+    return stats.phase(name) if stats is not None else nullcontext()
@@ -0,0 +1,43 @@
+from collections import deque
+from typing import Deque, Iterable, Iterator
+from lexer.token import Token
+
+
+# Janela deslizante sobre um fluxo de tokens (p.ex. LexicalCodeScanner.iter_tokens).
+# Os índices são absolutos, como numa lista; só ficam em memória os tokens
+# entre a posição atual do parser e o lookahead mais distante já pedido.
+class TokenWindow:
+    def __init__(self, tokens: Iterable[Token]):
+        self._source: Iterator[Token] = iter(tokens)
+        self._buffer: Deque[Token] = deque()
+        self._start = 0
+        self._exhausted = False
+
+    def _fill(self, idx: int) -> bool:
+        while self._start + len(self._buffer) <= idx:
+            if self._exhausted:
+                return False
+            tok = next(self._source, None)
+            if tok is None:
+                self._exhausted = True
+                return False
+            self._buffer.append(tok)
+        return True
+
+    def has(self, idx: int) -> bool:
+        return idx < self._start + len(self._buffer) or self._fill(idx)
+
+    def __getitem__(self, idx: int) -> Token:
+        if idx < self._start or not self.has(idx):
+            raise IndexError(idx)
+        return self._buffer[idx - self._start]
+
+    # descarta os tokens anteriores a idx
+    def release(self, idx: int):
+        buffer = self._buffer
+        while self._start < idx and buffer:
+            buffer.popleft()
+            self._start += 1
+
+    def buffered(self) -> int:
+        return len(self._buffer)
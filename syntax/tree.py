@@ -1,93 +1,484 @@
-from syntax.node import NodeLike, node_label
-from typing import List, Dict, Tuple
-import matplotlib.pyplot as plt
-
-def children(n: NodeLike) -> List[NodeLike]:
-    tname = type(n).__name__
-
-    if tname == "ProgramNode": return list(getattr(n, "body", []))
-    if tname == "LetNode":     return [getattr(n, "lhs", None), getattr(n, "init", None)]
-    if tname == "AssignNode":  return [getattr(n, "target", None), getattr(n, "value", None)]
-    if tname == "IfNode":
-        lst = [getattr(n, "test", None), getattr(n, "then", None)]
-        other = getattr(n, "otherwise", None)
-        if other is not None: lst.append(other)
-        return lst
-    if tname == "WhileNode":   return [getattr(n, "test", None), getattr(n, "body", None)]
-    if tname == "ReturnNode":
-        v = getattr(n, "value", None)
-        return [v] if v is not None else []
-    if tname == "BlockNode":   return list(getattr(n, "body", []))
-    if tname == "CallNode":    return [getattr(n, "callee", None)] + list(getattr(n, "args", []))
-    if tname == "IndexNode":   return [getattr(n, "target", None), getattr(n, "index", None)]
-    if tname == "BinOpNode":   return [getattr(n, "left", None), getattr(n, "right", None)]
-
-    return []
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from syntax.node import NodeLike, node_label, register_label
+from syntax.stats import Stats, phase
+from syntax.visitor import child_nodes, count_nodes, iter_edges, register_children, walk
+from typing import IO, Iterator, List, Dict, Optional, Tuple
 
+# filhos (sem None) pelas tabelas por classe de syntax.visitor; o nome
+# children continua disponível para quem já o importava daqui
+children = child_nodes
+
+# Largura de cada subárvore (folha = 1.0; nó interno = soma das larguras
+# dos filhos mais 0.8 entre eles), com o pai centrado sobre os filhos.
+# Duas passadas iterativas e lineares: larguras de baixo para cima e
+# posições de cima para baixo.
 def _compute_layout(n: NodeLike, x0=0.0, y0=0.0, y_spacing=1.6) -> Tuple[Dict[int,Tuple[float,float]], float]:
-    ch = [c for c in children(n) if c is not None]
-    if not ch:
-        return ({id(n): (x0, y0)}, 1.0)
+    order: List[NodeLike] = []
+    kids: Dict[int, List[NodeLike]] = {}
+    stack = [n]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        ch = kids[id(node)] = child_nodes(node)
+        stack.extend(ch)
+
+    width: Dict[int, float] = {}
+    for node in reversed(order):
+        ch = kids[id(node)]
+        if ch:
+            width[id(node)] = sum(width[id(c)] for c in ch) + (len(ch)-1)*0.8
+        else:
+            width[id(node)] = 1.0
+
+    pos: Dict[int,Tuple[float,float]] = {id(n): (x0, y0)}
+    for node in order:
+        ch = kids[id(node)]
+        if not ch:
+            continue
+        x, y = pos[id(node)]
+        cur_x = x - width[id(node)]/2.0
+        for c in ch:
+            w = width[id(c)]
+            pos[id(c)] = (cur_x + w/2.0, y - y_spacing)
+            cur_x += w + 0.8
+
+    return pos, width[id(n)]
+
+# Layout "tidy" (Reingold–Tilford na versão linear de Walker/Buchheim):
+# subárvores vizinhas são aproximadas até a distância mínima entre os
+# contornos, o que deixa árvores largas bem mais compactas que
+# _compute_layout. Iterativo e O(n); devolve o mesmo dicionário id -> (x, y).
+def tidy_layout(root: NodeLike, x0=0.0, y0=0.0, y_spacing=1.6, distance=1.8) -> Tuple[Dict[int,Tuple[float,float]], float]:
+    nodes: List[NodeLike] = []
+    parent: List[int] = []
+    kids: List[List[int]] = []
+    number: List[int] = []
+    stack = [(root, -1, 0)]
+    while stack:
+        node, p, k = stack.pop()
+        idx = len(nodes)
+        nodes.append(node)
+        parent.append(p)
+        number.append(k)
+        kids.append([])
+        if p >= 0:
+            kids[p].append(idx)
+        ch = child_nodes(node)
+        stack.extend((c, idx, i) for i, c in reversed(list(enumerate(ch))))
+
+    n = len(nodes)
+    prelim = [0.0]*n
+    mod = [0.0]*n
+    shift = [0.0]*n
+    change = [0.0]*n
+    thread = [-1]*n
+    ancestor = list(range(n))
+    default_ancestor = [0]*n
 
+    def next_left(v: int) -> int:
+        return kids[v][0] if kids[v] else thread[v]
+
+    def next_right(v: int) -> int:
+        return kids[v][-1] if kids[v] else thread[v]
+
+    def move_subtree(wl: int, wr: int, amount: float):
+        subtrees = number[wr] - number[wl]
+        change[wr] -= amount/subtrees
+        shift[wr] += amount
+        change[wl] += amount/subtrees
+        prelim[wr] += amount
+        mod[wr] += amount
+
+    def apportion(v: int):
+        p = parent[v]
+        vir = vor = v
+        vil = kids[p][number[v]-1]
+        vol = kids[p][0]
+        sir, sor, sil, sol = mod[vir], mod[vor], mod[vil], mod[vol]
+        while next_right(vil) >= 0 and next_left(vir) >= 0:
+            vil, vir = next_right(vil), next_left(vir)
+            vol, vor = next_left(vol), next_right(vor)
+            ancestor[vor] = v
+            amount = (prelim[vil] + sil) - (prelim[vir] + sir) + distance
+            if amount > 0:
+                a = ancestor[vil] if parent[ancestor[vil]] == p else default_ancestor[p]
+                move_subtree(a, v, amount)
+                sir += amount
+                sor += amount
+            sil += mod[vil]
+            sir += mod[vir]
+            sol += mod[vol]
+            sor += mod[vor]
+        if next_right(vil) >= 0 and next_right(vor) < 0:
+            thread[vor] = next_right(vil)
+            mod[vor] += sil - sor
+        if next_left(vir) >= 0 and next_left(vol) < 0:
+            thread[vol] = next_left(vir)
+            mod[vol] += sir - sol
+            default_ancestor[p] = v
+
+    # primeira passada: índices em pré-ordem, então do maior para o menor
+    # cada nó é visitado depois de todos os seus descendentes e dos irmãos
+    # à esquerda (com as subárvores deles)
+    for v in _post_order(kids):
+        ch = kids[v]
+        if ch:
+            acc_shift = acc_change = 0.0
+            for w in reversed(ch):
+                prelim[w] += acc_shift
+                mod[w] += acc_shift
+                acc_change += change[w]
+                acc_shift += shift[w] + acc_change
+            midpoint = (prelim[ch[0]] + prelim[ch[-1]])/2.0
+        p = parent[v]
+        if p >= 0 and number[v] > 0:
+            prelim[v] = prelim[kids[p][number[v]-1]] + distance
+            if ch:
+                mod[v] = prelim[v] - midpoint
+            apportion(v)
+        else:
+            prelim[v] = midpoint if ch else 0.0
+            if p >= 0:
+                default_ancestor[p] = v
+
+    # segunda passada: x = prelim + soma dos mod dos ancestrais
     pos: Dict[int,Tuple[float,float]] = {}
-    widths: List[float] = []
-    subs: List[NodeLike] = []
+    offset = x0 - prelim[0]
+    acc = [0.0]*n
+    depth = [0]*n
+    for v in range(n):
+        p = parent[v]
+        if p >= 0:
+            acc[v] = acc[p] + mod[p]
+            depth[v] = depth[p] + 1
+        pos[id(nodes[v])] = (prelim[v] + acc[v] + offset, y0 - depth[v]*y_spacing)
 
-    for c in ch:
-        subpos, w = _compute_layout(c, 0, 0, y_spacing)
-        pos.update(subpos)
-        widths.append(w)
-        subs.append(c)
+    xs = [xy[0] for xy in pos.values()]
+    return pos, max(xs) - min(xs) + 1.0
 
-    total_w = sum(widths) + (len(widths)-1)*0.8
-    cur_x = x0 - total_w/2.0
+def _post_order(kids: List[List[int]]) -> List[int]:
+    out: List[int] = []
+    stack = [(0, False)]
+    while stack:
+        v, done = stack.pop()
+        if done:
+            out.append(v)
+            continue
+        stack.append((v, True))
+        stack.extend((w, False) for w in reversed(kids[v]))
+    return out
 
-    def shift(node: NodeLike, dx: float, dy: float):
-        x, y = pos[id(node)]
-        pos[id(node)] = (x + dx, y + dy)
-        for cc in children(node):
-            if cc is not None:
-                shift(cc, dx, dy)
+LAYOUTS = {"classic": _compute_layout, "tidy": tidy_layout}
 
-    for c, w in zip(subs, widths):
-        cx = cur_x + w/2.0
-        shift(c, cx, y0 - y_spacing)
-        cur_x += w + 0.8
+def _xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
-    pos[id(n)] = (x0, y0)
-    return pos, total_w
+Bounds = Tuple[float, float, float, float]
 
-def draw_tree(root: NodeLike, filename: str, figsize=(10, 7), dpi: int = 160):
-    pos, _ = _compute_layout(root, 0.0, 0.0)
+def _bounds(pos: Dict[int, Tuple[float, float]]) -> Bounds:
+    xs = [xy[0] for xy in pos.values()]
+    ys = [xy[1] for xy in pos.values()]
+    return min(xs), max(xs), min(ys), max(ys)
 
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.set_axis_off()
+# Renderizadores: render recebe a raiz, as posições do layout (None quando
+# needs_layout é False) e um arquivo já aberto (binário se binary). O
+# desenho em si fica em draw, que recebe as listas de nós e arestas e a
+# área (xmin, xmax, ymin, ymax) em unidades do layout; draw_tiles chama
+# draw com o pedaço de cada ladrilho; subclasses precisam implementá-lo.
+class TreeRenderer(ABC):
+    binary = False
+    needs_layout = True
 
-    def draw_edges(node: NodeLike):
-        x, y = pos[id(node)]
-        for c in children(node):
-            if c is None:
-                continue
+    def render(self, root: NodeLike, pos: Optional[Dict[int, Tuple[float, float]]], out: IO):
+        bounds = _bounds(pos) if pos is not None else None
+        self.draw(list(walk(root)), list(iter_edges(root)), pos, bounds, out)
+
+    @abstractmethod
+    def draw(self, nodes: List[NodeLike], edges: List[Tuple[NodeLike, NodeLike]],
+             pos: Optional[Dict[int, Tuple[float, float]]], bounds: Optional[Bounds], out: IO):
+        ...
+
+# PNG (ou outro formato do matplotlib) com caixas e arestas desenhadas pelo
+# matplotlib. É o caminho original; lento em árvores grandes.
+class MatplotlibRenderer(TreeRenderer):
+    binary = True
+
+    def __init__(self, figsize=(10, 7), dpi: int = 160, fmt: str = "png"):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.fmt = fmt
+
+    def draw(self, nodes, edges, pos, bounds, out):
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=self.figsize)
+        ax.set_axis_off()
+
+        for node, c in edges:
+            x, y = pos[id(node)]
             xc, yc = pos[id(c)]
             ax.plot([x, xc], [y-0.05, yc+0.05])
-            draw_edges(c)
 
-    def draw_nodes(node: NodeLike):
-        x, y = pos[id(node)]
         bbox = dict(boxstyle="round,pad=0.3", fc="white", ec="black", lw=1)
-        ax.text(x, y, node_label(node), ha="center", va="center", bbox=bbox, fontsize=10)
-        for c in children(node):
-            if c is not None:
-                draw_nodes(c)
+        for node in nodes:
+            x, y = pos[id(node)]
+            ax.text(x, y, node_label(node), ha="center", va="center", bbox=bbox, fontsize=10)
 
-    draw_edges(root)
-    draw_nodes(root)
+        xmin, xmax, ymin, ymax = bounds
+        pad = 1.2
+        ax.set_xlim(xmin-pad, xmax+pad)
+        ax.set_ylim(ymin-pad, ymax+pad)
+        plt.tight_layout()
+        plt.savefig(out, dpi=self.dpi, bbox_inches="tight", format=self.fmt)
+        plt.close(fig)
 
-    xs = [xy[0] for xy in pos.values()]
-    ys = [xy[1] for xy in pos.values()]
-    pad = 1.2
-    ax.set_xlim(min(xs)-pad, max(xs)+pad)
-    ax.set_ylim(min(ys)-pad, max(ys)+pad)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=dpi, bbox_inches="tight")
-    plt.close(fig)
\ No newline at end of file
+# SVG escrito elemento a elemento no arquivo: arestas primeiro, caixas por
+# cima. scale converte unidades do layout em pixels. As coordenadas de cada
+# nó são formatadas uma vez só, e as caixas são <use> de um <rect> definido
+# por largura de rótulo.
+class SvgRenderer(TreeRenderer):
+    def __init__(self, scale: float = 70.0, font_size: int = 12):
+        self.scale = scale
+        self.font_size = font_size
+
+    def draw(self, nodes, edges, pos, bounds, out):
+        s = self.scale
+        xmin, xmax, ymin, ymax = bounds
+        left, top = xmin - 1.2, ymax + 1.2
+        width = (xmax + 1.2 - left) * s
+        height = (top - ymin + 1.2) * s
+        char_w = self.font_size * 0.6
+        box_h = self.font_size * 1.8
+
+        xy: Dict[int, Tuple[str, str]] = {}
+
+        def coords(node: NodeLike) -> Tuple[str, str]:
+            k = id(node)
+            c = xy.get(k)
+            if c is None:
+                x, y = pos[k]
+                c = xy[k] = (f"{(x - left) * s:.1f}", f"{(top - y) * s:.1f}")
+            return c
+
+        out.write(f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                  f'width="{width:.0f}" height="{height:.0f}" viewBox="0 0 {width:.1f} {height:.1f}">\n')
+        out.write('<g stroke="#555" stroke-width="1.2">\n')
+        for node, c in edges:
+            x1, y1 = coords(node)
+            x2, y2 = coords(c)
+            out.write(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}"/>\n')
+        out.write('</g>\n')
+
+        labels: Dict[str, str] = {}
+        for node in nodes:
+            label = node_label(node)
+            if label not in labels:
+                labels[label] = _xml_escape(label)
+        out.write('<defs>\n')
+        for n in sorted({len(label) for label in labels}):
+            w = n * char_w + 12
+            out.write(f'<rect id="b{n}" x="{-w/2:.1f}" y="{-box_h/2:.1f}" width="{w:.1f}" height="{box_h:.1f}" '
+                      f'rx="5" fill="white" stroke="black"/>\n')
+        out.write('</defs>\n')
+
+        out.write(f'<g font-family="monospace" font-size="{self.font_size}" text-anchor="middle" '
+                  f'dominant-baseline="central">\n')
+        for node in nodes:
+            x, y = coords(node)
+            label = node_label(node)
+            out.write(f'<use xlink:href="#b{len(label)}" x="{x}" y="{y}"/>'
+                      f'<text x="{x}" y="{y}">{labels[label]}</text>\n')
+        out.write('</g>\n</svg>\n')
+
+# Graphviz DOT: por padrão só nós e arestas (o layout fica com o Graphviz).
+# Com positions=True grava também pos="x,y!" (em pontos) do nosso layout,
+# para uso com "neato -n".
+class DotRenderer(TreeRenderer):
+    def __init__(self, positions: bool = False):
+        self.needs_layout = positions
+
+    def draw(self, nodes, edges, pos, bounds, out):
+        out.write("digraph AST {\n")
+        out.write('  node [shape=box, style=rounded, fontname="monospace"];\n')
+        ids: Dict[int, int] = {}
+        for node in nodes:
+            n = ids[id(node)] = len(ids)
+            label = node_label(node).replace("\\", "\\\\").replace('"', '\\"')
+            attrs = f'label="{label}"'
+            if pos is not None:
+                x, y = pos[id(node)]
+                attrs += f', pos="{x * 72:.1f},{y * 72:.1f}!"'
+            out.write(f"  n{n} [{attrs}];\n")
+        for node, c in edges:
+            out.write(f"  n{ids[id(node)]} -> n{ids[id(c)]};\n")
+        out.write("}\n")
+
+RENDERERS = {"svg": SvgRenderer, "dot": DotRenderer, "gv": DotRenderer}
+
+# Escolhe o renderizador pela extensão; o que não for SVG/DOT vai para o
+# matplotlib (png quando não há extensão).
+def renderer_for(filename: str, figsize=(10, 7), dpi: int = 160) -> TreeRenderer:
+    ext = os.path.splitext(filename)[1].lower().lstrip(".")
+    if ext in RENDERERS:
+        return RENDERERS[ext]()
+    return MatplotlibRenderer(figsize, dpi, ext or "png")
+
+# Nó da árvore exibida quando há nível de detalhe: aponta para o nó da AST e
+# guarda só os filhos visíveis. Um nó resumido não tem filhos e o rótulo
+# traz quantos filhos diretos ficaram escondidos, ex.: "Block (+12 filhos)";
+# contar a subárvore inteira custaria o tamanho da AST, não o do que é
+# exibido.
+class ViewNode:
+    __slots__ = ("node", "label", "kids", "line", "col")
+
+    def __init__(self, node: NodeLike, label: str):
+        self.node = node
+        self.label = label
+        self.kids: List["ViewNode"] = []
+        self.line = getattr(node, "line", -1)
+        self.col = getattr(node, "col", -1)
+
+register_children(ViewNode, lambda view: list(view.kids))
+register_label(ViewNode, lambda view: view.label)
+
+def _summary_label(node: NodeLike, hidden: int) -> str:
+    return f"{node_label(node)} (+{hidden} {'filho' if hidden == 1 else 'filhos'})"
+
+# Árvore a exibir, em largura: nós na profundidade max_depth (a raiz tem
+# profundidade 0) viram resumos, e, com max_nodes, um nó só é expandido se
+# todos os seus filhos ainda couberem no total de caixas. Layout e desenho
+# passam só pelos nós visíveis; das subárvores escondidas só são vistos os
+# filhos diretos da raiz de cada uma.
+def build_view(root: NodeLike, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> ViewNode:
+    view_root = ViewNode(root, node_label(root))
+    shown = 1
+    queue = [(root, view_root, 0)]
+    for node, view, depth in queue:
+        ch = child_nodes(node)
+        if not ch:
+            continue
+        if (max_depth is not None and depth >= max_depth) or (max_nodes is not None and shown + len(ch) > max_nodes):
+            view.label = _summary_label(node, len(ch))
+            continue
+        shown += len(ch)
+        for c in ch:
+            kid = ViewNode(c, node_label(c))
+            view.kids.append(kid)
+            queue.append((c, kid, depth + 1))
+    return view_root
+
+# Subárvore escolhida por caminho ("0.2.1": índices dos filhos a partir da
+# raiz) ou pela linha do código: o nó mais externo, abaixo da raiz, que
+# começa naquela linha.
+def select_subtree(root: NodeLike, path: Optional[str] = None, line: Optional[int] = None) -> NodeLike:
+    if path is not None:
+        node = root
+        for part in path.split(".") if path else []:
+            ch = child_nodes(node)
+            if not part.isdigit() or int(part) >= len(ch):
+                raise ValueError(f"Caminho inválido: {path}")
+            node = ch[int(part)]
+        return node
+    if line is None:
+        return root
+
+    # a linha de um nó não limita a dos filhos (BinOpNode, IndexNode e
+    # CallNode podem ter operandos em linhas anteriores), então percorre a
+    # árvore toda em largura: o primeiro nó encontrado é o mais raso
+    queue = deque(child_nodes(root))
+    while queue:
+        node = queue.popleft()
+        if getattr(node, "line", -1) == line:
+            return node
+        queue.extend(child_nodes(node))
+    raise ValueError(f"Nenhum nó começa na linha {line}")
+
+def _open_output(filename: str, renderer: TreeRenderer) -> IO:
+    if renderer.binary:
+        return open(filename, "wb")
+    return open(filename, "w", encoding="utf-8")
+
+def write_tree(root: NodeLike, out: IO, renderer: TreeRenderer, stats: Optional[Stats] = None,
+               layout: str = "classic"):
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout}")
+    pos = None
+    if renderer.needs_layout:
+        with phase(stats, "layout"):
+            pos, _ = LAYOUTS[layout](root, 0.0, 0.0)
+    with phase(stats, "render"):
+        renderer.render(root, pos, out)
+
+def draw_tree(root: NodeLike, filename: str, figsize=(10, 7), dpi: int = 160, stats: Optional[Stats] = None,
+              layout: str = "classic", renderer: Optional[TreeRenderer] = None,
+              max_depth: Optional[int] = None, max_nodes: Optional[int] = None):
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout}")
+    if renderer is None:
+        renderer = renderer_for(filename, figsize, dpi)
+    if max_depth is not None or max_nodes is not None:
+        root = build_view(root, max_depth, max_nodes)
+    with _open_output(filename, renderer) as f:
+        write_tree(root, f, renderer, stats, layout)
+
+def _tile_range(a: float, b: float, origin: float, size: float) -> range:
+    lo, hi = min(a, b), max(a, b)
+    return range(int((lo - origin) // size), int((hi - origin) // size) + 1)
+
+# Divide o layout em ladrilhos de tile_size (largura, altura em unidades do
+# layout) e grava um arquivo por ladrilho não vazio:
+# <prefixo>_<linha>_<coluna>.<ext>. Cada nó vai para o ladrilho que contém
+# sua posição; cada aresta vai para todos os ladrilhos que ela atravessa.
+# Devolve os nomes dos arquivos gravados.
+def draw_tiles(root: NodeLike, prefix: str, ext: str = "svg", tile_size=(40.0, 24.0), figsize=(10, 7),
+               dpi: int = 160, stats: Optional[Stats] = None, layout: str = "classic",
+               renderer: Optional[TreeRenderer] = None, max_depth: Optional[int] = None,
+               max_nodes: Optional[int] = None) -> List[str]:
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout}")
+    if renderer is None:
+        renderer = renderer_for(f"{prefix}.{ext}", figsize, dpi)
+    if not renderer.needs_layout:
+        raise ValueError("Ladrilhos precisam de um renderizador com layout")
+    if max_depth is not None or max_nodes is not None:
+        root = build_view(root, max_depth, max_nodes)
+
+    with phase(stats, "layout"):
+        pos, _ = LAYOUTS[layout](root, 0.0, 0.0)
+    tw, th = tile_size
+    xmin, _, _, ymax = _bounds(pos)
+    nodes: Dict[Tuple[int, int], List[NodeLike]] = {}
+    edges: Dict[Tuple[int, int], List[Tuple[NodeLike, NodeLike]]] = {}
+
+    # linhas de ladrilho contadas de cima para baixo (y decresce com a
+    # profundidade)
+    for node in walk(root):
+        x, y = pos[id(node)]
+        nodes.setdefault((int((ymax - y) // th), int((x - xmin) // tw)), []).append(node)
+    for parent, c in iter_edges(root):
+        (x1, y1), (x2, y2) = pos[id(parent)], pos[id(c)]
+        for row in _tile_range(ymax - y1, ymax - y2, 0.0, th):
+            # trecho da aresta dentro da faixa da linha
+            top, bottom = ymax - row * th, ymax - (row + 1) * th
+            if y1 == y2:
+                xa, xb = x1, x2
+            else:
+                ta = min(max((top - y1) / (y2 - y1), 0.0), 1.0)
+                tb = min(max((bottom - y1) / (y2 - y1), 0.0), 1.0)
+                xa, xb = x1 + (x2 - x1) * ta, x1 + (x2 - x1) * tb
+            for col in _tile_range(xa, xb, xmin, tw):
+                edges.setdefault((row, col), []).append((parent, c))
+
+    written = []
+    with phase(stats, "render"):
+        for row, col in sorted(set(nodes) | set(edges)):
+            left = xmin + col * tw
+            top = ymax - row * th
+            bounds = (left, left + tw, top - th, top)
+            filename = f"{prefix}_{row}_{col}.{ext}"
+            with _open_output(filename, renderer) as f:
+                renderer.draw(nodes.get((row, col), []), edges.get((row, col), []), pos, bounds, f)
+            written.append(filename)
+    return written
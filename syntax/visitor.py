@@ -0,0 +1,195 @@
+import dataclasses
+import typing
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from syntax.node import NodeLike
+
+# Tabelas por classe de nó, montadas uma vez na primeira vez que a classe
+# aparece: campos (sem line/col), campos que guardam nós e uma função que
+# devolve os filhos. Percursos, layout, desenho e serialização usam estas
+# tabelas em vez de comparar nomes de classe.
+
+_SCALAR_TYPES = (str, int, bool, Union[str, int])
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
+_CHILD_FIELDS: Dict[type, Tuple[Tuple[str, bool], ...]] = {}
+_CHILDREN: Dict[type, Callable[[NodeLike], List[NodeLike]]] = {}
+
+
+def node_fields(cls: type) -> Tuple[str, ...]:
+    names = _FIELDS.get(cls)
+    if names is None:
+        names = _FIELDS[cls] = tuple(f.name for f in dataclasses.fields(cls) if f.name not in ("line", "col"))
+    return names
+
+
+# (nome, é lista) dos campos que guardam nós, na ordem da declaração
+def child_fields(cls: type) -> Tuple[Tuple[str, bool], ...]:
+    spec = _CHILD_FIELDS.get(cls)
+    if spec is None:
+        spec = _CHILD_FIELDS[cls] = tuple(
+            (f.name, typing.get_origin(f.type) is list)
+            for f in dataclasses.fields(cls)
+            if f.name not in ("line", "col") and f.type not in _SCALAR_TYPES
+        )
+    return spec
+
+
+def _no_children(node: NodeLike) -> List[NodeLike]:
+    return []
+
+
+def _make_children(cls: type) -> Callable[[NodeLike], List[NodeLike]]:
+    if not dataclasses.is_dataclass(cls):
+        return _no_children
+    spec = child_fields(cls)
+    if not spec:
+        return _no_children
+    names = [name for name, _ in spec]
+    if any(is_list for _, is_list in spec):
+        if len(spec) == 1:
+            get_list = attrgetter(names[0])
+            return lambda node: list(get_list(node))
+
+        def get_mixed(node: NodeLike) -> List[NodeLike]:
+            out = []
+            for name, is_list in spec:
+                value = getattr(node, name)
+                if is_list:
+                    out.extend(value)
+                elif value is not None:
+                    out.append(value)
+            return out
+        return get_mixed
+    if len(names) == 1:
+        get_one = attrgetter(names[0])
+        return lambda node: [] if (value := get_one(node)) is None else [value]
+    get_all = attrgetter(*names)
+    return lambda node: [value for value in get_all(node) if value is not None]
+
+
+# Classes que não são dataclasses de syntax.node (p.ex. ViewNode em
+# syntax.tree) informam aqui como obter os filhos; getter deve devolver uma
+# lista nova (os percursos a reordenam)
+def register_children(cls: type, getter: Callable[[NodeLike], List[NodeLike]]):
+    _CHILDREN[cls] = getter
+
+
+# Filhos de um nó, em ordem e sem None
+def child_nodes(node: NodeLike) -> List[NodeLike]:
+    get = _CHILDREN.get(type(node))
+    if get is None:
+        get = _CHILDREN[type(node)] = _make_children(type(node))
+    return get(node)
+
+
+# Percurso em pré-ordem com pilha explícita (sem limite de profundidade)
+def walk(root: NodeLike) -> Iterator[NodeLike]:
+    children = _CHILDREN
+    stack = [root]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        yield node
+        get = children.get(type(node))
+        if get is None:
+            get = children[type(node)] = _make_children(type(node))
+        ch = get(node)
+        if ch:
+            ch.reverse()
+            extend(ch)
+
+
+# Arestas (pai, filho) na ordem da pré-ordem dos filhos
+def iter_edges(root: NodeLike) -> Iterator[Tuple[NodeLike, NodeLike]]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        ch = child_nodes(node)
+        for c in ch:
+            yield node, c
+        ch.reverse()
+        stack.extend(ch)
+
+
+def count_nodes(root: NodeLike) -> int:
+    total = 0
+    for _ in walk(root):
+        total += 1
+    return total
+
+
+# Visitante iterativo: para cada nó, em pré-ordem, chama visit_<Classe>(nó)
+# (ou generic_visit) e, depois dos filhos, leave_<Classe>(nó) (ou
+# generic_leave). Se visit_* devolver False, os filhos e o leave daquele nó
+# são pulados. Os métodos de cada classe de nó são resolvidos uma vez por
+# classe de visitante.
+class NodeVisitor:
+    _dispatch: Dict[type, Tuple[Callable, Optional[Callable]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def _methods(self, node_cls: type) -> Tuple[Callable, Optional[Callable]]:
+        methods = self._dispatch.get(node_cls)
+        if methods is None:
+            name = node_cls.__name__
+            enter = getattr(type(self), f"visit_{name}", type(self).generic_visit)
+            leave = getattr(type(self), f"leave_{name}", type(self).generic_leave)
+            methods = self._dispatch[node_cls] = (enter, leave)
+        return methods
+
+    def generic_visit(self, node: NodeLike):
+        return None
+
+    generic_leave: Optional[Callable] = None
+
+    def visit(self, root: NodeLike):
+        stack: List[Tuple[NodeLike, bool]] = [(root, False)]
+        while stack:
+            node, leaving = stack.pop()
+            enter, leave = self._methods(type(node))
+            if leaving:
+                leave(self, node)
+                continue
+            if enter(self, node) is False:
+                continue
+            if leave is not None:
+                stack.append((node, True))
+            ch = child_nodes(node)
+            ch.reverse()
+            stack.extend((c, False) for c in ch)
+
+
+# Transformador iterativo, de baixo para cima: os filhos de um nó são
+# transformados antes dele e gravados de volta nos campos; depois
+# visit_<Classe>(nó) (ou generic_visit, que devolve o próprio nó) devolve o
+# substituto. None remove o nó (de uma lista) ou zera o campo. visit devolve
+# a nova raiz.
+class NodeTransformer(NodeVisitor):
+    def generic_visit(self, node: NodeLike):
+        return node
+
+    def visit(self, root: NodeLike):
+        results: Dict[int, Optional[NodeLike]] = {}
+        stack: List[Tuple[NodeLike, bool]] = [(root, False)]
+        while stack:
+            node, leaving = stack.pop()
+            if not leaving:
+                stack.append((node, True))
+                ch = child_nodes(node)
+                ch.reverse()
+                stack.extend((c, False) for c in ch)
+                continue
+            cls = type(node)
+            if dataclasses.is_dataclass(cls):
+                for name, is_list in child_fields(cls):
+                    value = getattr(node, name)
+                    if is_list:
+                        new = [results.pop(id(c)) for c in value]
+                        value[:] = [c for c in new if c is not None]
+                    elif value is not None:
+                        setattr(node, name, results.pop(id(value)))
+            results[id(node)] = self._methods(cls)[0](self, node)
+        return results[id(root)]
@@ -0,0 +1,58 @@
+from collections.abc import Sequence
+from benchmarks.assignment_scaling import index_chain, many_statements, wide_subscript
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import AssignNode, BinOpNode, CallNode, IdentifierNode, IndexNode
+from syntax.parser import Parser
+
+UNEXPECTED_ASSIGN = "[ERRO] Token inesperado TokenType.ASSIGN na linha 1"
+
+
+def parse(text):
+    parser = Parser(LexicalCodeScanner(text).scan_all())
+    return parser.parse_program().body, parser.errors
+
+
+def test_indexed_targets_become_assignments():
+    (node,), errors = parse("a[1][i + 2] = b[3];")
+    assert errors == []
+    assert isinstance(node, AssignNode) and (node.line, node.col) == (1, 1)
+    assert isinstance(node.target, IndexNode) and isinstance(node.target.target, IndexNode)
+    assert node.target.target.target.name == "a"
+    assert isinstance(node.value, IndexNode)
+
+
+def test_other_expressions_are_not_targets():
+    for text, kind in (("f(a) = 1;", CallNode), ("a + b = 1;", BinOpNode)):
+        body, errors = parse(text)
+        assert isinstance(body[0], kind) and errors == [UNEXPECTED_ASSIGN]
+    body, errors = parse("a[1];")
+    assert isinstance(body[0], IndexNode) and errors == []
+    body, errors = parse("a;")
+    assert isinstance(body[0], IdentifierNode) and errors == []
+
+
+class CountingTokens(Sequence):
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.reads = 0
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __getitem__(self, idx):
+        self.reads += 1
+        return self.tokens[idx]
+
+
+def reads_per_token(text):
+    tokens = CountingTokens(LexicalCodeScanner(text).scan_all())
+    parser = Parser(tokens)
+    parser.parse_program()
+    assert parser.errors == []
+    return tokens.reads / len(tokens)
+
+
+def test_token_reads_do_not_grow_with_the_input():
+    for case in (index_chain, wide_subscript, many_statements):
+        small, large = reads_per_token(case(200)), reads_per_token(case(3200))
+        assert large <= small * 1.1
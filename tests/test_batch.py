@@ -0,0 +1,67 @@
+from batch import analyse_file, expand_inputs, main, run_batch
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.parser import Parser
+
+
+def write_sources(tmp_path):
+    (tmp_path / "a.c").write_text("let x = 1;\n")
+    (tmp_path / "deep.c").write_text("if (x) {" * 3000 + "}" * 3000)
+    (tmp_path / "z.c").write_text("let y = ;\n")
+    return expand_inputs([str(tmp_path)])
+
+
+def test_crash_in_one_file_keeps_batch_going(tmp_path):
+    paths = write_sources(tmp_path)
+    for workers in (1, 2):
+        results = {r.path: r for r in run_batch(paths, workers, chunk=1)}
+        assert len(results) == 3
+        assert results[paths[0]].ok
+        deep = results[paths[1]]
+        assert deep.crashed and deep.failure.startswith("RecursionError")
+        assert results[paths[2]].errors
+
+
+def test_crash_with_cache(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    paths = write_sources(src)
+    result = analyse_file(paths[1], cache_dir=str(tmp_path / "cache"))
+    assert result.crashed
+
+
+def test_missing_file_is_read_failure(tmp_path):
+    result = analyse_file(str(tmp_path / "missing.c"))
+    assert result.failure is not None and not result.crashed
+
+
+def test_parallel_batch_matches_serial_and_parser(tmp_path):
+    for i in range(12):
+        sub = tmp_path / f"d{i % 3}"
+        sub.mkdir(exist_ok=True)
+        text = generate_program(30, shape="deep", seed=i)
+        if i % 4 == 0:
+            text += "let = 1;\nif (x { y = 2; }\n"
+        (sub / f"f{i}.c").write_text(text)
+    (tmp_path / "notas.txt").write_text("let = ;\n")
+    paths = expand_inputs([str(tmp_path), str(tmp_path / "d0" / "*.c")])
+    assert len(paths) == 12 and all(p.endswith(".c") for p in paths)
+    serial = {r.path: r for r in run_batch(paths, 1)}
+    parallel = {r.path: r for r in run_batch(paths, 2, chunk=5)}
+    assert serial == parallel
+    for path, result in serial.items():
+        with open(path, encoding="utf-8") as f:
+            tokens = LexicalCodeScanner(f.read()).scan_all()
+        parser = Parser(tokens)
+        parser.parse_program()
+        assert (result.errors, result.tokens) == (parser.errors, len(tokens))
+    assert sum(not r.ok for r in serial.values()) == 3
+
+
+def test_main_exit_status(tmp_path, capsys):
+    (tmp_path / "a.c").write_text("let x = 1;\n")
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    (tmp_path / "b.c").write_text("let = 1;\n")
+    assert main([str(tmp_path), "-j", "1", "-q"]) == 1
+    out = capsys.readouterr().out
+    assert "2 arquivos: 1 OK, 1 com erros, 0 com falha" in out
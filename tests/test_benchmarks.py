@@ -0,0 +1,40 @@
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from benchmarks.suite import compare, run_case
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import TokenType
+from syntax.parser import Parser
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_generated_programs_are_valid_and_deterministic(shape):
+    text = generate_program(200, shape=shape, seed=9)
+    assert text == generate_program(200, shape=shape, seed=9)
+    assert text != generate_program(200, shape=shape, seed=10)
+    parser = Parser(LexicalCodeScanner(text).scan_all())
+    assert parser.parse_program().body
+    assert parser.errors == []
+
+
+def test_max_depth_bounds_nesting():
+    depth = deepest = 0
+    for tok in LexicalCodeScanner(generate_program(500, shape="deep", seed=1, max_depth=5)).scan_all():
+        depth += {TokenType.LBRACE: 1, TokenType.RBRACE: -1}.get(tok.type, 0)
+        deepest = max(deepest, depth)
+    assert deepest == 5
+
+
+def test_unknown_shape_is_rejected():
+    with pytest.raises(ValueError):
+        generate_program(10, shape="alto")
+
+
+def test_run_case_and_compare():
+    case = run_case("wide", 30, "table", repeat=1, draw_max_nodes=0, seed=0)
+    assert case["errors"] == 0 and case["tokens"] > 0 and case["nodes"] > 0
+    assert "draw_tree" not in case["phases"]
+    assert {"scan_all", "parse_program", "recognize", "tidy_layout", "draw_svg"} <= set(case["phases"])
+    slower = dict(case, phases={name: dict(data, seconds=data["seconds"] * 2 + 1)
+                                for name, data in case["phases"].items()})
+    assert compare({"cases": [case]}, {"cases": [case]}, 0.1) == []
+    assert {phase for _, phase, _, _ in compare({"cases": [case]}, {"cases": [slower]}, 0.1)} == set(case["phases"])
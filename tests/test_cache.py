@@ -0,0 +1,92 @@
+import io
+import os
+import syntax.precedence
+from benchmarks.generator import SHAPES, generate_program
+from syntax.cache import MARKER, ParseCache, analyse_text, version_stamp
+from syntax.serialize import dump_jsonl
+
+
+def test_foreign_directories_survive(tmp_path):
+    for name in ("src", "docs", "0123456789abcdef"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "keep.c").write_text("let x = 1;")
+    ParseCache(str(tmp_path))
+    for name in ("src", "docs", "0123456789abcdef"):
+        assert (tmp_path / name / "keep.c").exists()
+
+
+def test_stale_versions_are_dropped(tmp_path):
+    stale = tmp_path / "fedcba9876543210"
+    stale.mkdir()
+    (stale / MARKER).touch()
+    cache = ParseCache(str(tmp_path))
+    assert not stale.exists()
+    assert os.path.isfile(os.path.join(cache.root, MARKER))
+
+
+def test_clear_keeps_version_owned(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    analyse_text("let x = 1;", cache)
+    cache.clear()
+    assert cache.size() == 0
+    assert os.path.isfile(os.path.join(cache.root, MARKER))
+
+
+def test_entries_are_reused(tmp_path):
+    first = analyse_text("let x = 1;", ParseCache(str(tmp_path)))
+    second = analyse_text("let x = 1;", ParseCache(str(tmp_path)))
+    assert second.errors == first.errors == []
+    assert [t.lex for t in second.tokens] == [t.lex for t in first.tokens]
+
+
+def test_stamp_follows_precedence_table(tmp_path, monkeypatch):
+    before = version_stamp()
+    edited = tmp_path / "precedence.py"
+    with open(syntax.precedence.__file__) as f:
+        edited.write_text(f.read() + "\n# outra precedência\n")
+    monkeypatch.setattr(syntax.precedence, "__file__", str(edited))
+    assert version_stamp() != before
+
+
+def test_deep_expression_is_cached(tmp_path):
+    text = "x = " + "+".join(["a"] * 3000) + ";\n"
+    first = analyse_text(text, ParseCache(str(tmp_path)))
+    cache = ParseCache(str(tmp_path))
+    second = analyse_text(text, cache)
+    assert cache.hits == 1
+    a, b = io.StringIO(), io.StringIO()
+    dump_jsonl(first.ast, a)
+    dump_jsonl(second.ast, b)
+    assert a.getvalue() == b.getvalue()
+
+
+def test_cached_analysis_matches_fresh_one(tmp_path):
+    texts = [generate_program(80, shape=shape, seed=2) + "let = ;\n" for shape in SHAPES]
+    for text in texts:
+        analyse_text(text, ParseCache(str(tmp_path)))
+    cache = ParseCache(str(tmp_path))
+    for text in texts:
+        fresh, cached = analyse_text(text), analyse_text(text, cache)
+        assert cached.tokens == fresh.tokens
+        assert cached.ast == fresh.ast
+        assert cached.errors == fresh.errors and fresh.errors
+    assert cache.hits == len(texts)
+
+
+def test_corrupt_entry_is_recomputed(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    analyse_text("let x = 1;", cache)
+    with open(cache._path(cache.key("let x = 1;")), "wb") as f:
+        f.write(b"lixo")
+    entry = analyse_text("let x = 1;", cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert entry.ast == analyse_text("let x = 1;").ast
+    assert analyse_text("let x = 1;", cache).ast == entry.ast and cache.hits == 1
+
+
+def test_eviction_bounds_the_size(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=4000)
+    for i in range(40):
+        analyse_text(f"let x{i} = {i};\n" * 10, cache)
+        assert cache.size() <= 4000
+    assert cache.size() == sum(size for _, _, size in cache._entries())
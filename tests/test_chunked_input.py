@@ -0,0 +1,32 @@
+from lexer.lexical_code_scanner import LexicalCodeScanner
+
+
+def tokens(scanner):
+    return [(t.type, t.lex, t.line, t.col) for t in scanner.iter_tokens()]
+
+
+def test_long_line_split_across_chunks(tmp_path):
+    text = "".join(f"let v{i} = \"s{i}\" + a[{i}]; /* c */ " for i in range(2000)) + "\nx = 1;\n" + "y = 2; " * 500
+    path = tmp_path / "min.c"
+    path.write_text(text)
+    expected = tokens(LexicalCodeScanner(text, engine="table"))
+    for chunk_size in (7, 64, 4096):
+        for use_mmap in (False, True):
+            assert tokens(LexicalCodeScanner.from_file(str(path), chunk_size, use_mmap)) == expected
+
+
+def test_comments_multibyte_and_crlf_across_chunks(tmp_path):
+    text = "/* bloco\n   longo */ let ação = 1;\r\nlet s = \"ç\";\r\n" * 200 + "/* sem fim"
+    path = tmp_path / "crlf.c"
+    path.write_bytes(text.encode("utf-8"))
+    expected = tokens(LexicalCodeScanner(text.replace("\r\n", "\n"), engine="table"))
+    for chunk_size in (1, 3, 13):
+        for use_mmap in (False, True):
+            assert tokens(LexicalCodeScanner.from_file(str(path), chunk_size, use_mmap)) == expected
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "vazio.c"
+    path.write_text("")
+    for use_mmap in (False, True):
+        assert tokens(LexicalCodeScanner.from_file(str(path), use_mmap=use_mmap)) == tokens(LexicalCodeScanner(""))
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from benchmarks.generator import generate_program
+from daemon import AnalysisDaemon, _options_of, run_request, serve
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.parser import Parser
+from syntax.serialize import _node_from_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_render_output_is_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    options = _options_of("render", {"output": "arvore.svg"})
+    assert options["output"] == str(tmp_path / "arvore.svg")
+
+
+def test_stdio_with_regular_files(tmp_path):
+    requests = tmp_path / "pedidos.jsonl"
+    requests.write_text(
+        json.dumps({"id": 1, "method": "check", "text": "let x = 1;"}) + "\n"
+        + json.dumps({"id": 2, "method": "shutdown"}) + "\n")
+    responses = tmp_path / "respostas.jsonl"
+    with open(requests, "rb") as inp, open(responses, "wb") as out:
+        subprocess.run([sys.executable, os.path.join(ROOT, "daemon.py"), "--stdio", "--workers", "1"],
+                       stdin=inp, stdout=out, check=True, timeout=60)
+    answers = {r["id"]: r for r in map(json.loads, responses.read_text().splitlines())}
+    assert answers[1] == {"id": 1, "ok": True, "result": {"errors": [], "tokens": 6}}
+    assert answers[2]["ok"]
+
+
+def test_requests_match_direct_analysis(tmp_path):
+    text = generate_program(40, shape="deep", seed=3) + "let = ;\nif (x { y = 1; }\n"
+    tokens = LexicalCodeScanner(text).scan_all()
+    parser = Parser(tokens)
+    ast = parser.parse_program()
+    assert json.loads(run_request("tokens", {"text": text}, {})) == \
+        [[t.line, t.col, t.type.name, t.lex] for t in tokens]
+    assert json.loads(run_request("check", {"text": text}, {})) == {"errors": parser.errors, "tokens": len(tokens)}
+    assert json.loads(run_request("check", {"text": text}, {"max_errors": 1}))["errors"] == parser.errors[:1]
+    result = json.loads(run_request("json-ast", {"text": text}, {}))
+    assert result["errors"] == parser.errors
+    assert _node_from_json(result["ast"]) == ast
+    source = tmp_path / "ok.c"
+    source.write_text("let x = 1;\n")
+    files = json.loads(run_request("render", {"path": str(source)}, {"format": "svg"}))["files"]
+    assert files == [str(source) + ".svg"] and os.path.exists(files[0])
+
+
+def test_unix_socket_session(tmp_path):
+    source = tmp_path / "prog.c"
+    source.write_text("let x = 1;\n")
+    path = str(tmp_path / "daemon.sock")
+
+    async def session():
+        daemon = AnalysisDaemon(workers=1)
+        server = asyncio.ensure_future(serve(daemon, path))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+
+        async def ask(request):
+            writer.write(((request if isinstance(request, str) else json.dumps(request)) + "\n").encode("utf-8"))
+            return json.loads(await reader.readline())
+
+        answers = [await ask({"id": 1, "method": "check", "path": str(source)}),
+                   await ask({"id": 2, "method": "check", "path": str(source)})]
+        source.write_text("let = 1;\n")
+        os.utime(source, ns=(0, 0))
+        answers.append(await ask({"id": 3, "method": "check", "path": str(source)}))
+        answers.append(await ask("{não é json"))
+        answers.append(await ask({"id": 4, "method": "compile", "text": ""}))
+        answers.append(await ask({"id": 5, "method": "check", "text": "x;", "max_errors": 0}))
+        answers.append(await ask({"id": 6, "method": "stats"}))
+        answers.append(await ask({"id": 7, "method": "shutdown"}))
+        writer.close()
+        await asyncio.wait_for(server, 30)
+        return answers
+
+    answers = asyncio.run(session())
+    assert answers[0] == {"id": 1, "ok": True, "result": {"errors": [], "tokens": 6}}
+    assert answers[1]["result"] == answers[0]["result"]
+    assert answers[2]["ok"] and answers[2]["result"]["errors"]
+    assert [a["ok"] for a in answers[3:6]] == [False, False, False]
+    assert answers[4]["error"] == "Método desconhecido: compile"
+    assert answers[6]["result"]["cache_hits"] == 1 and answers[6]["result"]["requests"] == 7
+    assert answers[7] == {"id": 7, "ok": True, "result": None}
+    assert not os.path.exists(str(tmp_path / "daemon.sock"))
@@ -0,0 +1,75 @@
+import random
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import TokenType
+from syntax.grammar import (END, FIRST_EXPRESSION, MAX_CODE, PRECEDENCE_BY_CODE, STATEMENT_RULES, SYNC_AFTER,
+                            SYNC_BEFORE, bits)
+from syntax.parser import Parser
+from syntax.precedence import BINARY_PRECEDENCE
+from syntax.recognizer import Recognizer
+
+PIECES = ["let", "if", "else", "while", "return", "x", "a[1]", "f(", "1", "\"s\"", "#define N 1\n", "=", "+",
+          "<", "&&", "(", ")", "{", "}", "[", "]", ";", ",", "@", "\n"]
+
+
+# Despacho por cadeia de comparações, como antes das tabelas
+class ChainParser(Parser):
+    def parse_statement(self):
+        if self.match(TokenType.LET):
+            return self.parse_let_statement()
+        elif self.match(TokenType.IF):
+            return self.parse_if_statement()
+        elif self.match(TokenType.WHILE):
+            return self.parse_while_statement()
+        elif self.match(TokenType.RETURN):
+            return self.parse_return_statement()
+        elif self.match(TokenType.LBRACE):
+            return self.parse_block()
+        elif self.match(TokenType.ELSE):
+            tok = self.consume(TokenType.ELSE)
+            self.emit_error(f"[ERRO] 'else' sem 'if' correspondente na linha {tok.line}")
+            self.synchronize()
+            return None
+        elif self.match(TokenType.ID):
+            return self.parse_assignment_or_expression_statement()
+        elif self.match(TokenType.NUM, TokenType.LPAREN):
+            return self.parse_expression_statement()
+        elif self.match(TokenType.PP_DIRECTIVE, TokenType.EOF):
+            self.consume()
+            return None
+        else:
+            tok = self.peek()
+            self.emit_error(f"[ERRO] Token inesperado {tok.type} na linha {tok.line}")
+            self.synchronize()
+            return None
+
+
+def test_dispatch_table_matches_comparison_chain():
+    rnd = random.Random(25)
+    for _ in range(1500):
+        text = " ".join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 40)))
+        tokens = LexicalCodeScanner(text).scan_all()
+        table, chain = Parser(tokens), ChainParser(tokens)
+        assert table.parse_program() == chain.parse_program()
+        assert table.errors == chain.errors
+
+
+def test_subclass_overrides_go_through_the_table():
+    class Counting(Recognizer):
+        lets = 0
+
+        def parse_let_statement(self):
+            self.lets += 1
+            return super().parse_let_statement()
+
+    parser = Counting(LexicalCodeScanner("let a = 1;\n{ let b = 2; }\nif (a) let c = 3;\n").scan_all())
+    assert parser.recognize() == [] and parser.lets == 3
+
+
+def test_code_tables_match_token_sets():
+    codes = {t.value for t in TokenType}
+    assert END not in codes and max(codes) == MAX_CODE
+    assert FIRST_EXPRESSION == bits(TokenType.NUM, TokenType.ID, TokenType.LPAREN, TokenType.STR_VALUE)
+    assert {t for t in TokenType if SYNC_AFTER >> t.value & 1} == {TokenType.SEMI, TokenType.RBRACE, TokenType.EOL}
+    assert TokenType.LET in {t for t in TokenType if SYNC_BEFORE >> t.value & 1}
+    assert {t: PRECEDENCE_BY_CODE[t.value] for t in TokenType if PRECEDENCE_BY_CODE[t.value]} == BINARY_PRECEDENCE
+    assert all(hasattr(Parser, name) for name in STATEMENT_RULES.values())
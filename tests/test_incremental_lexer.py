@@ -0,0 +1,62 @@
+import random
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.incremental import IncrementalLexer, TextEdit
+from lexer.lexical_code_scanner import LexicalCodeScanner
+
+
+def scan(text):
+    return [(t.type, t.lex, t.line, t.col) for t in LexicalCodeScanner(text, engine="table").scan_all()]
+
+
+def edit(inc, text, start, old_length, new_text):
+    new = text[:start] + new_text + text[start + old_length:]
+    inc.apply_edit(TextEdit(start, old_length, new_text), new)
+    return new
+
+
+def test_line_changes_reach_later_tokens():
+    text = "".join(f"let v{i} = a[{i}] + 1;\n" for i in range(40))
+    inc = IncrementalLexer(text)
+    for start, old_length, new_text in [(30, 0, "\n\n"), (200, 0, "x"), (5, 0, "\n"),
+                                        (400, 3, ""), (120, 2, "\n"), (10, 0, "/* a\nb */")]:
+        text = edit(inc, text, start, old_length, new_text)
+        assert [(t.type, t.lex, t.line, t.col) for t in inc.tokens] == scan(text)
+        assert inc.line_of(len(inc.tokens) - 1) == inc.tokens[-1].line
+
+
+def test_random_edits_match_full_rescan():
+    rnd = random.Random(3)
+    pieces = list("ab_x19 \n\t/*=+-<>!&|%#\"(){}[];,") + ["let", "if", "//", "/*", "*/", "\n/* a\nb */\n"]
+    for _ in range(150):
+        text = rnd.choice([generate_program(15, shape=rnd.choice(SHAPES), seed=rnd.randrange(1000)),
+                           "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 60)))])
+        inc = IncrementalLexer(text)
+        for _ in range(6):
+            start = rnd.randint(0, len(text))
+            old_length = rnd.randint(0, min(5, len(text) - start))
+            new_text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 4)))
+            old_tokens = list(inc.tokens)
+            new = text[:start] + new_text + text[start + old_length:]
+            first, removed, inserted = inc.apply_edit(TextEdit(start, old_length, new_text), new)
+            text = new
+            full = LexicalCodeScanner(text, engine="table")
+            assert [(t.type, t.lex, t.line, t.col) for t in full.scan_all()] == \
+                [(t.type, t.lex, t.line, t.col) for t in inc.tokens]
+            assert inc.delimiter_stack == full._delimiter_stack
+            assert {k: v["count"] for k, v in inc.symbols.items()} == {k: v["count"] for k, v in full.symbols.items()}
+            # só o trecho informado mudou de tipo/lexema
+            assert len(old_tokens) - removed + inserted == len(inc.tokens)
+            assert [(t.type, t.lex) for t in old_tokens[:first]] == [(t.type, t.lex) for t in inc.tokens[:first]]
+            tail = len(old_tokens) - first - removed
+            assert [(t.type, t.lex) for t in old_tokens[len(old_tokens) - tail:]] == \
+                [(t.type, t.lex) for t in inc.tokens[len(inc.tokens) - tail:]]
+            assert all(text.startswith(tok.lex, inc.start_of(i)) for i, tok in enumerate(inc.tokens))
+
+
+def test_edit_outside_text_is_rejected():
+    inc = IncrementalLexer("let x = 1;\n")
+    with pytest.raises(ValueError):
+        inc.apply_edit(TextEdit(20, 0, "y"), "let x = 1;\ny")
+    with pytest.raises(ValueError):
+        inc.apply_edit(TextEdit(0, 0, "y"), "let x = 1;\n")
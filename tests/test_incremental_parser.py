@@ -0,0 +1,63 @@
+import random
+from benchmarks.generator import SHAPES, generate_program
+from lexer.incremental import IncrementalLexer, TextEdit
+from syntax.incremental import IncrementalParser
+from syntax.parser import Parser
+
+
+def full_parse(tokens):
+    parser = Parser(list(tokens))
+    return parser.parse_program(), parser.errors
+
+
+def edit(inc, ip, text, start, old_length, new_text):
+    new = text[:start] + new_text + text[start + old_length:]
+    return new, ip.reparse(*inc.apply_edit(TextEdit(start, old_length, new_text), new))
+
+
+def test_line_shift_reuses_later_statements():
+    text = "let a = 1;\nlet b = ;\nif (a) { b = 2; }\nlet c = b + 1;\n"
+    inc = IncrementalLexer(text)
+    ip = IncrementalParser(inc.tokens)
+    body = list(ip.parse_program().body)
+
+    text, changed = edit(inc, ip, text, 0, 0, "\n\n")
+    program, errors = full_parse(inc.tokens)
+    assert changed == (0, 0, 0)
+    assert ip.errors == errors == ["[ERRO] Esperado expressão após '=', obtido TokenType.SEMI na linha 4"]
+    assert ip.parse_program() == program
+    assert all(a is b for a, b in zip(ip.program.body, body))
+
+    text, changed = edit(inc, ip, text, text.index(";\nif") - 1, 0, "\n 5")
+    program, errors = full_parse(inc.tokens)
+    assert changed == (1, 1, 1)
+    assert ip.errors == errors == []
+    assert ip.parse_program() == program
+    assert ip.program.body[2] is body[2] and ip.program.body[2].line == 6
+
+
+def test_random_edits_match_full_parse():
+    rnd = random.Random(7)
+    pieces = list("ab_x19 \n\t=+-<>!&;,(){}[]") + ["let ", "if ", "while ", "return ", "else ", "//", "\"s\"",
+                                                    "a[1]=2;", "x = 3;\n", "{ let y = 1;\n }", "\n\n"]
+    for _ in range(120):
+        text = rnd.choice([generate_program(12, shape=rnd.choice(SHAPES), seed=rnd.randrange(1000)),
+                           "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 50)))])
+        inc = IncrementalLexer(text)
+        ip = IncrementalParser(inc.tokens)
+        for step in range(8):
+            start = rnd.randint(0, len(text))
+            old_length = rnd.randint(0, min(5, len(text) - start))
+            new_text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 3)))
+            before = list(ip.program.body)
+            text, (b0, removed, inserted) = edit(inc, ip, text, start, old_length, new_text)
+            program, errors = full_parse(inc.tokens)
+            assert ip.errors == errors
+            # fora do trecho informado os comandos são os mesmos objetos
+            body = ip.program.body
+            assert len(before) - removed + inserted == len(body)
+            assert all(a is b for a, b in zip(before[:b0], body[:b0]))
+            assert all(a is b for a, b in zip(before[b0 + removed:], body[b0 + inserted:]))
+            if step % 3 == 2:
+                assert ip.parse_program() == program
+        assert ip.parse_program() == full_parse(inc.tokens)[0]
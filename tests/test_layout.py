@@ -0,0 +1,77 @@
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BlockNode, IdentifierNode
+from syntax.parser import Parser
+from syntax.tree import _compute_layout, tidy_layout
+from syntax.visitor import child_nodes
+
+
+def parse(text):
+    return Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+
+
+def recursive_layout(n, x0, y0, y_spacing=1.6):
+    pos = {}
+
+    def width(node):
+        ch = child_nodes(node)
+        return sum(width(c) for c in ch) + (len(ch) - 1) * 0.8 if ch else 1.0
+
+    def place(node, x, y):
+        pos[id(node)] = (x, y)
+        ch = child_nodes(node)
+        cur_x = x - width(node) / 2.0
+        for c in ch:
+            w = width(c)
+            place(c, cur_x + w / 2.0, y - y_spacing)
+            cur_x += w + 0.8
+
+    place(n, x0, y0)
+    return pos, width(n)
+
+
+def levels(root, pos):
+    out, level = [], [root]
+    while level:
+        out.append([pos[id(node)] for node in level])
+        level = [c for node in level for c in child_nodes(node)]
+    return out
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_classic_layout_matches_recursive_definition(shape):
+    ast = parse(generate_program(60, shape=shape, seed=4))
+    pos, width = _compute_layout(ast, 2.0, 1.0)
+    expected, expected_width = recursive_layout(ast, 2.0, 1.0)
+    assert width == pytest.approx(expected_width)
+    assert pos.keys() == expected.keys()
+    for key, (x, y) in expected.items():
+        assert pos[key] == pytest.approx((x, y))
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_tidy_layout_is_ordered_centered_and_compact(shape):
+    ast = parse(generate_program(120, shape=shape, seed=8))
+    pos, width = tidy_layout(ast, 3.0, 0.0, distance=1.8)
+    assert pos[id(ast)] == pytest.approx((3.0, 0.0))
+    for row in levels(ast, pos):
+        assert len({y for _, y in row}) == 1
+        assert all(b[0] - a[0] >= 1.8 - 1e-9 for a, b in zip(row, row[1:]))
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        ch = child_nodes(node)
+        if ch:
+            assert pos[id(node)][0] == pytest.approx((pos[id(ch[0])][0] + pos[id(ch[-1])][0]) / 2)
+        stack.extend(ch)
+    assert width <= _compute_layout(ast)[1]
+
+
+def test_layouts_handle_deep_trees():
+    node = IdentifierNode("x", 1, 1)
+    for _ in range(20000):
+        node = BlockNode([node], 1, 1)
+    for layout in (_compute_layout, tidy_layout):
+        pos, _ = layout(node)
+        assert len(pos) == 20001
@@ -0,0 +1,49 @@
+import glob
+import os
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRICKY = [
+    "",
+    "let x = 8a;\n",
+    'let s = "abc\\"d";\nlet t = "sem fim\n',
+    "/* comentário\n em duas linhas */ x = 1; // fim\n/* aberto",
+    "#include <stdio.h>\n  #define N 10\nint main() { return N; }\n",
+    "a += b -= c *= d /= e; i++; j--; x == y != z <= w >= v && p || q;\n",
+    "\tx\r\n=\t1 ; @ $ ` ~\n",
+    "f(a[1], (b)) }{ ) ] [\n",
+    "{ [ }",
+    "(\n]",
+    "ação = 1; let çé = ação * 2;\n",
+]
+
+
+def scan(text, engine):
+    sc = LexicalCodeScanner(text, engine=engine)
+    return sc, sc.scan_all()
+
+
+def sources():
+    for shape in SHAPES:
+        yield generate_program(300, shape=shape, seed=7)
+    for path in sorted(glob.glob(os.path.join(ROOT, "code_examples", "*.c"))):
+        with open(path, encoding="utf-8") as f:
+            yield f.read()
+    yield from TRICKY
+
+
+@pytest.mark.parametrize("text", list(sources()))
+def test_table_engine_matches_classic(text):
+    classic, expected = scan(text, "classic")
+    table, tokens = scan(text, "table")
+    assert tokens == expected
+    assert table.symbols == classic.symbols
+    assert table.max_delimiter_depth == classic.max_delimiter_depth
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        LexicalCodeScanner("x", engine="rapido")
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+import syntax.parser
+from main import parse_code_example_file
+from syntax.stats import Stats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_check_with_stats_times_the_recognizer(monkeypatch, capsys):
+    def no_parser(*args, **kwargs):
+        raise AssertionError("--check não deve construir a AST")
+
+    monkeypatch.setattr(syntax.parser.Parser, "parse_program", no_parser)
+    stats = Stats()
+    parse_code_example_file(os.path.join(ROOT, "code_examples", "conditional.c"), stats=stats, mode="check")
+    out = capsys.readouterr().out
+    assert out.strip().endswith("- OK")
+    assert "AST" not in out
+    assert "recognize" in stats.phases and "parse" not in stats.phases
+    assert stats.counters["tokens"] > 0 and "nodes" not in stats.counters
+
+
+def run_main(*args, cwd):
+    return subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py"), *args],
+                          cwd=cwd, capture_output=True, text=True, timeout=60)
+
+
+def test_cli_modes_never_import_matplotlib(tmp_path):
+    source = tmp_path / "prog.c"
+    source.write_text("let x = 1;\nif (x) { x = x + 1; }\n")
+    for mode in ("check", "tokens", "json-ast", "jsonl", "svg", "dot"):
+        result = run_main(str(source), f"--{mode}", cwd=tmp_path)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "matplotlib" not in result.stderr, mode
+    assert json.loads(run_main(str(source), "--json-ast", cwd=tmp_path).stdout)
+
+
+def test_cli_exit_status_reports_errors(tmp_path):
+    source = tmp_path / "ruim.c"
+    source.write_text("let = 1;\n")
+    result = run_main(str(source), "--check", cwd=tmp_path)
+    assert result.returncode == 1
+    assert "ERROS SINTÁTICOS" in result.stdout
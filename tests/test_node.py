@@ -0,0 +1,35 @@
+import copy
+import dataclasses
+import pickle
+import pytest
+import syntax.node
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BinOpNode, IdentifierNode, LiteralNode, Node
+from syntax.parser import Parser
+from syntax.visitor import walk
+
+NODE_CLASSES = [cls for cls in vars(syntax.node).values()
+                if isinstance(cls, type) and issubclass(cls, Node) and cls is not Node]
+
+
+@pytest.mark.parametrize("cls", NODE_CLASSES, ids=lambda cls: cls.__name__)
+def test_nodes_have_no_instance_dict(cls):
+    node = cls(*[None] * len(dataclasses.fields(cls)))
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.extra = 1
+
+
+def test_parsed_tree_is_slotted_and_copyable():
+    text = generate_program(200, shape="deep", seed=5)
+    ast = Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+    assert all(not hasattr(node, "__dict__") for node in walk(ast))
+    assert copy.deepcopy(ast) == ast
+    assert pickle.loads(pickle.dumps(ast)) == ast
+
+
+def test_fields_keep_their_names():
+    node = BinOpNode(IdentifierNode("a", 1, 1), LiteralNode(2, 1, 5), "+", 1, 3)
+    assert [f.name for f in dataclasses.fields(node)] == ["left", "right", "op", "line", "col"]
+    assert node.left.name == "a" and node.right.value == 2
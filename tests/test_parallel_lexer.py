@@ -0,0 +1,48 @@
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.parallel import scan_parallel, split_points
+
+# trechos que enganam o estado especulativo de cada processo: "/*" dentro
+# de string, comentário de bloco aberto no corte, fechamentos que dependem
+# da pilha de trechos anteriores
+TRICKY = "".join([
+    generate_program(60, shape="comments", seed=1),
+    'let s = "/* não é comentário";\n',
+    generate_program(60, shape="wide", seed=2),
+    "if (a) {\n" * 5, "/* aberto\n" + "let x = 1;\n" * 40 + "*/\n",
+    generate_program(60, shape="strings", seed=3),
+    "}\n" * 7, ")\n]\n",
+    generate_program(60, shape="deep", seed=4),
+])
+
+
+def state(sc, tokens):
+    xref = sc.xref
+    return (tokens, sc.symbols, sc._delimiter_stack, sc.max_delimiter_depth, (sc.line, sc.col),
+            list(xref.offsets), list(xref.lines), list(xref.cols), list(xref.ids), xref.definitions)
+
+
+@pytest.mark.parametrize("text", [TRICKY] + [generate_program(400, shape=shape, seed=8) for shape in SHAPES])
+def test_parallel_scan_matches_serial(text):
+    serial = LexicalCodeScanner(text, engine="table")
+    expected = state(serial, serial.scan_all())
+    for min_piece in (64, 1000):
+        sc = LexicalCodeScanner(text)
+        buffer = scan_parallel(sc, jobs=3, min_piece=min_piece)
+        assert state(sc, buffer.to_list()) == expected
+
+
+def test_scan_all_with_jobs():
+    text = TRICKY * 3
+    assert LexicalCodeScanner(text).scan_all(jobs=2) == LexicalCodeScanner(text).scan_all()
+
+
+def test_split_points_end_after_newlines_outside_comments():
+    for parts in (2, 5, 50):
+        bounds = split_points(TRICKY, parts, min_piece=64)
+        assert bounds[0] == 0 and bounds[-1] == len(TRICKY)
+        assert bounds == sorted(set(bounds)) and len(bounds) <= parts + 1
+        for cut in bounds[1:-1]:
+            assert TRICKY[cut - 1] == "\n"
+            assert TRICKY.rfind("/*", 0, cut) < TRICKY.rfind("*/", 0, cut) or "/*" not in TRICKY[:cut]
@@ -0,0 +1,59 @@
+import random
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import ProgramNode
+from syntax.parallel import parse_parallel, statement_bounds
+from syntax.parser import Parser
+from syntax.stats import Stats
+
+BROKEN = ["let = ;\n", "if (x { y = 1; }\n", ") ) x y;\n", "while (a) {\n", "}\n}\n", "else z = 2;\n",
+          "f(a, ;\n", "let q = 1\n"]
+
+
+def program(seed):
+    rnd = random.Random(seed)
+    parts = []
+    for k in range(12):
+        parts.append(generate_program(25, shape=SHAPES[k % len(SHAPES)], seed=seed * 100 + k))
+        if rnd.random() < 0.6:
+            parts.append(rnd.choice(BROKEN))
+    return "".join(parts)
+
+
+def run(tokens, engine, jobs):
+    stats = Stats()
+    parser = Parser(tokens, stats, engine)
+    if jobs == 1:
+        ast = parser.parse_program()
+    else:
+        ast = ProgramNode(parse_parallel(parser, jobs, min_tokens=40), 1, 1)
+    return ast, parser.errors, stats.counters
+
+
+@pytest.mark.parametrize("engine", ["precedence", "recursive"])
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_parse_matches_serial(seed, engine):
+    tokens = LexicalCodeScanner(program(seed)).scan_all()
+    expected = run(tokens, engine, 1)
+    assert expected[1]
+    assert run(tokens, engine, 3) == expected
+
+
+def test_parse_program_with_jobs_and_token_buffer():
+    text = program(9) * 5
+    tokens = LexicalCodeScanner(text).scan_all()
+    serial = Parser(tokens)
+    ast = serial.parse_program()
+    for source in (tokens, LexicalCodeScanner(text).scan_buffer()):
+        parser = Parser(source)
+        assert parser.parse_program(jobs=2) == ast
+        assert parser.errors == serial.errors
+
+
+def test_statement_bounds_cut_after_top_level_statements():
+    tokens = LexicalCodeScanner(program(2)).scan_all()
+    bounds = statement_bounds(tokens, 0, 8, min_tokens=40)
+    assert bounds[0] == 0 and bounds[-1] == len(tokens) and bounds == sorted(set(bounds))
+    for cut in bounds[1:-1]:
+        assert tokens[cut - 1].lex in (";", "}") and tokens[cut].lex != "else"
@@ -0,0 +1,57 @@
+import random
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BinOpNode
+from syntax.parser import Parser
+
+
+def parse(text, engine):
+    parser = Parser(LexicalCodeScanner(text).scan_all(), expression_engine=engine)
+    return parser.parse_program(), parser.errors
+
+
+def random_statement(rnd):
+    pieces = ["a", "b[1]", "f(x, 2)", "3", "(", ")", "+", "-", "*", "/", "<", ">=", "==", "!=", "&&", "||",
+              "[", "]", ",", "!", "\"s\""]
+    expr = " ".join(rnd.choice(pieces) for _ in range(rnd.randint(1, 12)))
+    return rnd.choice(["x = {};", "let y = {};", "if ({}) z = 1;", "return {};", "{};"]).format(expr)
+
+
+def test_engines_agree_on_random_expressions():
+    rnd = random.Random(13)
+    for _ in range(400):
+        text = "\n".join(random_statement(rnd) for _ in range(rnd.randint(1, 4))) + "\n"
+        assert parse(text, "precedence") == parse(text, "recursive"), text
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_engines_agree_on_generated_programs(shape):
+    text = generate_program(200, shape=shape, seed=21, expr_depth=5)
+    assert parse(text, "precedence") == parse(text, "recursive")
+
+
+def test_levels_and_left_associativity():
+    program, errors = parse("x = a - b - c * d < e && f;", "precedence")
+    (stmt,) = program.body
+    assert errors == []
+    expr = stmt.value
+    assert expr.op == "&&" and expr.left.op == "<"
+    sub = expr.left.left
+    assert sub.op == "-" and sub.left.op == "-" and sub.right.op == "*"
+
+
+def test_long_chain_does_not_recurse():
+    text = "x = " + " + ".join(["a"] * 20000) + ";\n"
+    program, errors = parse(text, "precedence")
+    (stmt,) = program.body
+    assert errors == []
+    depth, node = 0, stmt.value
+    while isinstance(node, BinOpNode):
+        depth, node = depth + 1, node.left
+    assert depth == 19999
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        Parser([], expression_engine="pratt")
@@ -0,0 +1,46 @@
+import random
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.parser import Parser
+from syntax.recognizer import Recognizer, recognize
+
+PIECES = ["let", "if", "else", "while", "return", "x", "a[1]", "f(", "g()", "1", "\"s\"", "=", "+", "-", "*",
+          "<", "==", "&&", "||", "(", ")", "{", "}", "[", "]", ";", ";", ",", "!", "@", "\n"]
+
+
+def random_text(rnd):
+    return " ".join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 40)))
+
+
+def parse(tokens):
+    parser = Parser(tokens)
+    parser.parse_program()
+    return parser
+
+
+def test_errors_match_parser_on_random_input():
+    rnd = random.Random(24)
+    for _ in range(1500):
+        tokens = LexicalCodeScanner(random_text(rnd)).scan_all()
+        parser = parse(tokens)
+        recognizer = Recognizer(tokens)
+        assert recognizer.recognize() == parser.errors
+        assert recognizer.pos == parser.pos
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_errors_match_parser_on_programs(shape):
+    text = generate_program(200, shape=shape, seed=4) + "let = ;\nif (x { y = 1; }\n) ) z;\n"
+    tokens = LexicalCodeScanner(text).scan_all()
+    expected = parse(tokens).errors
+    assert len(expected) >= 3
+    assert recognize(tokens) == expected
+    assert recognize(LexicalCodeScanner(text).iter_tokens()) == expected
+    for limit in (1, 2, len(expected) + 1):
+        assert recognize(tokens, max_errors=limit) == expected[:limit]
+
+
+def test_max_errors_must_be_positive():
+    with pytest.raises(ValueError):
+        recognize([], max_errors=0)
@@ -0,0 +1,66 @@
+import io
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+import pytest
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import node_label
+from syntax.parser import Parser
+from syntax.tree import DotRenderer, MatplotlibRenderer, SvgRenderer, renderer_for, write_tree
+from syntax.visitor import count_nodes, walk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def parse(text):
+    return Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+
+
+AST = parse(generate_program(80, shape="deep", seed=6) + "x = a < b && c;\n")
+
+
+@pytest.mark.parametrize("layout", ["classic", "tidy"])
+def test_svg_has_one_box_per_node_and_one_line_per_edge(layout):
+    out = io.StringIO()
+    write_tree(AST, out, SvgRenderer(), layout=layout)
+    svg = ET.fromstring(out.getvalue())
+    texts = [t.text for t in svg.iter(SVG + "text")]
+    assert texts == [node_label(node) for node in walk(AST)]
+    assert "BinOp('<')" in texts and "BinOp('&&')" in texts
+    assert len(list(svg.iter(SVG + "line"))) == count_nodes(AST) - 1
+    assert len(list(svg.iter(SVG + "use"))) == count_nodes(AST)
+
+
+def test_dot_lists_nodes_and_edges():
+    for renderer, positioned in ((DotRenderer(), False), (DotRenderer(positions=True), True)):
+        out = io.StringIO()
+        write_tree(AST, out, renderer)
+        lines = out.getvalue().splitlines()
+        nodes = [line for line in lines if "[label=" in line]
+        assert len(nodes) == count_nodes(AST)
+        assert sum("->" in line for line in lines) == count_nodes(AST) - 1
+        assert all(("pos=" in line) == positioned for line in nodes)
+
+
+def test_renderer_is_chosen_by_extension():
+    assert isinstance(renderer_for("a.svg"), SvgRenderer)
+    assert isinstance(renderer_for("a.GV"), DotRenderer)
+    assert renderer_for("a").fmt == "png" and renderer_for("a.pdf").fmt == "pdf"
+    assert isinstance(renderer_for("a.png"), MatplotlibRenderer)
+
+
+def test_svg_and_dot_do_not_import_matplotlib(tmp_path):
+    source = tmp_path / "conditional.c"
+    with open(os.path.join(ROOT, "code_examples", "conditional.c"), encoding="utf-8") as f:
+        source.write_text(f.read())
+    code = ("import sys\n"
+            "from main import parse_code_example_file\n"
+            f"parse_code_example_file({str(source)!r}, mode='svg')\n"
+            f"parse_code_example_file({str(source)!r}, mode='dot')\n"
+            "assert 'matplotlib' not in sys.modules\n")
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, timeout=60)
+    ET.parse(tmp_path / "conditional.c.svg")
+    assert (tmp_path / "conditional.c.dot").read_text().startswith("digraph AST {")
@@ -0,0 +1,92 @@
+import io
+import json
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BinOpNode, IdentifierNode, LiteralNode, ProgramNode, ReturnNode
+from syntax.parser import Parser
+from main import stream_ast
+from syntax.serialize import _node_from_json, dump_binary, dump_jsonl, load_binary, load_jsonl, write_json
+
+
+def parse(text):
+    return Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+
+
+def programs():
+    for shape in SHAPES:
+        yield parse(generate_program(150, shape=shape, seed=12))
+    # campos None e nós de erro
+    yield parse("let = ;\nif (x { return; }\nwhile (a) ;\nlet s = \"ação 🙂\";\n")
+    yield ProgramNode([ReturnNode(LiteralNode(v, -3, 0), 2**40, 7) for v in (0, -1, 2**70, -2**70, "", "x")], 5, 9)
+    yield ProgramNode([], 1, 1)
+
+
+def roundtrip_binary(program):
+    out = io.BytesIO()
+    dump_binary(program, out)
+    return load_binary(io.BytesIO(out.getvalue()))
+
+
+def roundtrip_jsonl(program):
+    out = io.StringIO()
+    dump_jsonl(program, out)
+    return load_jsonl(io.StringIO(out.getvalue()))
+
+
+@pytest.mark.parametrize("program", list(programs()))
+def test_round_trips(program):
+    assert roundtrip_binary(program) == program
+    assert roundtrip_jsonl(program) == program
+    out = io.StringIO()
+    write_json(program, out)
+    assert _node_from_json(json.loads(out.getvalue())) == program
+
+
+def test_deep_tree_in_binary():
+    node = IdentifierNode("a", 1, 1)
+    for i in range(50000):
+        node = BinOpNode(node, LiteralNode(str(i), 1, 1), "+", 1, 1)
+    program = ProgramNode([node], 1, 1)
+    out = io.BytesIO()
+    dump_binary(program, out)
+    loaded = load_binary(io.BytesIO(out.getvalue()))
+    depth = 0
+    node = loaded.body[0]
+    while isinstance(node, BinOpNode):
+        assert node.right.value == str(49999 - depth)
+        depth, node = depth + 1, node.left
+    assert depth == 50000 and node.name == "a"
+
+
+def test_strings_are_written_once():
+    program = parse("x = abcdefghij;\n" * 200)
+    out = io.BytesIO()
+    dump_binary(program, out)
+    assert out.getvalue().count(b"abcdefghij") == 1
+
+
+def test_bad_input_is_rejected():
+    program = parse("let a = 1;\nlet b = 2;\n")
+    out = io.BytesIO()
+    dump_binary(program, out)
+    data = out.getvalue()
+    for bad in (b"", b"XXXXXXX" + data[7:], data[:-6]):
+        with pytest.raises(ValueError):
+            load_binary(io.BytesIO(bad))
+    for bad in ("", "{}\n", json.dumps({"format": "c-lex-syntax/ast-jsonl", "version": 99}) + "\n"):
+        with pytest.raises(ValueError):
+            load_jsonl(io.StringIO(bad))
+
+
+def test_streamed_output_matches_dump(tmp_path, capsys):
+    text = generate_program(100, shape="deep", seed=1) + "let = ;\n"
+    source = tmp_path / "prog.c"
+    source.write_text(text)
+    expected = io.StringIO()
+    dump_jsonl(parse(text), expected)
+    stream_ast(str(source), "jsonl")
+    assert capsys.readouterr().out == expected.getvalue()
+    stream_ast(str(source), "ast")
+    with open(str(source) + ".ast", "rb") as f:
+        assert load_binary(f) == parse(text)
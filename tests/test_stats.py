@@ -0,0 +1,55 @@
+import json
+import os
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from main import parse_code_example_file
+from syntax.parser import Parser
+from syntax.recognizer import recognize
+from syntax.stats import Stats, phase
+from syntax.visitor import count_nodes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INVALID = "let = 1;\n) ) x y;\nif (x { y = 2; }\nlet z = 3;\n"
+
+
+def test_counters_do_not_change_the_result():
+    tokens = LexicalCodeScanner(INVALID).scan_all()
+    plain = Parser(tokens)
+    stats = Stats()
+    measured = Parser(tokens, stats=stats)
+    assert measured.parse_program() == plain.parse_program()
+    assert measured.errors == plain.errors
+    assert stats.counters["synchronize_calls"] > 0
+    assert stats.counters["synchronize_skipped_tokens"] > 0
+
+    check = Stats()
+    assert recognize(tokens, stats=check) == plain.errors
+    assert check.counters == stats.counters
+
+
+def test_phases_accumulate_and_report_rates():
+    stats = Stats()
+    for _ in range(2):
+        with stats.phase("lex"):
+            pass
+    stats.add("tokens", 100)
+    stats.set_max("max_delimiter_depth", 3)
+    stats.set_max("max_delimiter_depth", 2)
+    data = json.loads(stats.to_json())
+    assert list(data["phases"]) == ["lex"]
+    assert data["counters"] == {"tokens": 100, "max_delimiter_depth": 3}
+    assert data["total_seconds"] == stats.phases["lex"]
+    assert set(data["rates"]) == {"lex_tokens_per_s"}
+    with phase(None, "lex"):
+        pass
+
+
+def test_main_reports_phases(capsys):
+    stats = Stats()
+    path = os.path.join(ROOT, "code_examples", "let_assign_expression.c")
+    parse_code_example_file(path, stats=stats, mode="json-ast")
+    with open(path, encoding="utf-8") as f:
+        tokens = LexicalCodeScanner(f.read()).scan_all()
+    assert {"lex", "parse"} <= set(stats.phases)
+    assert stats.counters["tokens"] == len(tokens)
+    assert stats.counters["nodes"] == count_nodes(Parser(tokens).parse_program())
+    assert stats.counters["errors"] == 0
@@ -0,0 +1,30 @@
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token_buffer import token_list_nbytes
+from syntax.parser import Parser
+
+TEXT = generate_program(400, shape="strings", seed=11) + "let y = 8a; /* aberto\n"
+
+
+def test_buffer_matches_token_list():
+    expected = LexicalCodeScanner(TEXT, engine="table").scan_all()
+    buffer = LexicalCodeScanner(TEXT).scan_buffer()
+    assert len(buffer) == len(expected)
+    assert buffer.to_list() == expected
+    assert [buffer[i] for i in range(len(buffer))] == expected
+    assert buffer[-1] == expected[-1] and buffer[10:20] == expected[10:20]
+    assert [(buffer.type_at(i), buffer.lex_at(i), buffer.line_at(i), buffer.col_at(i))
+            for i in range(len(buffer))] == [(t.type, t.lex, t.line, t.col) for t in expected]
+
+
+def test_parser_accepts_buffer():
+    expected = Parser(LexicalCodeScanner(TEXT).scan_all())
+    ast = expected.parse_program()
+    parser = Parser(LexicalCodeScanner(TEXT).scan_buffer())
+    assert parser.parse_program() == ast
+    assert parser.errors == expected.errors
+
+
+def test_buffer_is_smaller_than_token_list():
+    tokens = LexicalCodeScanner(TEXT).scan_all()
+    assert LexicalCodeScanner(TEXT).scan_buffer().nbytes() < token_list_nbytes(tokens)
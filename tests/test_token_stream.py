@@ -0,0 +1,31 @@
+import pytest
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+
+TEXTS = [
+    "",
+    generate_program(200, shape="strings", seed=3),
+    generate_program(200, shape="comments", seed=4),
+    "let x = 8a; /* aberto\n",
+    "f(a[1]) ) } \"sem fim\n",
+]
+
+
+@pytest.mark.parametrize("engine", ["classic", "table"])
+@pytest.mark.parametrize("text", TEXTS)
+def test_iter_tokens_matches_scan_all(text, engine):
+    eager = LexicalCodeScanner(text, engine=engine)
+    lazy = LexicalCodeScanner(text, engine=engine)
+    assert list(lazy.iter_tokens()) == eager.scan_all()
+    assert lazy.symbols == eager.symbols
+    assert lazy.max_delimiter_depth == eager.max_delimiter_depth
+    # o fluxo não acumula tokens no scanner
+    assert lazy.tokens == []
+
+
+@pytest.mark.parametrize("engine", ["classic", "table"])
+def test_iter_tokens_is_lazy(engine):
+    sc = LexicalCodeScanner("a = 1;\n" + "b = 2;\n" * 1000, engine=engine)
+    stream = sc.iter_tokens()
+    assert next(stream).lex == "a"
+    assert "b" not in sc.symbols
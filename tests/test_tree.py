@@ -0,0 +1,90 @@
+import xml.etree.ElementTree as ET
+import pytest
+from benchmarks.generator import generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BinOpNode, IdentifierNode, IndexNode, LetNode, node_label
+from syntax.parser import Parser
+import syntax.tree
+from syntax.tree import DotRenderer, SvgRenderer, TreeRenderer, build_view, draw_tiles, select_subtree
+from syntax.visitor import child_nodes, count_nodes, walk
+
+
+def parse(text):
+    return Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+
+
+def test_renderer_requires_draw():
+    with pytest.raises(TypeError):
+        TreeRenderer()
+    SvgRenderer()
+    DotRenderer()
+
+
+def test_select_line_inside_multiline_expression():
+    root = parse("y = 1 +\n foo\n * 2;")
+    node = select_subtree(root, line=2)
+    assert isinstance(node, IdentifierNode) and node.name == "foo"
+    node = select_subtree(root, line=3)
+    assert isinstance(node, BinOpNode) and node.op == "*"
+    with pytest.raises(ValueError):
+        select_subtree(root, line=4)
+
+
+def test_select_line_prefers_statement_over_operand():
+    root = parse("let a = b +\n c; let d = 1;\n")
+    node = select_subtree(root, line=2)
+    assert isinstance(node, LetNode) and node.lhs.name == "d"
+
+
+def test_view_does_not_walk_hidden_subtrees(monkeypatch):
+    root = parse("".join(f"let v{i} = {i} + 1;\n" for i in range(50)))
+    monkeypatch.setattr(syntax.tree, "count_nodes", None)
+    view = build_view(root, max_depth=1)
+    assert len(view.kids) == 50
+    assert view.kids[0].label.endswith("(+2 filhos)")
+    assert build_view(root, max_nodes=10).label.endswith("(+50 filhos)")
+
+
+def test_view_labels_are_registered_by_tree():
+    view = build_view(parse("let a = 1;\nlet b = 2;\n"), max_depth=1)
+    assert [node_label(kid) for kid in view.kids] == ["Let (+2 filhos)", "Let (+2 filhos)"]
+
+
+def depth_of(view):
+    return 1 + max((depth_of(kid) for kid in view.kids), default=-1)
+
+
+def test_view_respects_limits():
+    root = parse(generate_program(150, shape="deep", seed=3))
+    full = build_view(root)
+    assert [node_label(v) for v in walk(full)] == [node_label(n) for n in walk(root)]
+    for max_nodes in (1, 7, 50, 400):
+        view = build_view(root, max_nodes=max_nodes)
+        assert count_nodes(view) <= max_nodes
+    for max_depth in (0, 1, 3):
+        view = build_view(root, max_depth=max_depth)
+        assert depth_of(view) == max_depth
+        assert all(v.kids or not child_nodes(v.node) or "filho" in v.label for v in walk(view))
+
+
+def test_select_by_path():
+    root = parse("let a = 1;\nif (a) { b = a[2]; }\n")
+    assert select_subtree(root, path="") is root
+    node = select_subtree(root, path="1.1.0.1")
+    assert isinstance(node, IndexNode) and node.target.name == "a"
+    for path in ("2", "1.x", "0.0.0"):
+        with pytest.raises(ValueError):
+            select_subtree(root, path=path)
+
+
+def test_tiles_cover_every_node_once(tmp_path):
+    root = parse(generate_program(80, shape="wide", seed=2))
+    files = draw_tiles(root, str(tmp_path / "t"), "svg", tile_size=(15.0, 5.0))
+    assert len(files) > 1
+    labels = []
+    for name in files:
+        svg = ET.parse(name).getroot()
+        labels += [t.text for t in svg.iter("{http://www.w3.org/2000/svg}text")]
+    assert sorted(labels) == sorted(node_label(n) for n in walk(root))
+    with pytest.raises(ValueError):
+        draw_tiles(root, str(tmp_path / "t"), "dot")
@@ -0,0 +1,113 @@
+import dataclasses
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from syntax.node import BinOpNode, BlockNode, IdentifierNode, LiteralNode, Node
+from syntax.parser import Parser
+from syntax.visitor import NodeTransformer, NodeVisitor, child_nodes, count_nodes, iter_edges, walk
+
+
+def parse(text):
+    return Parser(LexicalCodeScanner(text).scan_all()).parse_program()
+
+
+def recursive_children(node):
+    out = []
+    for f in dataclasses.fields(node):
+        value = getattr(node, f.name)
+        if isinstance(value, Node):
+            out.append(value)
+        elif isinstance(value, list):
+            out.extend(value)
+    return out
+
+
+def recursive_walk(node):
+    yield node
+    for c in recursive_children(node):
+        yield from recursive_walk(c)
+
+
+class Trace(NodeVisitor):
+    def __init__(self):
+        self.events = []
+
+    def generic_visit(self, node):
+        self.events.append(("in", id(node)))
+
+    def generic_leave(self, node):
+        self.events.append(("out", id(node)))
+
+    def visit_IfNode(self, node):
+        self.events.append(("if", id(node)))
+        return False
+
+
+def recursive_trace(node, events):
+    if type(node).__name__ == "IfNode":
+        events.append(("if", id(node)))
+        return
+    events.append(("in", id(node)))
+    for c in recursive_children(node):
+        recursive_trace(c, events)
+    events.append(("out", id(node)))
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_iterative_walks_match_recursive_ones(shape):
+    ast = parse(generate_program(150, shape=shape, seed=17) + "let = ;\nif (a) { f(a[1], 2); } else x = 1;\n")
+    expected = list(recursive_walk(ast))
+    assert [id(n) for n in walk(ast)] == [id(n) for n in expected]
+    assert count_nodes(ast) == len(expected)
+    assert [(id(a), id(b)) for a, b in iter_edges(ast)] == \
+        [(id(n), id(c)) for n in expected for c in recursive_children(n)]
+    trace, events = Trace(), []
+    trace.visit(ast)
+    recursive_trace(ast, events)
+    assert trace.events == events
+
+
+def test_dispatch_is_per_visitor_class():
+    class Names(NodeVisitor):
+        def __init__(self):
+            self.names = []
+
+        def visit_IdentifierNode(self, node):
+            self.names.append(node.name)
+
+    ast = parse("let a = b + c[d];\n")
+    names = Names()
+    names.visit(ast)
+    assert names.names == ["a", "b", "c", "d"]
+    trace = Trace()
+    trace.visit(ast)
+    assert len(trace.events) == 2 * count_nodes(ast)
+
+
+def test_transformer_folds_and_removes():
+    class Fold(NodeTransformer):
+        def visit_BinOpNode(self, node):
+            if isinstance(node.left, LiteralNode) and isinstance(node.right, LiteralNode) and node.op == "+":
+                return LiteralNode(str(int(node.left.value) + int(node.right.value)), node.line, node.col)
+            return node
+
+        def visit_ReturnNode(self, node):
+            return None
+
+    ast = Fold().visit(parse("let a = 1 + 2 + 3;\nreturn a;\nb = a + 1;\n"))
+    assert len(ast.body) == 2
+    assert ast.body[0].init.value == "6"
+    assert isinstance(ast.body[1].value, BinOpNode)
+
+
+def test_deep_trees_do_not_recurse():
+    node = IdentifierNode("x", 1, 1)
+    for _ in range(100000):
+        node = BlockNode([node], 1, 1)
+    assert count_nodes(node) == 100001
+    assert sum(1 for _ in iter_edges(node)) == 100000
+    trace = Trace()
+    trace.visit(node)
+    assert len(trace.events) == 200002
+    assert NodeTransformer().visit(node) is node
+    assert child_nodes(node)[0].body
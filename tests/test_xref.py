@@ -0,0 +1,63 @@
+import pytest
+from benchmarks.generator import SHAPES, generate_program
+from lexer.lexical_code_scanner import LexicalCodeScanner
+from lexer.token import TokenType
+from lexer.xref import Occurrence
+
+TEXTS = [generate_program(120, shape=shape, seed=5) for shape in SHAPES] + [
+    "let a = 1; let /* c */ a = a + b;\nlet\n  c = a; x = let_b; let 9 d;\n",
+    'let s = "a b"; // let z\n/* let w */ s = s;\n',
+]
+
+
+def expected_index(text):
+    buffer = LexicalCodeScanner(text).scan_buffer()
+    occurrences, definitions = {}, {}
+    previous = None
+    for i in range(len(buffer)):
+        ttype = buffer.type_at(i)
+        if ttype == TokenType.ID:
+            name = buffer.lex_at(i)
+            occ = Occurrence(buffer.offsets[i], buffer.line_at(i), buffer.col_at(i))
+            occurrences.setdefault(name, []).append(occ)
+            if previous == TokenType.LET:
+                definitions.setdefault(name, occ)
+        previous = ttype
+    return occurrences, definitions
+
+
+def scanned(text, how):
+    if how == "chunks":
+        sc = LexicalCodeScanner.from_chunks(text[i:i + 17] for i in range(0, len(text), 17))
+        sc.scan_all()
+    elif how == "stream":
+        sc = LexicalCodeScanner(text, engine="table")
+        for _ in sc.iter_tokens():
+            pass
+    else:
+        sc = LexicalCodeScanner(text, engine=how)
+        sc.scan_all()
+    return sc.xref
+
+
+@pytest.mark.parametrize("how", ["classic", "table", "stream", "chunks"])
+@pytest.mark.parametrize("text", TEXTS)
+def test_index_matches_token_scan(text, how):
+    occurrences, definitions = expected_index(text)
+    xref = scanned(text, how)
+    assert len(xref) == sum(len(v) for v in occurrences.values())
+    for name, occs in occurrences.items():
+        assert xref.occurrences(name) == occs
+        assert xref.count(name) == len(occs)
+        assert xref.definition(name) == definitions.get(name)
+        last = occs[-1].line
+        assert xref.in_lines(name, 2, last - 1) == [o for o in occs if 2 <= o.line <= last - 1]
+    assert xref.count("nao_existe") == 0 and xref.definition("nao_existe") is None
+
+
+def test_symbol_at_every_offset():
+    text = TEXTS[-2]
+    xref = scanned(text, "table")
+    occurrences, _ = expected_index(text)
+    covering = {o.offset + k: (name, o) for name, occs in occurrences.items() for o in occs for k in range(len(name))}
+    assert [xref.symbol_at(i) for i in range(len(text) + 1)] == [covering.get(i) for i in range(len(text) + 1)]